@@ -3,8 +3,9 @@ BookWise - Compact Homepage with Theme Support & PWA
 """
 
 import streamlit as st
-from database.queries import get_featured_books, get_all_genres, search_books, get_top_rated_books, get_books_by_genre
-from components.image_handler import load_image_safe
+from database.queries import get_featured_books, get_all_genres, get_top_rated_books, get_genre_stats
+from database.search import search_catalog
+from components.image_handler import cover_picture_html, COVER_STYLE
 from components.navigation import render_navigation
 from components.footer import render_footer
 from components.reading_lists import READING_LISTS
@@ -13,11 +14,6 @@ from components.testimonials import render_stats_with_social_proof
 from components.theme import render_global_styles, get_theme_colors, get_genre_color, COLORS
 from components.pwa import inject_pwa_support, render_offline_indicator
 
-@st.cache_data(ttl=300)
-def get_genre_book_counts():
-    genres = get_all_genres()
-    return {g.slug: len(get_books_by_genre(g.slug)) for g in genres}
-
 st.set_page_config(page_title="BookWise", page_icon="📚", layout="wide", initial_sidebar_state="collapsed")
 
 # Apply centralized theme styles
@@ -54,14 +50,15 @@ with col2:
 st.markdown('</div>', unsafe_allow_html=True)
 
 if search_query and len(search_query) >= 2:
-    results = search_books(search_query, limit=12)
+    results = search_catalog(search_query, limit=12)
     if results:
         st.markdown(f'<div style="max-width: 1200px; margin: 0 auto; padding: 12px 20px;"><h3 style="font-size: 18px; font-weight: 700; color: #1e293b;">🔍 "{search_query}" ({len(results)} found)</h3></div>', unsafe_allow_html=True)
         cols = st.columns(6, gap="small")
-        for idx, book in enumerate(results):
+        for idx, hit in enumerate(results):
+            book = hit.book
             with cols[idx % 6]:
-                safe_image_url = load_image_safe(book.cover_image_url, "book")
-                st.markdown(f'<div class="hover-lift" style="background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 6px rgba(0, 0, 0, 0.08); margin-bottom: 10px;"><div style="position: relative; padding-top: 140%; background: #f8fafc;"><img src="{safe_image_url}" style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; object-fit: cover;"></div><div style="padding: 10px;"><h4 style="font-size: 13px; font-weight: 700; color: #1e293b; line-height: 1.3; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; margin: 0;">{book.title}</h4><p style="font-size: 11px; color: #64748b; margin: 4px 0 0 0;">{book.author}</p></div></div>', unsafe_allow_html=True)
+                cover_html = cover_picture_html(book.cover_image_url, "book", COVER_STYLE, alt=book.title)
+                st.markdown(f'<div class="hover-lift" style="background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 6px rgba(0, 0, 0, 0.08); margin-bottom: 10px;"><div style="position: relative; padding-top: 140%; background: #f8fafc;">{cover_html}</div><div style="padding: 10px;"><h4 style="font-size: 13px; font-weight: 700; color: #1e293b; line-height: 1.3; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; margin: 0;">{book.title}</h4><p style="font-size: 11px; color: #64748b; margin: 4px 0 0 0;">{book.author}</p><p style="font-size: 10px; color: #94a3b8; line-height: 1.4; margin: 6px 0 0 0; display: -webkit-box; -webkit-line-clamp: 3; -webkit-box-orient: vertical; overflow: hidden;">{hit.snippet}</p></div></div>', unsafe_allow_html=True)
                 st.link_button("Read", f"Book_Detail?slug={book.slug}", use_container_width=True)
     else:
         st.info(f'No books found for "{search_query}"')
@@ -72,8 +69,8 @@ else:
     cols = st.columns(6, gap="small")
     for idx, book in enumerate(featured):
         with cols[idx]:
-            safe_image_url = load_image_safe(book.cover_image_url, "book")
-            st.markdown(f'<div class="hover-lift" style="background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 6px rgba(0, 0, 0, 0.08);"><div style="position: relative; padding-top: 140%; background: #f8fafc;"><img src="{safe_image_url}" style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; object-fit: cover;"></div><div style="padding: 10px;"><h4 style="font-size: 13px; font-weight: 700; color: #1e293b; line-height: 1.3; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; margin: 0;">{book.title}</h4><p style="font-size: 11px; color: #64748b; margin: 4px 0 0 0;">{book.author}</p></div></div>', unsafe_allow_html=True)
+            cover_html = cover_picture_html(book.cover_image_url, "book", COVER_STYLE, alt=book.title)
+            st.markdown(f'<div class="hover-lift" style="background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 6px rgba(0, 0, 0, 0.08);"><div style="position: relative; padding-top: 140%; background: #f8fafc;">{cover_html}</div><div style="padding: 10px;"><h4 style="font-size: 13px; font-weight: 700; color: #1e293b; line-height: 1.3; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; margin: 0;">{book.title}</h4><p style="font-size: 11px; color: #64748b; margin: 4px 0 0 0;">{book.author}</p></div></div>', unsafe_allow_html=True)
             st.link_button("Read", f"Book_Detail?slug={book.slug}", use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -82,7 +79,7 @@ else:
     
     genres = get_all_genres()
     colors = {"self-help": "#667eea", "business": "#f093fb", "psychology": "#4facfe", "finance": "#43e97b", "productivity": "#fa709a", "philosophy": "#30cfd0", "history": "#a8edea", "science": "#ff9a9e", "biography": "#ffecd2", "technology": "#ff6e7f"}
-    book_counts = get_genre_book_counts()
+    book_counts = {stats.genre.slug: stats.book_count for stats in get_genre_stats()}
     
     cols = st.columns(5, gap="small")
     for idx, genre in enumerate(genres[:5]):
@@ -0,0 +1,86 @@
+"""
+ANN candidate benchmark for BookWise Smart Picks.
+Builds a synthetic catalogue whose books belong to topics (keywords drawn
+partly from a topic vocabulary, partly from a global Zipf vocabulary, so
+keyword Jaccard similarities spread around the scoring threshold), then
+compares exhaustive scoring with MinHash/LSH candidates plus exact
+re-scoring for each preset: recall@K, share of identical top-K lists,
+mean candidate count, index build time and per-query latency.
+
+Run with: python benchmarks/bench_ann.py [--sizes 10000 100000] [--queries 200]
+"""
+
+import os
+import sys
+import random
+import argparse
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_recommendations import BenchBook, BenchGenre, GENRES, VOCABULARY_SIZE
+from services.ann_index import PRESETS, evaluate_recall
+from services.recommendation_features import CatalogueFeatures
+
+
+BOOKS_PER_TOPIC = 40
+TOPIC_VOCABULARY = 60
+TOPIC_KEYWORDS = 30
+GLOBAL_KEYWORDS = 20
+
+
+def build_topic_catalogue(size: int, seed: int = 7):
+    """Synthetic books whose keywords cluster by topic."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+    genres = [BenchGenre(f"genre-{g}", f"Genre {g}") for g in range(GENRES)]
+    topics = [
+        [f"t{t}_{i}" for i in range(TOPIC_VOCABULARY)]
+        for t in range(max(size // BOOKS_PER_TOPIC, 1))
+    ]
+    surnames = [f"Surname{i}" for i in range(size // 3 + 1)]
+    books, keywords = [], []
+    for i in range(1, size + 1):
+        topic = rng.choice(topics)
+        books.append(BenchBook(
+            id=i,
+            title=f"Book {i}",
+            author=f"Author{rng.randrange(size)} {rng.choice(surnames)}",
+            slug=f"book-{i}",
+            publication_year=rng.choice([None, rng.randint(1900, 2024)]),
+            genre=rng.choice(genres),
+        ))
+        words = rng.sample(topic, TOPIC_KEYWORDS) + rng.choices(vocabulary, cum_weights=weights, k=GLOBAL_KEYWORDS)
+        keywords.append(list(dict.fromkeys(words)))
+    return books, keywords
+
+
+def run(sizes, queries: int, k: int) -> None:
+    """Run the benchmark for each catalogue size and print a table."""
+    print(f"{'books':>7} | {'preset':>8} | {'threshold':>9} | {'recall@' + str(k):>9} | {'exact':>5} | "
+          f"{'cands':>7} | {'build s':>7} | {'ann ms':>6} | {'full ms':>7}")
+    print("-" * 90)
+    for size in sizes:
+        books, keywords = build_topic_catalogue(size)
+        features = CatalogueFeatures(books, keywords)
+        sample = random.Random(size).sample(range(size), min(queries, size))
+        # Memoize author matches up front so every preset is timed the same way
+        for row in sample:
+            features.related_author_codes(books[row].author.lower())
+        for name, config in PRESETS.items():
+            stats = evaluate_recall(features, keywords, config, k, sample)
+            print(
+                f"{size:>7} | {name:>8} | {config.threshold():>9.2f} | {stats['recall']:>9.3f} | "
+                f"{stats['exact']:>5.2f} | {stats['candidates']:>7.0f} | {stats['build_s']:>7.2f} | "
+                f"{stats['ann_ms']:>6.2f} | {stats['exact_ms']:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise ANN recommendation candidates.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.k)
@@ -0,0 +1,117 @@
+"""
+Concurrent reader throughput benchmark for BookWise.
+Compares the previous default SQLite engine (rollback journal, no pragmas)
+against the tuned WAL engine with a pooled read-only replica, while a
+writer thread keeps updating summaries.
+
+Run with: python benchmarks/bench_connection.py [--readers 1 4 8] [--seconds 3]
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from database.connection import DB_PATH, EngineConfig, create_sqlite_engine
+
+
+READ_SQL = (
+    "SELECT b.id, b.title, s.rating FROM books AS b "
+    "JOIN summaries AS s ON s.book_id = b.id "
+    "WHERE b.genre_id = :genre ORDER BY b.title"
+)
+WRITE_SQL = "UPDATE summaries SET updated_at = CURRENT_TIMESTAMP WHERE book_id = :book"
+WRITE_INTERVAL = 0.005
+
+
+def _baseline_engines(db_path: str):
+    """The engine configuration used before pooling and pragma tuning."""
+    baseline = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    with baseline.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode=DELETE"))
+    return baseline, baseline
+
+
+def _tuned_engines(db_path: str):
+    """The pooled WAL writer plus read-only engine."""
+    config = EngineConfig()
+    writer = create_sqlite_engine(db_path, config)
+    with writer.connect():
+        pass  # First connection switches the file to WAL
+    return writer, create_sqlite_engine(db_path, config, read_only=True)
+
+
+def _measure(writer, reader, readers: int, seconds: float) -> tuple:
+    """Run reader threads against a concurrent writer; return (reads/s, errors)."""
+    with reader.connect() as conn:
+        genres = [row[0] for row in conn.execute(text("SELECT id FROM genres"))]
+        books = [row[0] for row in conn.execute(text("SELECT book_id FROM summaries"))]
+    
+    stop = threading.Event()
+    counts = [0] * readers
+    errors = [0]
+    
+    def read_loop(slot: int) -> None:
+        rng = random.Random(slot)
+        while not stop.is_set():
+            try:
+                with reader.connect() as conn:
+                    conn.execute(text(READ_SQL), {"genre": rng.choice(genres)}).all()
+                counts[slot] += 1
+            except OperationalError:
+                errors[0] += 1
+    
+    def write_loop() -> None:
+        rng = random.Random(-1)
+        while not stop.is_set():
+            try:
+                with writer.begin() as conn:
+                    conn.execute(text(WRITE_SQL), {"book": rng.choice(books)})
+            except OperationalError:
+                errors[0] += 1
+            time.sleep(WRITE_INTERVAL)
+    
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=write_loop))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds, errors[0]
+
+
+def run(reader_counts, seconds: float) -> None:
+    """Run the benchmark for each reader count and print a table."""
+    print(f"{'readers':>7} | {'baseline q/s':>12} | {'tuned q/s':>10} | {'errors b/t':>10}")
+    print("-" * 50)
+    for readers in reader_counts:
+        results = []
+        for factory in (_baseline_engines, _tuned_engines):
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, "bench.db")
+                shutil.copyfile(DB_PATH, db_path)
+                writer, reader = factory(db_path)
+                results.append(_measure(writer, reader, readers, seconds))
+                reader.dispose()
+                writer.dispose()
+        (base_qps, base_err), (tuned_qps, tuned_err) = results
+        print(f"{readers:>7} | {base_qps:>12.0f} | {tuned_qps:>10.0f} | {base_err:>4}/{tuned_err:<5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise concurrent read throughput.")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    run(args.readers, args.seconds)
@@ -0,0 +1,74 @@
+"""
+Cover image cache benchmark for BookWise.
+Compares the bytes a cover grid downloads when linking the original
+remote images against the cached 320w JPEG/WebP/AVIF derivatives.
+
+Run with: python benchmarks/bench_image_cache.py [--covers 24] [--width 1000]
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.image_cache import write_derivatives, derivative_name, DEFAULT_WIDTH
+
+
+def make_cover(width: int, seed: int) -> bytes:
+    """Photo-like synthetic cover: gradient, noise and text-sized blocks, saved as JPEG q92."""
+    from PIL import Image, ImageDraw, ImageFilter
+    
+    rng = random.Random(seed)
+    height = width * 3 // 2
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    tint = Image.new("RGB", (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    image = Image.blend(image, tint, 0.6)
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    image = Image.blend(image, noise, 0.15)
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.rectangle((x, y, x + rng.randrange(20, width // 3), y + rng.randrange(8, 40)), fill=tuple(rng.randrange(256) for _ in range(3)))
+    image = image.filter(ImageFilter.SMOOTH)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def run(covers: int, width: int) -> None:
+    """Cache synthetic covers and print original vs derivative grid weight."""
+    originals = [make_cover(width, seed) for seed in range(covers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        start = time.perf_counter()
+        entries = [write_derivatives(data, cache_dir) for data in originals]
+        elapsed = time.perf_counter() - start
+        
+        formats = entries[0][4]
+        totals = {fmt: 0 for fmt in formats}
+        for content_hash, *_ in entries:
+            for fmt in formats:
+                totals[fmt] += (cache_dir / derivative_name(content_hash, DEFAULT_WIDTH, fmt)).stat().st_size
+    
+    original_kb = sum(len(data) for data in originals) / 1024
+    print(f"{covers} covers at {width}px wide; derivatives built in {elapsed * 1000 / covers:.0f} ms per cover")
+    print(f"{'source':>14} | {'grid KB':>8} | {'vs original':>11}")
+    print("-" * 40)
+    print(f"{'original':>14} | {original_kb:>8.0f} | {'1.00x':>11}")
+    for fmt in formats:
+        kb = totals[fmt] / 1024
+        print(f"{f'{DEFAULT_WIDTH}w {fmt}':>14} | {kb:>8.0f} | {kb / original_kb:>10.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise cover derivatives.")
+    parser.add_argument("--covers", type=int, default=24)
+    parser.add_argument("--width", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.covers, args.width)
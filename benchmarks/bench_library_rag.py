@@ -0,0 +1,75 @@
+"""
+Library passage index benchmark for BookWise.
+Builds the cross-library passage index on synthetic catalogues and
+reports full build time, incremental refresh time after editing 1% of
+summaries, and passage retrieval latency for multi-word questions.
+
+Run with: python benchmarks/bench_library_rag.py [--sizes 10000 50000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from bench_search import build_catalogue
+from services.passage_index import build_passage_index, build_library_query, search_passages, CANDIDATE_FACTOR
+
+
+def _questions(queries) -> list:
+    """Turn single-term benchmark queries into multi-term questions."""
+    return [f"What do the books say about {a} and {b}?" for a, b in zip(queries, queries[1:] + queries[:1])]
+
+
+def run(sizes, repeat: int = 20, limit: int = 6) -> None:
+    """Run the benchmark for each catalogue size and print a table."""
+    print(f"{'books':>8} | {'passages':>8} | {'build s':>7} | {'refresh s':>9} | {'p50 ms':>6} | {'p95 ms':>6}")
+    print("-" * 61)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bench_engine, queries = build_catalogue(os.path.join(tmp, "bench.db"), size)
+            
+            start = time.perf_counter()
+            stats = build_passage_index(full=True, bind=bench_engine)
+            build_s = time.perf_counter() - start
+            
+            with bench_engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE summaries SET updated_at = :now WHERE book_id % 100 = 0"),
+                    {"now": datetime.utcnow()},
+                )
+            start = time.perf_counter()
+            refresh = build_passage_index(bind=bench_engine)
+            refresh_s = time.perf_counter() - start
+            assert refresh["refreshed"] == size // 100
+            
+            timings = []
+            with bench_engine.connect() as conn:
+                for _ in range(repeat):
+                    for question in _questions(queries):
+                        begin = time.perf_counter()
+                        search_passages(conn, build_library_query(question), limit * CANDIDATE_FACTOR)
+                        timings.append((time.perf_counter() - begin) * 1000)
+            bench_engine.dispose()
+        
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(
+            f"{size:>8} | {stats['passages']:>8} | {build_s:>7.1f} | {refresh_s:>9.2f} | "
+            f"{statistics.median(timings):>6.2f} | {p95:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the BookWise library passage index.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
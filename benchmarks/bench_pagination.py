@@ -0,0 +1,93 @@
+"""
+Genre pagination benchmark for BookWise.
+Compares loading a whole genre and slicing it in Python, LIMIT/OFFSET,
+and keyset cursors on (title, id) for early and late pages.
+
+Run with: python benchmarks/bench_pagination.py [--size 10000] [--page-size 12]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from bench_search import build_catalogue
+from database.models import Book, Genre
+from database.queries import genre_page_query
+from database.views import book_views, select_books
+
+
+GENRE_SLUG = "bench"
+
+
+def _median_ms(func_, repeat: int) -> float:
+    """Median wall-clock time of func_ in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(size: int, page_size: int, repeat: int) -> None:
+    """Time page fetches for each strategy and print a table."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_engine, _ = build_catalogue(os.path.join(tmp, "bench.db"), size)
+        with Session(bench_engine) as session:
+            # Page cursors as get_genre_page_index derives them from the snapshot
+            start = time.perf_counter()
+            keys = session.execute(
+                select(Book.title, Book.id).join(Genre).where(Genre.slug == GENRE_SLUG).order_by(Book.title, Book.id)
+            ).all()
+            total = len(keys)
+            cursors = [tuple(row) for row in keys[page_size - 1::page_size]]
+            index_ms = (time.perf_counter() - start) * 1000
+            last_page = len(cursors) + 1 if total % page_size else len(cursors)
+            
+            def python_slice(page):
+                books = book_views(session.execute(
+                    select_books().where(Genre.slug == GENRE_SLUG).order_by(Book.title, Book.id)
+                ))
+                return books[(page - 1) * page_size:page * page_size]
+            
+            def offset(page):
+                return book_views(session.execute(
+                    select_books().where(Genre.slug == GENRE_SLUG)
+                    .order_by(Book.title, Book.id)
+                    .limit(page_size).offset((page - 1) * page_size)
+                ))
+            
+            def keyset(page):
+                after = cursors[page - 2] if page > 1 else None
+                return book_views(session.execute(genre_page_query(GENRE_SLUG, page_size, after)))
+            
+            pages = sorted({1, 50, last_page // 2, last_page} & set(range(1, last_page + 1)))
+            for page in pages:
+                assert python_slice(page) == offset(page) == keyset(page)
+            
+            print(f"{total} books, {last_page} pages of {page_size}; page index built in {index_ms:.1f} ms")
+            print(f"{'page':>6} | {'slice ms':>9} | {'offset ms':>9} | {'keyset ms':>9}")
+            print("-" * 44)
+            for page in pages:
+                slice_ms = _median_ms(lambda: python_slice(page), max(1, repeat // 10))
+                offset_ms = _median_ms(lambda: offset(page), repeat)
+                keyset_ms = _median_ms(lambda: keyset(page), repeat)
+                print(f"{page:>6} | {slice_ms:>9.2f} | {offset_ms:>9.2f} | {keyset_ms:>9.2f}")
+        bench_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise genre pagination.")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.size, args.page_size, args.repeat)
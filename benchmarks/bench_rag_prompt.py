@@ -0,0 +1,108 @@
+"""
+RAG prompt benchmark for BookWise.
+Compares whole-summary prompts against top-k retrieved passages for the
+seeded library: prompt tokens per question and end-to-end answer latency
+with a local model whose prefill time grows with prompt length.
+
+Run with: python benchmarks/bench_rag_prompt.py [--k 4] [--scale 1 4 16]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from database.connection import get_read_session
+from database.models import Book, Summary
+from services.ai_service import AIService, FakeStreamingModel
+from services.response_cache import CHARS_PER_TOKEN
+
+
+QUESTIONS = [
+    "What is the main idea?",
+    "Key takeaways",
+    "How can I apply this at work?",
+    "What does the book say about habits and identity?",
+    "Give me a memorable quote",
+]
+
+
+class PrefillModel(FakeStreamingModel):
+    """Fake model that waits in proportion to prompt tokens before the first chunk."""
+    
+    def __init__(self, prefill_ms_per_1k: float, delay: float):
+        super().__init__(reply=" ".join(["word"] * 60), delay=delay)
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+    
+    def generate_content(self, prompt: str, stream: bool = False):
+        time.sleep(len(prompt) / CHARS_PER_TOKEN / 1000 * self.prefill_ms_per_1k / 1000)
+        return super().generate_content(prompt, stream)
+
+
+def load_books(scale: int):
+    """Seeded books as AIService book_data dicts, longest first, main content repeated `scale` times."""
+    with get_read_session() as session:
+        rows = session.execute(select(Book, Summary).join(Summary, Summary.book_id == Book.id)).all()
+        return [
+            {
+                "title": book.title,
+                "author": book.author,
+                "year": book.publication_year,
+                "executive_summary": summary.executive_summary,
+                "main_content": "\n\n".join([summary.main_content] * scale),
+                "overview": summary.overview_text,
+                "takeaways": summary.key_takeaways,
+                "analogies": summary.analogies,
+                "quotes": summary.quotes,
+                "action_steps": summary.action_steps,
+                "who_should_read": summary.who_should_read,
+            }
+            for book, summary in sorted(rows, key=lambda r: -len(r[1].main_content or ""))
+        ]
+
+
+def measure(service: AIService, books, sample: int):
+    """Mean/max prompt tokens, median build ms and median end-to-end ms over books x questions."""
+    tokens, build_ms, total_ms = [], [], []
+    for i, book_data in enumerate(books):
+        for question in QUESTIONS:
+            start = time.perf_counter()
+            prompt = service.build_chat_prompt(question, book_data)
+            build_ms.append((time.perf_counter() - start) * 1000)
+            tokens.append(len(prompt) / CHARS_PER_TOKEN)
+            if i < sample:
+                start = time.perf_counter()
+                service.chat_with_book(question, book_data)
+                total_ms.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(tokens), max(tokens), statistics.median(build_ms), statistics.median(total_ms)
+
+
+def run(k: int, scales, prefill_ms_per_1k: float, chunk_delay: float, sample: int) -> None:
+    """Print token and latency comparison for each content scale."""
+    print(f"prefill {prefill_ms_per_1k:.0f} ms per 1K prompt tokens, 60-word answer at {chunk_delay * 1000:.0f} ms per chunk")
+    print(f"{'scale':>5} | {'mode':>8} | {'mean tok':>8} | {'max tok':>7} | {'build ms':>8} | {'e2e ms':>7}")
+    print("-" * 59)
+    for scale in scales:
+        books = load_books(scale)
+        for label, retrieval_k in (("whole", None), (f"top-{k}", k)):
+            service = AIService(
+                model=PrefillModel(prefill_ms_per_1k, chunk_delay), use_cache=False, retrieval_k=retrieval_k
+            )
+            mean_tokens, max_tokens, build_ms, total_ms = measure(service, books, sample)
+            print(f"{scale:>5} | {label:>8} | {mean_tokens:>8.0f} | {max_tokens:>7.0f} | {build_ms:>8.2f} | {total_ms:>7.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise RAG prompt size and latency.")
+    parser.add_argument("--k", type=int, default=4, help="Passages retrieved per question")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 4, 16], help="Main content repetitions")
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=150.0)
+    parser.add_argument("--chunk-delay", type=float, default=0.005)
+    parser.add_argument("--sample", type=int, default=5, help="Longest books per scale sent to the model")
+    args = parser.parse_args()
+    run(args.k, args.scale, args.prefill_ms_per_1k, args.chunk_delay, args.sample)
@@ -0,0 +1,90 @@
+"""
+Read model benchmark for BookWise.
+Compares detached ORM instances against the frozen view dataclasses for a
+cached catalogue (every book with its genre plus every summary): load
+time, resident memory, and the pickle size/time paid by st.cache_data.
+
+Run with: python benchmarks/bench_read_models.py [--sizes 150 10000]
+"""
+
+import os
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import Session, joinedload
+
+from bench_search import build_catalogue
+from database.models import Book, Summary
+from database.views import book_views, select_books, select_summaries, summary_view
+
+
+def load_orm(bench_engine):
+    """Load the catalogue the old way: ORM instances, then expunge."""
+    with Session(bench_engine) as session:
+        books = session.query(Book).options(joinedload(Book.genre)).order_by(Book.title).all()
+        summaries = session.query(Summary).all()
+        session.expunge_all()
+    return books, summaries
+
+
+def load_views(bench_engine):
+    """Load the catalogue as read-model views from column-only queries."""
+    with Session(bench_engine) as session:
+        books = book_views(session.execute(select_books().order_by(Book.title)))
+        summaries = [summary_view(row) for row in session.execute(select_summaries())]
+    return books, summaries
+
+
+def measure(loader, bench_engine) -> dict:
+    """Time a loader and measure the memory and pickle cost of its result."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalogue = loader(bench_engine)
+    load_ms = (time.perf_counter() - start) * 1000
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    start = time.perf_counter()
+    payload = pickle.dumps(catalogue, protocol=pickle.HIGHEST_PROTOCOL)
+    dump_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    pickle.loads(payload)
+    load_pickle_ms = (time.perf_counter() - start) * 1000
+    
+    return {
+        "load_ms": load_ms,
+        "resident_kib": resident / 1024,
+        "pickle_kib": len(payload) / 1024,
+        "dump_ms": dump_ms,
+        "unpickle_ms": load_pickle_ms,
+    }
+
+
+def run(sizes) -> None:
+    """Run the benchmark for each catalogue size and print a table."""
+    header = f"{'books':>7} | {'model':>5} | {'load ms':>8} | {'RAM KiB':>9} | {'pickle KiB':>10} | {'dump ms':>8} | {'unpickle ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bench_engine, _ = build_catalogue(os.path.join(tmp, "bench.db"), size)
+            for name, loader in (("orm", load_orm), ("view", load_views)):
+                r = measure(loader, bench_engine)
+                print(
+                    f"{size:>7} | {name:>5} | {r['load_ms']:>8.1f} | {r['resident_kib']:>9.0f} | "
+                    f"{r['pickle_kib']:>10.0f} | {r['dump_ms']:>8.1f} | {r['unpickle_ms']:>11.1f}"
+                )
+            bench_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise read models.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 10000])
+    args = parser.parse_args()
+    run(args.sizes)
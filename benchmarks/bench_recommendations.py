@@ -0,0 +1,169 @@
+"""
+Recommendation scoring benchmark for BookWise.
+Compares the per-book Python scoring loop against batched NumPy scoring
+over CatalogueFeatures on synthetic catalogues, for both "similar books"
+and reading-history recommendations. Keywords are precomputed for both
+sides, so the numbers isolate scoring and top-K selection.
+
+Run with: python benchmarks/bench_recommendations.py [--sizes 1000 10000 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+import itertools
+import statistics
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recommendations import RecommendationEngine
+from services.recommendation_features import CatalogueFeatures
+
+
+VOCABULARY_SIZE = 20000
+KEYWORDS_PER_BOOK = 50
+GENRES = 12
+LIMIT = 6
+
+
+@dataclass(frozen=True)
+class BenchGenre:
+    slug: str
+    name: str
+
+
+@dataclass(frozen=True)
+class BenchBook:
+    id: int
+    title: str
+    author: str
+    slug: str
+    publication_year: Optional[int]
+    genre: BenchGenre
+
+
+def build_catalogue(size: int, seed: int = 42):
+    """Synthetic books with Zipf-distributed keywords."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        for _ in range(VOCABULARY_SIZE)
+    ]
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+    genres = [BenchGenre(f"genre-{g}", f"Genre {g}") for g in range(GENRES)]
+    books, keywords = [], []
+    for i in range(1, size + 1):
+        first, last = rng.choice(vocabulary).title(), rng.choice(vocabulary[:size // 5 + 10]).title()
+        books.append(BenchBook(
+            id=i,
+            title=f"Book {i}",
+            author=f"{first} {last}",
+            slug=f"book-{i}",
+            publication_year=rng.choice([None, rng.randint(1900, 2024)]),
+            genre=rng.choice(genres),
+        ))
+        keywords.append(list(dict.fromkeys(rng.choices(vocabulary, cum_weights=weights, k=KEYWORDS_PER_BOOK))))
+    return books, keywords
+
+
+def loop_similar(engine, book, book_keywords, books, keywords):
+    """The per-candidate loop get_recommendations used before."""
+    recs = []
+    for other, other_keywords in zip(books, keywords):
+        if other.id == book.id:
+            continue
+        score, reasons = engine.score_candidate(book, book_keywords, other, other_keywords)
+        if score > 0:
+            recs.append((other, score, reasons[:3]))
+    recs.sort(key=lambda r: -r[1])
+    return recs[:LIMIT]
+
+
+def loop_history(history, books, keywords):
+    """The nested loop get_personalized_recommendations used before."""
+    genre_counts, author_counts, all_keywords, read_ids = {}, {}, [], set()
+    for book, kws in zip(books, keywords):
+        if book.slug in history:
+            read_ids.add(book.id)
+            genre_counts[book.genre.slug] = genre_counts.get(book.genre.slug, 0) + 1
+            author_counts[book.author.lower()] = author_counts.get(book.author.lower(), 0) + 1
+            all_keywords.extend(kws)
+    recs = []
+    for book, kws in zip(books, keywords):
+        if book.id in read_ids:
+            continue
+        score = genre_counts.get(book.genre.slug, 0) * 20
+        if author_counts.get(book.author.lower(), 0) > 0:
+            score += 25
+        overlap = len(set(all_keywords) & set(kws))
+        if overlap > 5:
+            score += min(overlap * 2, 30)
+        if score > 0:
+            recs.append((book, score))
+    recs.sort(key=lambda r: -r[1])
+    return recs[:LIMIT]
+
+
+def _median_ms(func, repeat: int) -> float:
+    """Median wall-clock time of func in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(sizes, repeat: int) -> None:
+    """Run the benchmark for each catalogue size and print a table."""
+    engine = RecommendationEngine()
+    print(f"{'books':>7} | {'features s':>10} | {'similar loop ms':>15} | {'numpy ms':>8} | "
+          f"{'history loop ms':>15} | {'numpy ms':>8}")
+    print("-" * 80)
+    for size in sizes:
+        books, keywords = build_catalogue(size)
+        start = time.perf_counter()
+        features = CatalogueFeatures(books, keywords)
+        build_s = time.perf_counter() - start
+        
+        rng = random.Random(size)
+        queries = rng.sample(range(size), 5)
+        history_rows = [rng.sample(range(size), 5) for _ in range(5)]
+        
+        # Same results as the loops before timing anything
+        for q in queries:
+            expected = [(b.id, s, r) for b, s, r in loop_similar(engine, books[q], keywords[q], books, keywords)]
+            assert [(b.id, s, r) for b, s, r in features.similar(books[q], keywords[q], LIMIT)] == expected
+        for rows in history_rows:
+            expected = [(b.id, s) for b, s in loop_history({books[r].slug for r in rows}, books, keywords)]
+            assert [(b.id, s) for b, s, _ in features.for_history(rows, LIMIT)] == expected
+        
+        loop_repeat = 1 if size > 20000 else repeat
+        similar_loop = _median_ms(
+            lambda: [loop_similar(engine, books[q], keywords[q], books, keywords) for q in queries], loop_repeat
+        ) / len(queries)
+        similar_np = _median_ms(
+            lambda: [features.similar(books[q], keywords[q], LIMIT) for q in queries], repeat
+        ) / len(queries)
+        history_loop = _median_ms(
+            lambda: [loop_history({books[r].slug for r in rows}, books, keywords) for rows in history_rows[:1]],
+            loop_repeat
+        )
+        history_np = _median_ms(
+            lambda: [features.for_history(rows, LIMIT) for rows in history_rows], repeat
+        ) / len(history_rows)
+        print(f"{size:>7} | {build_s:>10.2f} | {similar_loop:>15.1f} | {similar_np:>8.2f} | "
+              f"{history_loop:>15.1f} | {history_np:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise recommendation scoring.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
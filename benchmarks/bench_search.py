@@ -0,0 +1,151 @@
+"""
+Search latency benchmark for BookWise.
+Compares the FTS5 index against the previous ILIKE scan on synthetic
+catalogues of growing size.
+
+Run with: python benchmarks/bench_search.py [--sizes 150 10000 100000]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import string
+import argparse
+import itertools
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from database.models import Base
+from database.search import ensure_search_index, build_match_query, search_book_ids
+
+
+# Zipf-distributed pseudo-words approximate the term skew of real summaries
+VOCABULARY_SIZE = 20000
+QUERY_COUNT = 12
+
+
+def _make_vocabulary(rng: random.Random) -> list:
+    """Generate unique pseudo-words for the synthetic corpus."""
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    # Shuffle so Zipf rank is unrelated to alphabetical order
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+def _sentence(rng: random.Random, vocabulary: list, weights: list, words: int) -> str:
+    """Build a pseudo-random sentence with Zipf-distributed word frequencies."""
+    return " ".join(rng.choices(vocabulary, cum_weights=weights, k=words))
+
+
+def build_catalogue(db_path: str, size: int, seed: int = 42):
+    """Create a synthetic catalogue with summaries and an FTS index."""
+    rng = random.Random(seed)
+    vocabulary = _make_vocabulary(rng)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    sentence = lambda words: _sentence(rng, vocabulary, weights, words)
+    bench_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=bench_engine)
+    
+    with bench_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO genres (id, name, slug, description, icon) VALUES (1, 'Bench', 'bench', 'Synthetic', '📚')"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO books (id, title, author, slug, genre_id, is_featured) "
+                "VALUES (:id, :title, :author, :slug, 1, 0)"
+            ),
+            [
+                {
+                    "id": i,
+                    "title": f"{sentence(3).title()} {i}",
+                    "author": f"Author {rng.randint(1, size // 3 + 1)}",
+                    "slug": f"book-{i}",
+                }
+                for i in range(1, size + 1)
+            ],
+        )
+        conn.execute(
+            text(
+                "INSERT INTO summaries (book_id, overview_text, main_content, key_takeaways, "
+                "who_should_read, executive_summary) "
+                "VALUES (:book_id, :overview, '', :takeaways, '', :executive)"
+            ),
+            [
+                {
+                    "book_id": i,
+                    "overview": sentence(20),
+                    "executive": sentence(60),
+                    "takeaways": json.dumps([
+                        {"title": sentence(2), "text": sentence(15)} for _ in range(3)
+                    ]),
+                }
+                for i in range(1, size + 1)
+            ],
+        )
+    
+    # Created after the bulk load so the index is populated in one pass
+    ensure_search_index(bench_engine)
+    
+    # Queries: a mid-frequency word, a word plus a prefix, and a two-word search
+    queries = []
+    for _ in range(QUERY_COUNT // 3):
+        queries.append(vocabulary[rng.randint(50, 2000)])
+        queries.append(vocabulary[rng.randint(50, 2000)][:4])
+        queries.append(f"{vocabulary[rng.randint(10, 500)]} {vocabulary[rng.randint(10, 500)]}")
+    return bench_engine, queries
+
+
+def _median_ms(func, repeat: int) -> float:
+    """Median wall-clock time of func in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(sizes, repeat: int = 20) -> None:
+    """Run the benchmark for each catalogue size and print a table."""
+    print(f"{'books':>8} | {'FTS5 ms':>8} | {'ILIKE ms':>9}")
+    print("-" * 32)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            bench_engine, queries = build_catalogue(os.path.join(tmp, "bench.db"), size)
+            with bench_engine.connect() as conn:
+                def fts():
+                    for q in queries:
+                        search_book_ids(conn, build_match_query(q), limit=12)
+                
+                def ilike():
+                    for q in queries:
+                        conn.execute(
+                            text(
+                                "SELECT id FROM books WHERE title LIKE :term OR author LIKE :term "
+                                "ORDER BY title LIMIT 12"
+                            ),
+                            {"term": f"%{q}%"},
+                        ).all()
+                
+                fts_ms = _median_ms(fts, repeat) / len(queries)
+                ilike_ms = _median_ms(ilike, repeat) / len(queries)
+            bench_engine.dispose()
+        print(f"{size:>8} | {fts_ms:>8.2f} | {ilike_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BookWise search latency.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[150, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
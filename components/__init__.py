@@ -24,14 +24,14 @@ from components.progress_tracker import (
     render_progress_bar, render_section_checkboxes,
     render_reading_stats, get_reading_progress
 )
-from components.filters import render_filters, apply_filters
+from components.filters import render_filters, apply_filters, build_book_filter
 from components.stats_bar import render_stats_bar, render_compact_stats
 from components.book_of_day import render_book_of_the_day, get_book_of_the_day
 from components.quick_actions import render_quick_actions, render_scroll_to_top, render_action_bar
 from components.testimonials import render_testimonials, render_stats_with_social_proof
 from components.genre_themes import get_genre_theme, get_genre_gradient, apply_genre_theme_css
 from components.pagination import (
-    paginate_items, render_pagination, render_compact_pagination,
+    paginate_items, paginate_keyset, render_pagination, render_compact_pagination,
     PaginationConfig, reset_pagination
 )
 
@@ -65,7 +65,7 @@ __all__ = [
     "render_progress_bar", "render_section_checkboxes",
     "render_reading_stats", "get_reading_progress",
     # Filters
-    "render_filters", "apply_filters",
+    "render_filters", "apply_filters", "build_book_filter",
     # Stats
     "render_stats_bar", "render_compact_stats",
     # Book of the Day
@@ -62,8 +62,8 @@ def render_ai_chat(
     # Initialize AI service
     ai_service = get_ai_service()
     
-    # Check for API key
-    has_api_key = bool(ai_service.api_key)
+    # Check for API key or configured model client
+    has_api_key = ai_service.is_available()
     
     # Chat container
     st.markdown("""
@@ -249,13 +249,13 @@ def render_ai_chat(
             for m in history
         ]
         
-        # Get AI response
-        with st.spinner("Thinking..."):
-            response = ai_service.chat_with_book(
-                user_message=question,
-                book_data=book_data,
-                chat_history=ai_history
-            )
+        # Stream the AI response so the first words show up immediately
+        st.markdown('<span style="font-weight: 600; color: #667eea;">🤖 BookWise AI</span>', unsafe_allow_html=True)
+        response = st.write_stream(ai_service.stream_chat_with_book(
+            user_message=question,
+            book_data=book_data,
+            chat_history=ai_history
+        ))
         
         # Add assistant response
         add_message(book_slug, 'assistant', response)
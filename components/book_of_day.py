@@ -4,18 +4,13 @@ Book of the Day - Compact with readable fonts
 
 import streamlit as st
 from datetime import datetime
-from database.queries import get_all_books
+from database.queries import get_daily_pick
 from components.image_handler import load_image_safe
 
 
 def get_book_of_the_day():
-    """Get the book of the day based on current date."""
-    books = get_all_books()
-    if not books:
-        return None
-    today = datetime.now()
-    day_seed = today.year * 1000 + today.timetuple().tm_yday
-    return books[day_seed % len(books)]
+    """Get the book of the day, drawn once per day and stored in daily_picks."""
+    return get_daily_pick()
 
 
 def render_book_of_the_day() -> None:
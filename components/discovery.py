@@ -82,6 +82,8 @@ def add_bookmark(book_slug: str, title: str, author: str) -> None:
         if b["slug"] == book_slug:
             return
     st.session_state["bookmarks"].append({"slug": book_slug, "title": title, "author": author})
+    from services.user_profile import get_user_profile, SOURCE_BOOKMARK
+    get_user_profile(st.session_state).add(book_slug, SOURCE_BOOKMARK)
 
 
 def remove_bookmark(book_slug: str) -> None:
@@ -89,6 +91,8 @@ def remove_bookmark(book_slug: str) -> None:
     if "bookmarks" not in st.session_state:
         return
     st.session_state["bookmarks"] = [b for b in st.session_state["bookmarks"] if b["slug"] != book_slug]
+    from services.user_profile import get_user_profile, SOURCE_BOOKMARK
+    get_user_profile(st.session_state).remove(book_slug, SOURCE_BOOKMARK)
 
 
 def is_bookmarked(book_slug: str) -> bool:
@@ -4,37 +4,82 @@ Provides advanced filtering functionality for books.
 """
 
 import streamlit as st
-from typing import List, Optional, Tuple
-from database.models import Book
-from database.connection import get_db_session
-from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from database.queries import BookFilter
+from database.views import BookView
+from services.facets import RATING_THRESHOLDS, get_facet_index
 
 
-def get_filter_options() -> dict:
+# Reading-time labels of the filter panel -> READING_TIME_BUCKETS keys
+READING_TIME_OPTIONS = {
+    "Any Time": None,
+    "< 10 min": "under_10",
+    "10-15 min": "10_15",
+    "15-20 min": "16_20",
+    "> 20 min": "over_20",
+}
+
+# Sort labels of the filter panel -> BOOK_SORTS keys
+SORT_OPTIONS = {
+    "Title (A-Z)": "title",
+    "Title (Z-A)": "title_desc",
+    "Newest First": "newest",
+    "Oldest First": "oldest",
+    "Rating": "rating",
+}
+
+# Minimum-rating labels of the filter panel -> rating threshold
+RATING_OPTIONS = {"Any Rating": None, **{f"{t}+ ⭐": t for t in RATING_THRESHOLDS}}
+
+
+def get_filter_options(book_filter: Optional[BookFilter] = None) -> dict:
     """
-    Get available filter options from the database.
+    Get available filter options with their book counts.
+    
+    Served from the cached facet index; only the catalogue data version
+    is read from the database.
+    
+    Args:
+        book_filter: Current selection the counts are computed under
     
     Returns:
-        dict: Dictionary with filter options
+        dict: Option values per filter, plus "counts" (count per value, by facet)
     """
-    with get_db_session() as session:
-        # Get unique years
-        years = session.query(Book.publication_year).distinct().order_by(Book.publication_year.desc()).all()
-        years = [y[0] for y in years if y[0]]
-        
-        session.expunge_all()
-        
-        return {
-            "years": years,
-            "reading_times": [5, 10, 15, 20, 30],
-            "difficulties": ["beginner", "intermediate", "advanced"],
-        }
+    index = get_facet_index()
+    return {
+        "years": index.values["year"],
+        "reading_times": index.values["reading_time"],
+        "difficulties": index.values["difficulty"],
+        "counts": index.counts(book_filter),
+    }
+
+
+def _with_count(label: str, count: Optional[int]) -> str:
+    """Append a facet count to an option label."""
+    return label if count is None else f"{label} ({count})"
 
 
-def render_filters() -> dict:
+def _panel_values(year: str, reading_time: str, difficulty: str, rating: str, sort: str) -> dict:
+    """Convert filter panel selections into filter values."""
+    return {
+        "year": None if year == "All Years" else int(year),
+        "reading_time": reading_time,
+        "difficulty": None if difficulty == "Any Level" else difficulty,
+        "min_rating": RATING_OPTIONS.get(rating),
+        "sort": sort
+    }
+
+
+def render_filters(genre_slug: Optional[str] = None) -> dict:
     """
     Render filter controls and return selected values.
     
+    Every option shows how many books it would match given the other
+    selections (faceted counts).
+    
+    Args:
+        genre_slug: Genre the listing is restricted to
+    
     Returns:
         dict: Selected filter values
     """
@@ -47,51 +92,101 @@ def render_filters() -> dict:
     </div>
     """, unsafe_allow_html=True)
     
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4, col5, col6 = st.columns(6)
     
-    options = get_filter_options()
+    # Counts under the current selection (the widget values of the last run)
+    current = _panel_values(
+        st.session_state.get("filter_year", "All Years"),
+        st.session_state.get("filter_time", "Any Time"),
+        st.session_state.get("filter_difficulty", "Any Level"),
+        st.session_state.get("filter_rating", "Any Rating"),
+        st.session_state.get("filter_sort", "Title (A-Z)"),
+    )
+    options = get_filter_options(build_book_filter(current, genre_slug))
+    counts = options["counts"]
     
     with col1:
         # Year range filter
         year_options = ["All Years"] + [str(y) for y in options["years"][:20]]
-        selected_year = st.selectbox("📅 Publication Year", year_options, key="filter_year")
+        selected_year = st.selectbox(
+            "📅 Publication Year", year_options, key="filter_year",
+            format_func=lambda o: _with_count(o, None if o == "All Years" else counts["year"].get(int(o)))
+        )
     
     with col2:
         # Reading time filter
-        time_options = ["Any Time", "< 10 min", "10-15 min", "15-20 min", "> 20 min"]
-        selected_time = st.selectbox("⏱️ Reading Time", time_options, key="filter_time")
+        selected_time = st.selectbox(
+            "⏱️ Reading Time", list(READING_TIME_OPTIONS), key="filter_time",
+            format_func=lambda o: _with_count(o, counts["reading_time"].get(READING_TIME_OPTIONS[o]))
+        )
     
     with col3:
-        # Sort by
-        sort_options = ["Title (A-Z)", "Title (Z-A)", "Newest First", "Oldest First", "Rating"]
-        selected_sort = st.selectbox("🔃 Sort By", sort_options, key="filter_sort")
+        # Difficulty filter
+        difficulty_options = ["Any Level"] + options["difficulties"]
+        selected_difficulty = st.selectbox(
+            "🎯 Difficulty", difficulty_options, key="filter_difficulty",
+            format_func=lambda o: _with_count(o.title(), counts["difficulty"].get(o))
+        )
     
     with col4:
+        # Minimum rating filter
+        selected_rating = st.selectbox(
+            "⭐ Rating", list(RATING_OPTIONS), key="filter_rating",
+            format_func=lambda o: _with_count(o, counts["min_rating"].get(RATING_OPTIONS[o]))
+        )
+    
+    with col5:
+        # Sort by
+        selected_sort = st.selectbox("🔃 Sort By", list(SORT_OPTIONS), key="filter_sort")
+    
+    with col6:
         # Clear filters button
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("🔄 Reset Filters", key="reset_filters"):
             st.session_state["filter_year"] = "All Years"
             st.session_state["filter_time"] = "Any Time"
+            st.session_state["filter_difficulty"] = "Any Level"
+            st.session_state["filter_rating"] = "Any Rating"
             st.session_state["filter_sort"] = "Title (A-Z)"
             st.rerun()
     
-    return {
-        "year": None if selected_year == "All Years" else int(selected_year),
-        "reading_time": selected_time,
-        "sort": selected_sort
-    }
+    return _panel_values(selected_year, selected_time, selected_difficulty, selected_rating, selected_sort)
+
+
+def build_book_filter(filters: dict, genre_slug: Optional[str] = None) -> BookFilter:
+    """
+    Translate filter panel values into a database query filter.
+    
+    Args:
+        filters: Values returned by render_filters()
+        genre_slug: Restrict to this genre
+    
+    Returns:
+        BookFilter: Filter for get_filtered_books() and count_filtered_books()
+    """
+    return BookFilter(
+        genre_slug=genre_slug,
+        year=filters.get("year"),
+        reading_time=READING_TIME_OPTIONS.get(filters.get("reading_time") or "Any Time"),
+        difficulty=filters.get("difficulty"),
+        min_rating=filters.get("min_rating"),
+        sort=SORT_OPTIONS.get(filters.get("sort") or "Title (A-Z)", "title"),
+    )
 
 
-def apply_filters(books: List[Book], filters: dict) -> List[Book]:
+def apply_filters(books: List[BookView], filters: dict) -> List[BookView]:
     """
-    Apply filters to a list of books.
+    Apply filters to a list of books already in memory.
+    
+    Only the year filter and the title and year sorts are available here;
+    to filter the catalogue use build_book_filter() with get_filtered_books().
     
     Args:
-        books: List of Book objects
+        books: List of BookView objects
         filters: Dictionary of filter values
     
     Returns:
-        List[Book]: Filtered and sorted books
+        List[BookView]: Filtered and sorted books
     """
     filtered = books.copy()
     
@@ -132,6 +227,12 @@ def render_filter_pills(filters: dict) -> None:
     if filters.get("reading_time") and filters["reading_time"] != "Any Time":
         active_filters.append(f"⏱️ {filters['reading_time']}")
     
+    if filters.get("difficulty"):
+        active_filters.append(f"🎯 {filters['difficulty'].title()}")
+    
+    if filters.get("min_rating"):
+        active_filters.append(f"⭐ {filters['min_rating']}+")
+    
     if active_filters:
         pills_html = " ".join([
             f'<span style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); '
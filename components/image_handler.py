@@ -1,11 +1,9 @@
 """
 Image handling utilities for BookWise.
-Provides safe image loading with fallbacks and browser-mimicking requests.
+Provides safe image loading with fallbacks backed by background URL checks.
 """
 
-import requests
 from typing import Optional
-from functools import lru_cache
 
 
 PLACEHOLDER_IMAGES = {
@@ -15,34 +13,31 @@ PLACEHOLDER_IMAGES = {
     "genre": "https://images.unsplash.com/photo-1481627834876-b7833e8f5570?w=600",
 }
 
+# Inline style for covers filling a padded aspect-ratio box
+COVER_STYLE = "position: absolute; top: 0; left: 0; width: 100%; height: 100%; object-fit: cover;"
 
-@lru_cache(maxsize=100)
-def check_image_url(url: str, timeout: int = 5) -> bool:
+
+def check_image_url(url: str) -> bool:
     """
-    Check if an image URL is accessible using browser headers.
+    Check if an image URL is accessible using stored check results.
+    
+    Never makes a network request. URLs that have not been checked yet
+    are queued for the background checker and treated as accessible
+    until a result is stored.
     
     Args:
         url: Image URL to check
-        timeout: Request timeout in seconds
     
     Returns:
-        bool: True if image is accessible
+        bool: False only if the URL is known to be broken
     """
-    try:
-        # Use browser headers to avoid 403 blocks from Amazon/firewalls
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.head(url, timeout=timeout, allow_redirects=True, headers=headers)
-        return response.status_code == 200
-    except Exception:
-        # Fallback to simple GET if HEAD fails (some servers block HEAD)
-        try:
-             response = requests.get(url, timeout=timeout, stream=True, headers=headers)
-             response.close()
-             return response.status_code == 200
-        except:
-            return False
+    from services.image_checker import get_image_status, schedule_check
+    
+    status = get_image_status(url)
+    if status is None:
+        schedule_check(url)
+        return True
+    return status
 
 
 def load_image_safe(
@@ -60,10 +55,58 @@ def load_image_safe(
         str: Valid image URL
     """
     if url and check_image_url(url):
-        return url
+        from services.image_cache import get_cover_sources
+        
+        sources = get_cover_sources(url)
+        return sources.default_url() if sources else url
     return get_placeholder_image(fallback_type)
 
 
+def cover_picture_html(
+    url: Optional[str],
+    fallback_type: str = "book",
+    style: str = "",
+    sizes: str = "(max-width: 640px) 50vw, 200px",
+    alt: str = ""
+) -> str:
+    """
+    Build a responsive <picture> for an image.
+    
+    Locally cached images get AVIF/WebP sources and a JPEG srcset with
+    real derivative widths; anything else falls back to a plain <img>
+    from load_image_safe.
+    
+    Args:
+        url: Primary image URL
+        fallback_type: Type of fallback image
+        style: Inline CSS for the <img>
+        sizes: sizes attribute describing the rendered width
+        alt: Alternative text
+    
+    Returns:
+        str: HTML markup
+    """
+    from html import escape
+    from services.image_cache import get_cover_sources, MIME_TYPES
+    
+    alt = escape(alt, quote=True)
+    sources = get_cover_sources(url) if url and check_image_url(url) else None
+    if sources is None:
+        src = load_image_safe(url, fallback_type)
+        return f'<img src="{src}" alt="{alt}" loading="lazy" style="{style}">'
+    
+    parts = ["<picture>"]
+    for fmt in ("avif", "webp"):
+        if fmt in sources.formats:
+            parts.append(f'<source type="{MIME_TYPES[fmt]}" srcset="{sources.srcset(fmt)}" sizes="{sizes}">')
+    parts.append(
+        f'<img src="{sources.default_url()}" srcset="{sources.srcset()}" sizes="{sizes}" '
+        f'alt="{alt}" loading="lazy" decoding="async" style="{style}">'
+    )
+    parts.append("</picture>")
+    return "".join(parts)
+
+
 def get_placeholder_image(image_type: str = "book") -> str:
     """
     Get placeholder image URL.
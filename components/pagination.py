@@ -4,7 +4,7 @@ Provides reusable pagination for book lists and categories.
 """
 
 import streamlit as st
-from typing import List, Any, Tuple, Optional
+from typing import List, Any, Tuple, Optional, Callable
 from dataclasses import dataclass
 import math
 
@@ -86,6 +86,48 @@ def paginate_items(
     return paginated_items, current_page, total_pages
 
 
+def paginate_keyset(
+    key: str,
+    page_index: Callable[[int], Tuple[int, List[Any]]],
+    fetch_page: Callable[[Optional[Any], int], List[Any]],
+    config: PaginationConfig = None
+) -> Tuple[List[Any], int, int, int]:
+    """
+    Paginate a database query with keyset cursors.
+    
+    Only the visible page is fetched. page_index supplies the total
+    count and the cursor that starts each page after the first, so
+    jumping to any page is a single seek.
+    
+    Args:
+        key: Unique key for pagination state
+        page_index: Called with the page size; returns (total_items, cursors)
+        fetch_page: Called with (cursor or None, page size); returns the page
+        config: Pagination configuration
+        
+    Returns:
+        Tuple of (page_items, current_page, total_pages, total_items)
+    """
+    if config is None:
+        config = PaginationConfig()
+    
+    state = get_pagination_state(key)
+    items_per_page = state.get("items_per_page", config.items_per_page)
+    current_page = state.get("current_page", 1)
+    
+    total_items, cursors = page_index(items_per_page)
+    total_pages = max(1, math.ceil(total_items / items_per_page))
+    
+    # Ensure current page is valid
+    current_page = max(1, min(current_page, total_pages, len(cursors) + 1))
+    state["current_page"] = current_page
+    
+    after = cursors[current_page - 2] if current_page > 1 else None
+    page_items = fetch_page(after, items_per_page) if total_items else []
+    
+    return page_items, current_page, total_pages, total_items
+
+
 def render_pagination(
     key: str,
     total_items: int,
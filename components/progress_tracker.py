@@ -57,6 +57,8 @@ def update_reading_progress(
     
     if section not in progress["sections_read"]:
         progress["sections_read"].append(section)
+        from services.user_profile import get_user_profile, SOURCE_READ
+        get_user_profile(st.session_state).add(book_slug, SOURCE_READ)
         progress["percentage"] = int(len(progress["sections_read"]) / total_sections * 100)
         
         if progress["percentage"] >= 100:
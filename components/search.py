@@ -5,8 +5,8 @@ Provides search functionality across books.
 
 import streamlit as st
 from typing import Optional, List
-from database.queries import search_books, get_all_books
-from components.image_handler import load_image_safe
+from database.search import search_catalog
+from components.image_handler import cover_picture_html, COVER_STYLE
 
 
 def render_search_bar(placeholder: str = "🔍  Search book summaries...") -> Optional[str]:
@@ -52,7 +52,7 @@ def render_search_results(query: str, max_results: int = 12) -> None:
     if not query or len(query) < 2:
         return
     
-    results = search_books(query, limit=max_results)
+    results = search_catalog(query, limit=max_results)
     
     if not results:
         st.markdown(f"""
@@ -81,19 +81,21 @@ def render_search_results(query: str, max_results: int = 12) -> None:
     # Results grid
     cols = st.columns(6, gap="medium")
     
-    for idx, book in enumerate(results):
+    for idx, hit in enumerate(results):
+        book = hit.book
         with cols[idx % 6]:
-            safe_image_url = load_image_safe(book.cover_image_url, "book")
+            cover_html = cover_picture_html(book.cover_image_url, "book", COVER_STYLE, alt=book.title)
             genre_name = book.genre.name if book.genre else "Unknown"
             
             st.markdown(f"""
             <div class="hover-lift" style="background: white; border-radius: 16px; overflow: hidden; box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1); border: 1px solid #f1f5f9; margin-bottom: 16px;">
             <div style="position: relative; padding-top: 150%; background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);">
-            <img src="{safe_image_url}" style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; object-fit: cover;">
+            {cover_html}
             </div>
             <div style="padding: 16px;">
             <h3 style="font-size: 14px; font-weight: 700; color: #1e293b; margin-bottom: 4px; line-height: 1.4; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden;">{book.title}</h3>
             <p style="font-size: 12px; color: #64748b; margin-bottom: 4px;">{book.author}</p>
+            <p style="font-size: 11px; color: #94a3b8; line-height: 1.4; margin-bottom: 4px; display: -webkit-box; -webkit-line-clamp: 3; -webkit-box-orient: vertical; overflow: hidden;">{hit.snippet}</p>
             <div style="display: flex; align-items: center; gap: 8px; margin-top: 8px;">
             <span style="font-size: 11px; color: #94a3b8;">📚 {genre_name}</span>
             </div>
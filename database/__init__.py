@@ -5,16 +5,24 @@ Provides SQLAlchemy models, connection management, and query utilities.
 
 from database.models import Genre, Book, Summary, SummaryImage
 from database.connection import get_db_session, init_db
+from database.views import BookView, GenreView, SummaryView, CatalogueSnapshot
 from database.queries import (
     get_all_genres,
     get_genre_by_slug,
     get_books_by_genre,
     get_book_by_slug,
     get_summary_for_book,
+    get_summaries_for_books,
     get_images_for_summary,
     get_featured_books,
     search_books,
     get_all_books,
+    get_books_by_author,
+    BookFilter,
+    get_filtered_books,
+    count_filtered_books,
+    load_catalogue_snapshot,
+    get_catalogue_snapshot,
 )
 
 __all__ = [
@@ -22,6 +30,10 @@ __all__ = [
     "Book",
     "Summary",
     "SummaryImage",
+    "BookView",
+    "GenreView",
+    "SummaryView",
+    "CatalogueSnapshot",
     "get_db_session",
     "init_db",
     "get_all_genres",
@@ -29,8 +41,15 @@ __all__ = [
     "get_books_by_genre",
     "get_book_by_slug",
     "get_summary_for_book",
+    "get_summaries_for_books",
     "get_images_for_summary",
     "get_featured_books",
     "search_books",
     "get_all_books",
+    "get_books_by_author",
+    "BookFilter",
+    "get_filtered_books",
+    "count_filtered_books",
+    "load_catalogue_snapshot",
+    "get_catalogue_snapshot",
 ]
@@ -4,8 +4,9 @@ Run with: python -m database.books_extended
 """
 
 import json
-from database.connection import get_session
-from database.models import Genre, Book, Summary
+from database.connection import get_read_session
+from database.models import Genre
+from database.ingest import ingest_books
 
 # Extended book collection organized by genre
 EXTENDED_BOOKS = {
@@ -726,75 +727,53 @@ EXTENDED_BOOKS = {
 
 
 def seed_extended_books():
-    """Seed the database with 100+ extended books."""
-    db = get_session()
+    """Seed the database with 100+ extended books in batched transactions."""
+    with get_read_session() as session:
+        genre_names = dict(session.query(Genre.slug, Genre.name).all())
     
-    # Get genre map
-    genres = db.query(Genre).all()
-    genre_map = {g.slug: g for g in genres}
-    
-    if not genre_map:
+    if not genre_names:
         print("❌ No genres found. Run main seed first: python -m database.seed")
         return
     
-    books_added = 0
-    books_skipped = 0
-    
+    records = []
     for genre_slug, books in EXTENDED_BOOKS.items():
-        if genre_slug not in genre_map:
+        if genre_slug not in genre_names:
             print(f"⚠️  Genre '{genre_slug}' not found, skipping...")
             continue
         
-        genre = genre_map[genre_slug]
-        print(f"\n📚 Seeding {genre.name}...")
+        genre_name = genre_names[genre_slug]
+        print(f"📚 Preparing {genre_name} ({len(books)} books)...")
         
         for book_data in books:
             slug = book_data["title"].lower().replace(" ", "-").replace(":", "").replace("'", "").replace("*", "").replace("?", "")
             
-            # Check if book exists
-            existing = db.query(Book).filter(Book.slug == slug).first()
-            if existing:
-                books_skipped += 1
-                continue
-            
-            # Create book
-            book = Book(
-                title=book_data["title"],
-                author=book_data["author"],
-                slug=slug,
-                cover_image_url=book_data["cover"],
-                publication_year=book_data["year"],
-                genre=genre,
-                is_featured=False  # Can be updated later
-            )
-            db.add(book)
-            db.commit()
-            
-            # Create summary
-            summary = Summary(
-                book_id=book.id,
-                overview_text=book_data["overview"],
-                executive_summary=book_data["executive"],
-                main_content=book_data["executive"],  # Use executive as main
-                key_takeaways=json.dumps(book_data["takeaways"]),
-                who_should_read=f"Anyone interested in {genre.name.lower()} and {book_data['author']}'s insights.",
-                reading_time=book_data["read_time"],
-                rating=book_data["rating"],
-                quotes=json.dumps(book_data.get("quotes", [])),
-                action_steps=json.dumps(book_data.get("action_steps", [])),
-                quote_of_the_book=book_data["quotes"][0] if book_data.get("quotes") else "",
-                difficulty="Intermediate",
-                seo_title=f"{book_data['title']} Summary - Key Takeaways & Insights",
-                seo_description=f"Read our comprehensive summary of {book_data['title']} by {book_data['author']}. Get key insights and actionable takeaways."
-            )
-            db.add(summary)
-            db.commit()
-            
-            books_added += 1
-            print(f"  ✅ {book_data['title']}")
+            records.append({
+                "title": book_data["title"],
+                "author": book_data["author"],
+                "slug": slug,
+                "cover_image_url": book_data["cover"],
+                "publication_year": book_data["year"],
+                "genre_slug": genre_slug,
+                "is_featured": False,  # Can be updated later
+                "summary": {
+                    "overview_text": book_data["overview"],
+                    "executive_summary": book_data["executive"],
+                    "main_content": book_data["executive"],  # Use executive as main
+                    "key_takeaways": json.dumps(book_data["takeaways"]),
+                    "who_should_read": f"Anyone interested in {genre_name.lower()} and {book_data['author']}'s insights.",
+                    "reading_time": book_data["read_time"],
+                    "rating": book_data["rating"],
+                    "quotes": json.dumps(book_data.get("quotes", [])),
+                    "action_steps": json.dumps(book_data.get("action_steps", [])),
+                    "quote_of_the_book": book_data["quotes"][0] if book_data.get("quotes") else "",
+                    "difficulty": "Intermediate",
+                    "seo_title": f"{book_data['title']} Summary - Key Takeaways & Insights",
+                    "seo_description": f"Read our comprehensive summary of {book_data['title']} by {book_data['author']}. Get key insights and actionable takeaways.",
+                },
+            })
     
-    db.close()
-    print(f"\n🎉 Done! Added {books_added} books, skipped {books_skipped} existing.")
+    report = ingest_books(records)
+    print(f"\n🎉 Done! {report}")
 
 
 if __name__ == "__main__":
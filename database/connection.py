@@ -1,15 +1,18 @@
 """
 Database connection management for BookWise.
-Provides session management and database initialization.
+Provides engine configuration, session management and database initialization.
 """
 
 import os
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Generator
+from dataclasses import dataclass
+from typing import Generator, List, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from database.models import Base
 
@@ -19,15 +22,112 @@ DB_DIR.mkdir(exist_ok=True)
 DB_PATH = DB_DIR / "bookwise.db"
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-# Create engine with SQLite-specific settings
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,  # Set to True for SQL debugging
-    connect_args={"check_same_thread": False}  # Required for SQLite + threading
-)
 
-# Session factory
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    SQLite engine tuning options.
+    
+    Every field can be overridden with a BOOKWISE_DB_<FIELD> environment
+    variable, e.g. BOOKWISE_DB_POOL_SIZE=16.
+    
+    Attributes:
+        journal_mode: PRAGMA journal_mode (WAL lets readers run during writes)
+        synchronous: PRAGMA synchronous (NORMAL is safe with WAL)
+        cache_size_kib: Page cache per connection in KiB
+        mmap_size: Bytes of the database file to memory-map
+        busy_timeout: Seconds to wait on a locked database
+        pool_size: Persistent connections kept per engine
+        max_overflow: Extra connections allowed under burst load
+        pool_timeout: Seconds to wait for a free pooled connection
+        read_only_queries: Serve query helpers from a read-only engine
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kib: int = 32 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout: float = 5.0
+    pool_size: int = 8
+    max_overflow: int = 8
+    pool_timeout: float = 30.0
+    read_only_queries: bool = True
+    
+    @classmethod
+    def from_env(cls) -> "EngineConfig":
+        """Build a config from BOOKWISE_DB_* environment variables."""
+        overrides = {}
+        for name, field in cls.__dataclass_fields__.items():
+            value = os.getenv(f"BOOKWISE_DB_{name.upper()}")
+            if value is None:
+                continue
+            if field.type is bool:
+                overrides[name] = value.strip().lower() in ("1", "true", "yes", "on")
+            else:
+                overrides[name] = field.type(value)
+        return cls(**overrides)
+
+
+def create_sqlite_engine(
+    db_path: Path,
+    config: EngineConfig = EngineConfig(),
+    read_only: bool = False
+) -> Engine:
+    """
+    Create a pooled SQLite engine with tuned pragmas.
+    
+    Args:
+        db_path: Path to the database file
+        config: Engine tuning options
+        read_only: Open connections with mode=ro and query_only
+    
+    Returns:
+        Engine: Configured SQLAlchemy engine
+    """
+    if read_only:
+        url = f"sqlite:///file:{db_path}?mode=ro&uri=true"
+    else:
+        url = f"sqlite:///{db_path}"
+    
+    new_engine = create_engine(
+        url,
+        echo=False,  # Set to True for SQL debugging
+        poolclass=QueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+        connect_args={
+            "check_same_thread": False,  # Required for SQLite + threading
+            "timeout": config.busy_timeout,
+        },
+    )
+    
+    @event.listens_for(new_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # Journal mode is persistent and can only be changed by a writer
+            cursor.execute(f"PRAGMA journal_mode={config.journal_mode}")
+        else:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA synchronous={config.synchronous}")
+        cursor.execute(f"PRAGMA cache_size=-{config.cache_size_kib}")
+        cursor.execute(f"PRAGMA mmap_size={config.mmap_size}")
+        cursor.close()
+    
+    return new_engine
+
+
+ENGINE_CONFIG = EngineConfig.from_env()
+
+# Read-write engine for seeding, admin edits and index maintenance
+engine = create_sqlite_engine(DB_PATH, ENGINE_CONFIG)
+
+# Read-only engine for the query module (falls back to the writer when disabled)
+read_engine = create_sqlite_engine(DB_PATH, ENGINE_CONFIG, read_only=True) if ENGINE_CONFIG.read_only_queries else engine
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def init_db() -> None:
@@ -35,9 +135,46 @@ def init_db() -> None:
     Initialize the database by creating all tables.
     
     This function should be called once during application startup
-    or when running the seed script.
+    or when running the seed script. Also creates the full-text
+    search index, the catalogue data version and their sync triggers.
     """
+    from database.search import ensure_search_index
+    from database.data_version import ensure_data_version
+    
     Base.metadata.create_all(bind=engine)
+    migrate_indexes()
+    ensure_search_index()
+    ensure_data_version()
+
+
+def migrate_indexes(bind: Optional[Engine] = None) -> List[str]:
+    """
+    Create model indexes missing from an existing database.
+    
+    create_all() only creates indexes together with their table, so
+    indexes added to a model after the table exists are created here.
+    
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    
+    Returns:
+        List[str]: Names of the indexes that were created
+    """
+    bind = bind or engine
+    existing = set()
+    with bind.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing.update(
+                row[1] for row in conn.exec_driver_sql(f'PRAGMA index_list("{table.name}")')
+            )
+    
+    created = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=bind, checkfirst=True)
+                created.append(index.name)
+    return created
 
 
 def drop_db() -> None:
@@ -75,6 +212,28 @@ def get_db_session() -> Generator[Session, None, None]:
         session.close()
 
 
+@contextmanager
+def get_read_session() -> Generator[Session, None, None]:
+    """
+    Context manager for read-only database sessions.
+    
+    Uses the pooled read-only engine so page reads never take the
+    write lock. Any attempted write raises an OperationalError.
+    
+    Usage:
+        with get_read_session() as session:
+            books = session.query(Book).all()
+    
+    Yields:
+        Session: SQLAlchemy session object
+    """
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def get_session() -> Session:
     """
     Get a new database session.
@@ -86,3 +245,9 @@ def get_session() -> Session:
         Session: New SQLAlchemy session
     """
     return SessionLocal()
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=engine)
+    created = migrate_indexes()
+    print(f"🗂️ Created {len(created)} indexes: {', '.join(created)}" if created else "🗂️ All indexes present.")
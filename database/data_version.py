@@ -0,0 +1,127 @@
+"""
+Catalogue data version for BookWise.
+A single-row counter that triggers increment on every write to genres,
+books and summaries (seeds, admin edits and maintenance scripts alike),
+so in-process caches of the catalogue are invalidated exactly when the
+data changes instead of on a timer.
+"""
+
+from contextlib import contextmanager
+from typing import Generator, Optional, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from database.models import DataVersion
+from database.connection import get_read_session, engine
+
+
+# Tables whose writes change the catalogue snapshot
+VERSIONED_TABLES = ("genres", "books", "summaries")
+
+_BUMP_SQL = "UPDATE data_version SET version = version + 1 WHERE id = 1;"
+
+_TRIGGER_EVENTS = (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+
+TRIGGERS_SQL = [
+    f"""CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+        {_BUMP_SQL}
+    END"""
+    for table in VERSIONED_TABLES
+    for suffix, event in _TRIGGER_EVENTS
+]
+
+TRIGGER_NAMES = [f"{table}_version_{suffix}" for table in VERSIONED_TABLES for suffix, _ in _TRIGGER_EVENTS]
+
+# (epoch, version) identifying the catalogue contents
+Version = Tuple[str, int]
+
+# Set once the table, its row and the triggers exist on the application engine
+_version_ready = False
+
+
+def ensure_data_version(bind: Optional[Engine] = None) -> None:
+    """
+    Create the data_version row and its triggers if missing.
+    
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    """
+    global _version_ready
+    bind = bind or engine
+    if bind is engine and _version_ready:
+        return
+    
+    DataVersion.__table__.create(bind=bind, checkfirst=True)
+    with bind.begin() as conn:
+        conn.execute(text(
+            "INSERT OR IGNORE INTO data_version (id, epoch, version) "
+            "VALUES (1, lower(hex(randomblob(16))), 0)"
+        ))
+        for trigger_sql in TRIGGERS_SQL:
+            conn.execute(text(trigger_sql))
+    
+    if bind is engine:
+        _version_ready = True
+
+
+def get_data_version() -> Version:
+    """
+    Read the current catalogue data version.
+    
+    Returns:
+        Version: (epoch, version); changes whenever the catalogue does
+    """
+    ensure_data_version()
+    with get_read_session() as session:
+        return read_data_version(session)
+
+
+def read_data_version(session: Union[Session, Connection]) -> Version:
+    """
+    Read the data version on an open session or connection.
+    
+    Lets a build record the version it started from in its own
+    transaction; the table must already exist (see ensure_data_version).
+    
+    Args:
+        session: Session or connection to read with
+    
+    Returns:
+        Version: (epoch, version)
+    """
+    epoch, version = session.execute(
+        text("SELECT epoch, version FROM data_version WHERE id = 1")
+    ).one()
+    return epoch, version
+
+
+@contextmanager
+def deferred_version_bump(conn: Connection) -> Generator[None, None, None]:
+    """
+    Bump the data version once for a bulk write instead of once per row.
+    
+    Runs inside the caller's transaction: the version triggers are
+    dropped for the block, then the version is bumped once and the
+    triggers recreated before the caller commits. If the block raises,
+    rolling back restores the triggers. Does nothing on a database
+    without a data_version table.
+    
+    Args:
+        conn: Connection with an open SQLite transaction (BEGIN issued;
+            pysqlite only begins implicitly before DML)
+    """
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_version'")
+    ).first()
+    if not exists:
+        yield
+        return
+    
+    for name in TRIGGER_NAMES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    yield
+    conn.execute(text(_BUMP_SQL))
+    for trigger_sql in TRIGGERS_SQL:
+        conn.execute(text(trigger_sql))
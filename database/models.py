@@ -3,20 +3,28 @@ SQLAlchemy models for the BookWise database.
 Defines Genre, Book, Summary, and SummaryImage models.
 """
 
-from datetime import datetime
-from typing import Optional, List
+import json
+from datetime import date, datetime
+from typing import Any, Optional, List, Tuple
 from sqlalchemy import (
     Column,
     Integer,
     String,
     Text,
+    Date,
     DateTime,
     ForeignKey,
     Boolean,
     Enum,
+    Float,
+    Index,
+    case,
+    func,
     create_engine,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.types import TypeDecorator
 import enum
 
 Base = declarative_base()
@@ -36,6 +44,65 @@ class SectionType(enum.Enum):
     OVERVIEW = "overview"
 
 
+class JSONList(TypeDecorator):
+    """
+    JSON array stored as TEXT and decoded once when a row is loaded.
+    
+    Writes accept a list or a JSON string and are validated: every item
+    must be an item_type value, or a dict with the required keys when
+    item_keys is given. Reads return plain lists; malformed legacy values decode to an
+    empty list and invalid items are dropped, so consumers never parse.
+    
+    Args:
+        item_keys: Keys each dict item must have; None for scalar items
+        item_type: Type of scalar items (str or int)
+    """
+    impl = Text
+    cache_ok = True
+    
+    def __init__(self, item_keys: Optional[Tuple[str, ...]] = None, item_type: type = str, **kwargs):
+        super().__init__(**kwargs)
+        self.item_keys = item_keys
+        self.item_type = item_type
+    
+    def _valid_item(self, item: Any) -> bool:
+        """Check a single item against the column's item shape."""
+        if self.item_keys is None:
+            return isinstance(item, self.item_type) and not isinstance(item, bool)
+        return isinstance(item, dict) and all(isinstance(item.get(k), str) for k in self.item_keys)
+    
+    def process_bind_param(self, value: Any, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = json.loads(value)
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"Expected a JSON list, got {type(value).__name__}")
+        for i, item in enumerate(value):
+            if not self._valid_item(item):
+                expected = f"dict with keys {', '.join(self.item_keys)}" if self.item_keys else (
+                    "string" if self.item_type is str else self.item_type.__name__
+                )
+                raise ValueError(f"Item {i} must be a {expected}: {item!r}")
+        return json.dumps(list(value), ensure_ascii=False)
+    
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[List[Any]]:
+        if value is None:
+            return None
+        try:
+            items = json.loads(value)
+        except ValueError:
+            return []
+        if not isinstance(items, list):
+            return []
+        return [item for item in items if self._valid_item(item)]
+
+
+def json_array_length(column) -> Any:
+    """SQL expression for the length of a JSON list column (0 when NULL or invalid)."""
+    return case((func.json_valid(column), func.json_array_length(column)), else_=0)
+
+
 class Genre(Base):
     """
     Genre model representing book categories.
@@ -103,6 +170,19 @@ class Book(Base):
     created_at: datetime = Column(DateTime, default=datetime.utcnow)
     updated_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Serves genre_id lookups, genre listings and keyset pagination on (title, id)
+        Index("ix_books_genre_title", "genre_id", "title", "id"),
+        # Whole-catalogue listings in title order
+        Index("ix_books_title", "title", "id"),
+        # Featured books in title order
+        Index("ix_books_featured_title", "is_featured", "title", "id"),
+        # Most recently added books
+        Index("ix_books_created_at", "created_at"),
+        # Distinct publication years for the filters (covering)
+        Index("ix_books_publication_year", "publication_year"),
+    )
+    
     # Relationships
     genre = relationship("Genre", back_populates="books")
     summary = relationship("Summary", back_populates="book", uselist=False)
@@ -124,13 +204,15 @@ class Summary(Base):
         book_id: Foreign key to book
         overview_text: Brief overview/intro
         main_content: Main summary content (markdown)
-        key_takeaways: JSON/text list of key takeaways
+        key_takeaways: List of {title, text} takeaways
         who_should_read: Target audience description
         difficulty: Reading difficulty level
         reading_time: Estimated reading time in minutes
         seo_title: SEO-optimized title
         seo_description: SEO meta description
         images: Related concept images
+        takeaway_count: Number of takeaways (filterable in queries)
+        has_quotes: Whether the summary has quotes (filterable in queries)
     """
     __tablename__ = "summaries"
     
@@ -138,7 +220,7 @@ class Summary(Base):
     book_id: int = Column(Integer, ForeignKey("books.id"), nullable=False, unique=True)
     overview_text: str = Column(Text, nullable=False)
     main_content: str = Column(Text, nullable=False)
-    key_takeaways: str = Column(Text, nullable=False)  # JSON string
+    key_takeaways: List[dict] = Column(JSONList(("title", "text")), nullable=False)
     who_should_read: str = Column(Text, nullable=False)
     difficulty: str = Column(String(20), default="intermediate")
     reading_time: int = Column(Integer, default=10)  # minutes
@@ -147,9 +229,9 @@ class Summary(Base):
     # Rich Content Fields (JSON/Text)
     executive_summary: str = Column(Text, nullable=True) # The "60-second read"
     quote_of_the_book: str = Column(Text, nullable=True)
-    analogies: str = Column(Text, nullable=True) # JSON: [{concept, analogy, explanation}]
-    quotes: str = Column(Text, nullable=True) # JSON: [string]
-    action_steps: str = Column(Text, nullable=True) # JSON: [string]
+    analogies: Optional[List[dict]] = Column(JSONList(("concept", "analogy", "explanation")), nullable=True)
+    quotes: Optional[List[str]] = Column(JSONList(), nullable=True)
+    action_steps: Optional[List[str]] = Column(JSONList(), nullable=True)
     
     seo_title: Optional[str] = Column(String(200), nullable=True)
     seo_description: Optional[str] = Column(String(500), nullable=True)
@@ -157,10 +239,34 @@ class Summary(Base):
     created_at: datetime = Column(DateTime, default=datetime.utcnow)
     updated_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Top-rated books: walks ratings in order and reads book_id from the index
+        Index("ix_summaries_rating", "rating", "book_id"),
+        # Reading-time and difficulty filters of the filter panel
+        Index("ix_summaries_reading_time", "reading_time", "book_id"),
+        Index("ix_summaries_difficulty", "difficulty", "book_id"),
+    )
+    
     # Relationships
     book = relationship("Book", back_populates="summary")
     images = relationship("SummaryImage", back_populates="summary", lazy="dynamic")
     
+    @hybrid_property
+    def takeaway_count(self) -> int:
+        return len(self.key_takeaways or [])
+    
+    @takeaway_count.expression
+    def takeaway_count(cls):
+        return json_array_length(cls.key_takeaways)
+    
+    @hybrid_property
+    def has_quotes(self) -> bool:
+        return bool(self.quotes)
+    
+    @has_quotes.expression
+    def has_quotes(cls):
+        return json_array_length(cls.quotes) > 0
+    
     def __repr__(self) -> str:
         return f"<Summary(book_id={self.book_id}, reading_time={self.reading_time}min)>"
 
@@ -191,8 +297,256 @@ class SummaryImage(Base):
     order: int = Column(Integer, default=0)
     created_at: datetime = Column(DateTime, default=datetime.utcnow)
     
+    # A summary's images in display order
+    __table_args__ = (Index("ix_summary_images_summary_order", "summary_id", "order"),)
+    
     # Relationships
     summary = relationship("Summary", back_populates="images")
     
     def __repr__(self) -> str:
         return f"<SummaryImage(section='{self.section_title}', type='{self.section_type}')>"
+
+
+class BookIndexEntry(Base):
+    """
+    BookIndexEntry model tracking the recommendation index build per book.
+    
+    Built offline by services.recommendation_index and refreshed only for
+    books whose row or summary changed since the last build. The ranked
+    neighbours themselves live in book_recommendations.
+    
+    Attributes:
+        book_id: Foreign key to book (primary key)
+        keywords: JSON list of extracted keywords
+        book_updated_at: Book.updated_at the entry was built from
+        summary_updated_at: Summary.updated_at the entry was built from
+        indexed_at: When the entry was last rebuilt
+    """
+    __tablename__ = "book_index"
+    
+    book_id: int = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    keywords: List[str] = Column(JSONList(), nullable=False)
+    book_updated_at: Optional[datetime] = Column(DateTime, nullable=True)
+    summary_updated_at: Optional[datetime] = Column(DateTime, nullable=True)
+    indexed_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self) -> str:
+        return f"<BookIndexEntry(book_id={self.book_id})>"
+
+
+class BookRecommendation(Base):
+    """
+    BookRecommendation model materializing a book's top-K similar books.
+    
+    Written by services.recommendation_index; the detail page reads a
+    book's first rows by rank through ix_book_recommendations_book_rank.
+    
+    Attributes:
+        book_id: Book the recommendation is shown on
+        rec_book_id: Recommended book
+        rank: Position in the book's list (0 = best)
+        score: Recommendation score
+        reasons: Up to three human-readable reasons
+    """
+    __tablename__ = "book_recommendations"
+    
+    book_id: int = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    rec_book_id: int = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    rank: int = Column(Integer, nullable=False)
+    score: float = Column(Float, nullable=False)
+    reasons: List[str] = Column(JSONList(), nullable=False, default=list)
+    
+    __table_args__ = (Index("ix_book_recommendations_book_rank", "book_id", "rank"),)
+    
+    def __repr__(self) -> str:
+        return f"<BookRecommendation(book_id={self.book_id}, rec_book_id={self.rec_book_id}, rank={self.rank})>"
+
+
+class DailyPick(Base):
+    """
+    DailyPick model recording the Book of the Day.
+    
+    The first request of a day draws the book and stores it; every later
+    request that day reads it back by primary key.
+    
+    Attributes:
+        day: Calendar day (primary key)
+        book_id: Book picked for the day
+        created_at: When the pick was drawn
+    """
+    __tablename__ = "daily_picks"
+    
+    day: date = Column(Date, primary_key=True)
+    book_id: int = Column(Integer, ForeignKey("books.id"), nullable=False)
+    created_at: datetime = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self) -> str:
+        return f"<DailyPick(day={self.day}, book_id={self.book_id})>"
+
+
+class ImageCheck(Base):
+    """
+    ImageCheck model caching the result of probing an image URL.
+    
+    Written by services.image_checker in the background and read by
+    load_image_safe, so page renders never make network requests.
+    
+    Attributes:
+        url: Checked image URL (primary key)
+        ok: Whether the image was reachable
+        status_code: HTTP status of the last check, None on network error
+        etag: ETag header used for conditional re-checks
+        last_modified: Last-Modified header used for conditional re-checks
+        error: Short error description when the check failed
+        checked_at: When the URL was last checked
+    """
+    __tablename__ = "image_checks"
+    
+    url: str = Column(String(500), primary_key=True)
+    ok: bool = Column(Boolean, nullable=False, default=False)
+    status_code: Optional[int] = Column(Integer, nullable=True)
+    etag: Optional[str] = Column(String(200), nullable=True)
+    last_modified: Optional[str] = Column(String(100), nullable=True)
+    error: Optional[str] = Column(String(300), nullable=True)
+    checked_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<ImageCheck(url='{self.url}', ok={self.ok})>"
+
+
+class CachedImage(Base):
+    """
+    CachedImage model mapping a remote image URL to local derivatives.
+    
+    Derivatives are content-addressed: files are named after the SHA-256
+    of the downloaded bytes, so identical images share one set of files.
+    
+    Attributes:
+        url: Remote image URL (primary key)
+        content_hash: SHA-256 hex digest of the downloaded image
+        width: Source image width in pixels
+        height: Source image height in pixels
+        widths: JSON list of generated derivative widths
+        formats: JSON list of generated formats (jpeg, webp, avif)
+        etag: ETag used for conditional re-downloads
+        fetched_at: When the image was last downloaded or revalidated
+    """
+    __tablename__ = "cached_images"
+    
+    url: str = Column(String(500), primary_key=True)
+    content_hash: str = Column(String(64), nullable=False, index=True)
+    width: int = Column(Integer, nullable=False)
+    height: int = Column(Integer, nullable=False)
+    widths: List[int] = Column(JSONList(item_type=int), nullable=False)
+    formats: List[str] = Column(JSONList(), nullable=False)
+    etag: Optional[str] = Column(String(200), nullable=True)
+    fetched_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<CachedImage(url='{self.url}', hash='{self.content_hash[:12]}')>"
+
+
+class AIResponse(Base):
+    """
+    AIResponse model caching a generated LLM answer.
+    
+    Keyed by a hash of the prompt template version, the book context and
+    the normalized question, so identical requests reuse one answer.
+    
+    Attributes:
+        key: SHA-256 cache key (primary key)
+        kind: Request type (chat, quiz, audio or library)
+        response: Generated text
+        prompt_chars: Prompt length, used to estimate tokens saved
+        generation_ms: How long the original generation took
+        hits: Number of times the cached answer was served
+        created_at: When the answer was generated
+        last_used_at: When the answer was last served (LRU order)
+    """
+    __tablename__ = "ai_responses"
+    
+    key: str = Column(String(64), primary_key=True)
+    kind: str = Column(String(20), nullable=False)
+    response: str = Column(Text, nullable=False)
+    prompt_chars: int = Column(Integer, nullable=False, default=0)
+    generation_ms: float = Column(Float, nullable=False, default=0.0)
+    hits: int = Column(Integer, nullable=False, default=0)
+    created_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at: datetime = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<AIResponse(kind='{self.kind}', key='{self.key[:12]}', hits={self.hits})>"
+
+
+class PassageIndexEntry(Base):
+    """
+    PassageIndexEntry model tracking which summaries are in the passage index.
+    
+    Built by services.passage_index; a book is re-split and re-indexed
+    only when its Summary.updated_at differs from the stored value.
+    
+    Attributes:
+        book_id: Foreign key to book (primary key)
+        passage_count: Number of passages indexed for the book
+        summary_updated_at: Summary.updated_at the passages were built from
+        indexed_at: When the book was last indexed
+    """
+    __tablename__ = "passage_index"
+    
+    book_id: int = Column(Integer, ForeignKey("books.id"), primary_key=True)
+    passage_count: int = Column(Integer, nullable=False, default=0)
+    summary_updated_at: Optional[datetime] = Column(DateTime, nullable=True)
+    indexed_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self) -> str:
+        return f"<PassageIndexEntry(book_id={self.book_id}, passages={self.passage_count})>"
+
+
+class DataVersion(Base):
+    """
+    DataVersion model holding the catalogue's single data-version row.
+    
+    Triggers installed by database.data_version increment version on
+    every insert, update or delete of genres, books and summaries, so
+    in-process caches can tell in one primary-key read whether the
+    catalogue changed.
+    
+    Attributes:
+        id: Always 1
+        epoch: Random token set when the row is created; distinguishes
+            a recreated database whose counter restarted
+        version: Number of catalogue writes since the row was created
+    """
+    __tablename__ = "data_version"
+    
+    id: int = Column(Integer, primary_key=True)
+    epoch: str = Column(String(32), nullable=False)
+    version: int = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self) -> str:
+        return f"<DataVersion(epoch='{self.epoch}', version={self.version})>"
+
+
+class IndexBuild(Base):
+    """
+    IndexBuild model recording the data version a derived index was built from.
+    
+    A build stores the catalogue data version it read, so any later write
+    to genres, books or summaries (including deletes) marks the index
+    stale with one primary-key read.
+    
+    Attributes:
+        name: Index name (primary key)
+        epoch: DataVersion.epoch at build time
+        version: DataVersion.version at build time
+        built_at: When the build finished
+    """
+    __tablename__ = "index_builds"
+    
+    name: str = Column(String(50), primary_key=True)
+    epoch: str = Column(String(32), nullable=False)
+    version: int = Column(Integer, nullable=False)
+    built_at: datetime = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self) -> str:
+        return f"<IndexBuild(name='{self.name}', version={self.version})>"
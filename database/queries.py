@@ -1,122 +1,448 @@
 """
 Database query functions for BookWise.
 Provides cached data access methods for all models.
+
+Catalogue lookups (genres, books by id, slug, genre or author, summaries
+and counts) are served from a process-wide CatalogueSnapshot that is
+reloaded only when the catalogue data version changes, so they cost one
+primary-key read and never return stale data. get_genre_stats() keeps
+its GROUP BY result per data version in the same way.
 """
 
-from typing import List, Optional
+import threading
+from dataclasses import dataclass, replace
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
-import streamlit as st
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import ScalarSelect, func, literal, literal_column, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import Select
+
+from database.models import Genre, Book, Summary, SummaryImage, DailyPick
+from database.connection import get_db_session, get_read_session
+from database.data_version import Version, get_data_version
+from database.search import search_catalog
+from database.views import (
+    GENRE_COLUMNS,
+    BookView,
+    CatalogueSnapshot,
+    GenreStats,
+    GenreView,
+    SummaryView,
+    book_views,
+    genre_views,
+    select_books,
+    select_genres,
+    select_summaries,
+    summary_view,
+)
+
+
+# Book ids per IN (...) query when loading summaries in bulk
+SUMMARY_BATCH_SIZE = 500
+
+# Keyset pagination cursor: (title, id) of the last book on the previous page
+BookCursor = Tuple[str, int]
+
+# Reading-time buckets of the filter panel: key -> inclusive (min, max) minutes
+READING_TIME_BUCKETS: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+    "under_10": (None, 9),
+    "10_15": (10, 15),
+    "16_20": (16, 20),
+    "over_20": (21, None),
+}
+
+# Sort orders of the filter panel; every order ends in (title, id) so pages are stable
+BOOK_SORTS = {
+    "title": (Book.title, Book.id),
+    "title_desc": (Book.title.desc(), Book.id.desc()),
+    "newest": (Book.publication_year.desc().nulls_last(), Book.title, Book.id),
+    "oldest": (Book.publication_year.asc().nulls_last(), Book.title, Book.id),
+    "rating": (Summary.rating.desc().nulls_last(), Book.title, Book.id),
+}
+
+# Process-wide catalogue snapshot, replaced when the data version changes
+_snapshot: Optional[CatalogueSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+# Genre stats with the data version they were computed at
+_genre_stats: Optional[Tuple[Version, Tuple[GenreStats, ...]]] = None
+
+
+def get_all_genres() -> List[GenreView]:
+    """
+    Get all genres ordered by name. (Snapshot)
+    
+    Returns:
+        List[GenreView]: All genres in alphabetical order
+    """
+    return list(get_catalogue_snapshot().genres)
+
 
-from database.models import Genre, Book, Summary, SummaryImage
-from database.connection import get_db_session
+def get_genre_stats() -> List[GenreStats]:
+    """
+    Get book count, average rating and total reading time per genre. (Versioned)
+    
+    Computed in a single GROUP BY, so the cost grows with the number of
+    genres rather than the size of the catalogue. The result is reused
+    until the data version changes, so a warm call is one version read.
+    
+    Returns:
+        List[GenreStats]: Stats for every genre in alphabetical order
+    """
+    global _genre_stats
+    version = get_data_version()
+    cached = _genre_stats
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+    
+    with get_read_session() as session:
+        query = (
+            select_genres()
+            .add_columns(
+                func.count(Book.id),
+                func.count(Summary.id),
+                func.avg(Summary.rating),
+                func.coalesce(func.sum(Summary.reading_time), 0),
+            )
+            .outerjoin(Book, Book.genre_id == Genre.id)
+            .outerjoin(Summary, Summary.book_id == Book.id)
+            .group_by(Genre.id)
+            .order_by(Genre.name)
+        )
+        width = len(GENRE_COLUMNS)
+        stats = tuple(
+            GenreStats(
+                genre=GenreView(*row[:width]),
+                book_count=row[width],
+                summary_count=row[width + 1],
+                avg_rating=row[width + 2],
+                total_reading_time=row[width + 3],
+            )
+            for row in session.execute(query)
+        )
+    _genre_stats = (version, stats)
+    return list(stats)
 
 
-# Cache TTL in seconds (5 minutes for genre/count data)
-CACHE_TTL = 300
+def get_genre_by_slug(slug: str) -> Optional[GenreView]:
+    """
+    Get a genre by its URL slug. (Snapshot)
+    
+    Args:
+        slug: URL-friendly genre identifier
+    
+    Returns:
+        Optional[GenreView]: The genre if found, None otherwise
+    """
+    return get_catalogue_snapshot().genres_by_slug.get(slug)
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def get_all_genres() -> List[Genre]:
+def get_books_by_genre(genre_slug: str, limit: Optional[int] = None) -> List[BookView]:
     """
-    Get all genres ordered by name. (Cached)
+    Get all books in a specific genre. (Snapshot)
+    
+    Args:
+        genre_slug: URL-friendly genre identifier
+        limit: Maximum number of books to return
     
     Returns:
-        List[Genre]: All genres in alphabetical order
+        List[BookView]: Books in the specified genre, ordered by title
     """
-    with get_db_session() as session:
-        genres = session.query(Genre).order_by(Genre.name).all()
-        # Detach from session for caching
-        session.expunge_all()
-        return genres
+    books = get_catalogue_snapshot().books_by_genre.get(genre_slug, ())
+    return list(books[:limit] if limit else books)
 
 
-def get_genre_by_slug(slug: str) -> Optional[Genre]:
+def genre_page_query(genre_slug: str, limit: int, after: Optional[BookCursor] = None) -> Select:
     """
-    Get a genre by its URL slug.
+    Build a keyset-paginated SELECT for books in a genre.
+    
+    Seeks directly to the first (title, id) after the cursor, so every
+    page costs the same regardless of its position.
     
     Args:
-        slug: URL-friendly genre identifier
+        genre_slug: URL-friendly genre identifier
+        limit: Page size
+        after: Cursor of the last book on the previous page
     
     Returns:
-        Optional[Genre]: The genre if found, None otherwise
+        Select: Query yielding select_books() rows ordered by (title, id)
     """
-    with get_db_session() as session:
-        genre = session.query(Genre).filter(Genre.slug == slug).first()
-        if genre:
-            session.expunge(genre)
-        return genre
+    query = select_books().where(Genre.slug == genre_slug)
+    if after is not None:
+        query = query.where(tuple_(Book.title, Book.id) > tuple_(*after))
+    return query.order_by(Book.title, Book.id).limit(limit)
 
 
-def get_books_by_genre(genre_slug: str, limit: Optional[int] = None) -> List[Book]:
+def get_books_by_genre_page(
+    genre_slug: str,
+    limit: int = 12,
+    after: Optional[BookCursor] = None
+) -> List[BookView]:
     """
-    Get all books in a specific genre.
+    Get one page of books in a genre using a keyset cursor.
     
     Args:
         genre_slug: URL-friendly genre identifier
-        limit: Maximum number of books to return
+        limit: Page size
+        after: Cursor of the last book on the previous page, None for page 1
     
     Returns:
-        List[Book]: Books in the specified genre
+        List[BookView]: Up to limit books ordered by (title, id)
     """
-    with get_db_session() as session:
-        query = (
-            session.query(Book)
-            .join(Genre)
-            .filter(Genre.slug == genre_slug)
-            .order_by(Book.title)
+    with get_read_session() as session:
+        return book_views(session.execute(genre_page_query(genre_slug, limit, after)))
+
+
+def get_genre_page_index(genre_slug: str, page_size: int) -> Tuple[int, List[BookCursor]]:
+    """
+    Get the total book count and page cursors for a genre. (Snapshot)
+    
+    cursors[n] is the cursor that starts page n + 2, so any page can be
+    fetched with a single keyset seek.
+    
+    Args:
+        genre_slug: URL-friendly genre identifier
+        page_size: Page size
+    
+    Returns:
+        Tuple of (total_books, cursors)
+    """
+    # Snapshot genre lists are in (title, id) order, like the keyset pages
+    books = get_catalogue_snapshot().books_by_genre.get(genre_slug, ())
+    return len(books), [(book.title, book.id) for book in books[page_size - 1::page_size]]
+
+
+@dataclass(frozen=True)
+class BookFilter:
+    """
+    Composable book filter compiled to a single SQL query.
+    
+    Unset fields do not filter. Build variations with where(), e.g.
+    BookFilter(genre_slug="business").where(sort="rating").
+    
+    Attributes:
+        genre_slug: Only books in this genre
+        year: Only books published in this year
+        reading_time: Key of READING_TIME_BUCKETS
+        difficulty: Summary difficulty as stored (e.g. "Beginner")
+        min_rating: Minimum summary rating
+        sort: Key of BOOK_SORTS
+    """
+    genre_slug: Optional[str] = None
+    year: Optional[int] = None
+    reading_time: Optional[str] = None
+    difficulty: Optional[str] = None
+    min_rating: Optional[float] = None
+    sort: str = "title"
+    
+    def __post_init__(self):
+        if self.reading_time is not None and self.reading_time not in READING_TIME_BUCKETS:
+            raise ValueError(f"Unknown reading time bucket: {self.reading_time}")
+        if self.sort not in BOOK_SORTS:
+            raise ValueError(f"Unknown sort: {self.sort}")
+    
+    def where(self, **changes) -> "BookFilter":
+        """Return a copy with some fields changed."""
+        return replace(self, **changes)
+    
+    @property
+    def needs_summary(self) -> bool:
+        """Whether the query has to join summaries."""
+        return bool(
+            self.reading_time or self.difficulty or self.min_rating is not None
+            or self.sort == "rating"
         )
-        if limit:
-            query = query.limit(limit)
-        books = query.all()
-        session.expunge_all()
-        return books
+    
+    @property
+    def is_default(self) -> bool:
+        """Whether only the genre is set and books are in title order."""
+        return self.where(genre_slug=None) == BookFilter()
+    
+    def apply(self, query: Select) -> Select:
+        """
+        Add this filter's joins and conditions to a books query.
+        
+        Args:
+            query: select_books() or another SELECT joining books to genres
+        
+        Returns:
+            Select: Filtered query (unordered)
+        """
+        if self.needs_summary:
+            # Books without a summary cannot match summary filters or be
+            # ranked by rating; the inner join lets SQLite drive from summaries
+            query = query.join(Summary, Summary.book_id == Book.id)
+        if self.genre_slug is not None:
+            query = query.where(Genre.slug == self.genre_slug)
+        if self.year is not None:
+            query = query.where(Book.publication_year == self.year)
+        if self.reading_time is not None:
+            low, high = READING_TIME_BUCKETS[self.reading_time]
+            if low is not None:
+                query = query.where(Summary.reading_time >= low)
+            if high is not None:
+                query = query.where(Summary.reading_time <= high)
+        if self.difficulty is not None:
+            query = query.where(Summary.difficulty == self.difficulty)
+        if self.min_rating is not None:
+            query = query.where(Summary.rating >= self.min_rating)
+        return query
+
+
+def filtered_books_query(book_filter: BookFilter, limit: int, offset: int = 0) -> Select:
+    """
+    Build the SELECT for one page of filtered, sorted books.
+    
+    Args:
+        book_filter: Filter and sort to apply
+        limit: Page size
+        offset: Number of matching books to skip
+    
+    Returns:
+        Select: Query yielding select_books() rows
+    """
+    query = book_filter.apply(select_books()).order_by(*BOOK_SORTS[book_filter.sort]).limit(limit)
+    return query.offset(offset) if offset else query
+
+
+def get_filtered_books(book_filter: BookFilter, limit: int = 12, offset: int = 0) -> List[BookView]:
+    """
+    Get one page of books matching a filter, in its sort order.
+    
+    Args:
+        book_filter: Filter and sort to apply
+        limit: Page size
+        offset: Number of matching books to skip
+    
+    Returns:
+        List[BookView]: Up to limit books with genres attached
+    """
+    with get_read_session() as session:
+        return book_views(session.execute(filtered_books_query(book_filter, limit, offset)))
+
+
+def count_filtered_books(book_filter: BookFilter) -> int:
+    """
+    Count the books matching a filter.
+    
+    Args:
+        book_filter: Filter to apply (its sort is ignored)
+    
+    Returns:
+        int: Number of matching books
+    """
+    query = book_filter.apply(
+        select(func.count(Book.id)).select_from(Book).join(Genre, Book.genre_id == Genre.id)
+    )
+    with get_read_session() as session:
+        return session.execute(query).scalar()
 
 
-def get_book_by_slug(slug: str) -> Optional[Book]:
+def get_book_by_slug(slug: str) -> Optional[BookView]:
     """
-    Get a book by its URL slug with related data.
+    Get a book by its URL slug with related data. (Snapshot)
     
     Args:
         slug: URL-friendly book identifier
     
     Returns:
-        Optional[Book]: The book with genre loaded, None if not found
+        Optional[BookView]: The book with genre attached, None if not found
     """
-    with get_db_session() as session:
-        book = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
-            .filter(Book.slug == slug)
-            .first()
-        )
-        if book:
-            # Access related objects before expunge
-            _ = book.genre
-            session.expunge_all()
-        return book
+    return get_catalogue_snapshot().books_by_slug.get(slug)
 
 
-def get_summary_for_book(book_id: int) -> Optional[Summary]:
+def get_summary_for_book(book_id: int) -> Optional[SummaryView]:
     """
-    Get the summary for a specific book.
+    Get the summary for a specific book. (Snapshot)
     
     Args:
         book_id: Book database ID
     
     Returns:
-        Optional[Summary]: The book's summary if exists
+        Optional[SummaryView]: The book's summary if exists
     """
-    with get_db_session() as session:
-        summary = (
-            session.query(Summary)
-            .filter(Summary.book_id == book_id)
-            .first()
+    return get_catalogue_snapshot().summaries.get(book_id)
+
+
+def get_summaries_for_books(book_ids: Iterable[int]) -> Dict[int, SummaryView]:
+    """
+    Get the summaries of many books at once.
+    
+    Issues one query per SUMMARY_BATCH_SIZE ids instead of one per book.
+    
+    Args:
+        book_ids: Book database IDs
+    
+    Returns:
+        Dict[int, SummaryView]: Summaries by book id (books without one are absent)
+    """
+    ids = list(dict.fromkeys(book_ids))
+    summaries: Dict[int, SummaryView] = {}
+    if not ids:
+        return summaries
+    with get_read_session() as session:
+        for start in range(0, len(ids), SUMMARY_BATCH_SIZE):
+            batch = ids[start:start + SUMMARY_BATCH_SIZE]
+            for row in session.execute(select_summaries().where(Summary.book_id.in_(batch))):
+                summary = summary_view(row)
+                summaries[summary.book_id] = summary
+    return summaries
+
+
+def load_catalogue_snapshot(version: Optional[Version] = None) -> CatalogueSnapshot:
+    """
+    Load every genre, book and summary in three queries.
+    
+    Books reuse the GenreViews of the genre list, so the snapshot holds
+    one instance per genre.
+    
+    Args:
+        version: Data version read before loading, recorded on the snapshot
+    
+    Returns:
+        CatalogueSnapshot: Genres by name, books by title, summaries by book id
+    """
+    with get_read_session() as session:
+        genres = genre_views(session.execute(select_genres().order_by(Genre.name)))
+        books = book_views(
+            session.execute(select_books().order_by(Book.title, Book.id)),
+            {genre.id: genre for genre in genres},
         )
-        if summary:
-            session.expunge(summary)
-        return summary
+        summaries = {row.book_id: summary_view(row) for row in session.execute(select_summaries())}
+    return CatalogueSnapshot(
+        genres=tuple(genres),
+        books=tuple(books),
+        summaries=MappingProxyType(summaries),
+        version=version,
+    )
+
+
+def get_catalogue_snapshot() -> CatalogueSnapshot:
+    """
+    Get the process-wide catalogue snapshot.
+    
+    Costs one read of the data version; the catalogue is reloaded only
+    when a write to genres, books or summaries has bumped it. The version
+    is read before loading, so a write landing mid-load at worst causes
+    one extra reload, never a stale snapshot.
+    
+    Returns:
+        CatalogueSnapshot: Snapshot of the current catalogue
+    """
+    global _snapshot
+    version = get_data_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        # Another thread may have loaded this version while we waited
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = load_catalogue_snapshot(version)
+        return _snapshot
 
 
 def get_images_for_summary(summary_id: int) -> List[SummaryImage]:
@@ -129,7 +455,7 @@ def get_images_for_summary(summary_id: int) -> List[SummaryImage]:
     Returns:
         List[SummaryImage]: Images ordered by their display order
     """
-    with get_db_session() as session:
+    with get_read_session() as session:
         images = (
             session.query(SummaryImage)
             .filter(SummaryImage.summary_id == summary_id)
@@ -140,153 +466,188 @@ def get_images_for_summary(summary_id: int) -> List[SummaryImage]:
         return images
 
 
-@st.cache_data(ttl=CACHE_TTL)
-def get_featured_books(limit: int = 8) -> List[Book]:
+def get_featured_books(limit: int = 8) -> List[BookView]:
     """
-    Get featured books for the homepage. (Cached)
+    Get featured books for the homepage. (Snapshot)
     
     Args:
         limit: Maximum number of books to return
     
     Returns:
-        List[Book]: Featured books with genres loaded
+        List[BookView]: Featured books with genres attached
     """
-    with get_db_session() as session:
-        books = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
-            .filter(Book.is_featured == True)
-            .order_by(Book.title)
-            .limit(limit)
-            .all()
-        )
-        # Access related objects before expunge
-        for book in books:
-            _ = book.genre
-        session.expunge_all()
-        return books
+    return list(get_catalogue_snapshot().featured_books[:limit])
 
 
-def search_books(query: str, limit: int = 20) -> List[Book]:
+def search_books(query: str, limit: int = 20) -> List[BookView]:
     """
-    Search books by title or author.
+    Search books by title, author and summary text.
+    
+    Uses the FTS5 index with BM25 ranking and prefix matching.
     
     Args:
         query: Search term
         limit: Maximum number of results
     
     Returns:
-        List[Book]: Matching books with genres loaded
+        List[BookView]: Matching books with genres attached, best match first
     """
-    with get_db_session() as session:
-        search_term = f"%{query}%"
-        books = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
-            .filter(
-                (Book.title.ilike(search_term)) | 
-                (Book.author.ilike(search_term))
-            )
-            .order_by(Book.title)
-            .limit(limit)
-            .all()
-        )
-        for book in books:
-            _ = book.genre
-        session.expunge_all()
-        return books
+    return [hit.book for hit in search_catalog(query, limit=limit)]
 
 
-def get_all_books(limit: Optional[int] = None) -> List[Book]:
+def get_all_books(limit: Optional[int] = None) -> List[BookView]:
     """
-    Get all books with their genres.
+    Get all books with their genres. (Snapshot)
     
     Args:
         limit: Maximum number of books to return
     
     Returns:
-        List[Book]: All books ordered by title
+        List[BookView]: All books ordered by title
     """
-    with get_db_session() as session:
-        query = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
-            .order_by(Book.title)
-        )
-        if limit:
-            query = query.limit(limit)
-        books = query.all()
-        for book in books:
-            _ = book.genre
-        session.expunge_all()
-        return books
+    books = get_catalogue_snapshot().books
+    return list(books[:limit] if limit else books)
+
+
+def get_books_by_author(author: str) -> List[BookView]:
+    """
+    Get all books by an author. (Snapshot)
+    
+    Args:
+        author: Author name, matched case-insensitively
+    
+    Returns:
+        List[BookView]: The author's books ordered by title
+    """
+    return list(get_catalogue_snapshot().books_by_author.get(author.lower(), ()))
 
 
-@st.cache_data(ttl=CACHE_TTL)
 def get_books_count() -> int:
     """
-    Get total number of books. (Cached)
+    Get total number of books. (Snapshot)
     
     Returns:
         int: Total book count
     """
-    with get_db_session() as session:
-        return session.query(Book).count()
+    return len(get_catalogue_snapshot().books)
 
 
-@st.cache_data(ttl=CACHE_TTL)
 def get_genres_count() -> int:
     """
-    Get total number of genres. (Cached)
+    Get total number of genres. (Snapshot)
     
     Returns:
         int: Total genre count
     """
-    with get_db_session() as session:
-        return session.query(Genre).count()
+    return len(get_catalogue_snapshot().genres)
 
 
-@st.cache_data(ttl=CACHE_TTL)
 def get_summaries_count() -> int:
     """
-    Get total number of summaries. (Cached)
+    Get total number of summaries. (Snapshot)
     
     Returns:
         int: Total summary count
     """
-    with get_db_session() as session:
-        return session.query(Summary).count()
+    return len(get_catalogue_snapshot().summaries)
+
+
+def random_book_query() -> Select:
+    """
+    Build a SELECT for one random book using the id range.
+    
+    Draws an id between min(id) and max(id), each read from one end of
+    the primary key, and seeks to the first book at or after it. Every
+    step is a primary-key lookup, so the cost does not grow with the
+    catalogue. A book that follows a gap left by deleted ids is drawn
+    proportionally more often.
+    
+    Returns:
+        Select: Query yielding at most one select_books() row
+    """
+    return select_books().where(Book.id >= _random_book_id()).order_by(Book.id).limit(1)
+
 
+def _random_book_id() -> ScalarSelect:
+    """Draw an id between min(Book.id) and max(Book.id), once per query."""
+    low = select(func.min(Book.id)).scalar_subquery()
+    high = select(func.max(Book.id)).scalar_subquery()
+    # Uncorrelated scalar subquery, so random() is drawn once per query
+    return select(low + func.abs(func.random()) % (high - low + 1)).scalar_subquery()
 
-def get_random_book() -> Optional[Book]:
+
+def get_random_book() -> Optional[BookView]:
     """
     Get a random book from the database.
     
     Returns:
-        Optional[Book]: A random book with genre loaded
+        Optional[BookView]: A random book with genre attached
     """
-    import random
+    with get_read_session() as session:
+        books = book_views(session.execute(random_book_query()))
+        return books[0] if books else None
+
+
+def _read_daily_pick(day: date) -> Optional[BookView]:
+    """Read a day's stored pick, or None if it has none yet."""
+    with get_read_session() as session:
+        books = book_views(session.execute(
+            select_books()
+            .join(DailyPick, DailyPick.book_id == Book.id)
+            .where(DailyPick.day == day)
+        ))
+    return books[0] if books else None
+
+
+def _draw_daily_pick(day: date) -> None:
+    """Store a random book for the day in one INSERT ... SELECT."""
+    draw = sqlite_insert(DailyPick).from_select(
+        [DailyPick.day, DailyPick.book_id],
+        select(literal(day, DailyPick.day.type), Book.id)
+        .where(Book.id >= _random_book_id())
+        .order_by(Book.id)
+        .limit(1),
+    )
     with get_db_session() as session:
-        # Get total count
-        count = session.query(Book).count()
-        if count == 0:
-            return None
-        # Get random offset
-        random_offset = random.randint(0, count - 1)
-        book = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
-            .offset(random_offset)
-            .limit(1)
-            .first()
-        )
-        if book:
-            _ = book.genre  # Access before expunge
-            session.expunge_all()
-        return book
+        # A concurrent first insert wins, unless its book has since been deleted;
+        # the stored row is referenced by name, as ON CONFLICT has no FROM to correlate
+        stored_book_id = literal_column(f"{DailyPick.__tablename__}.book_id")
+        session.execute(draw.on_conflict_do_update(
+            index_elements=[DailyPick.day],
+            set_={"book_id": draw.excluded.book_id, "created_at": draw.excluded.created_at},
+            where=~select(Book.id).where(Book.id == stored_book_id).exists(),
+        ))
 
 
-def get_top_rated_books(limit: int = 6) -> List[Book]:
+def get_daily_pick(day: Optional[date] = None) -> Optional[BookView]:
+    """
+    Get the Book of the Day.
+    
+    Every request is one primary-key lookup; only the first request of
+    a day also inserts a random book into daily_picks (when processes
+    race, the first insert wins). The table is created by init_db.
+    
+    Args:
+        day: Calendar day (defaults to today)
+    
+    Returns:
+        Optional[BookView]: The day's book, None if there are no books
+    """
+    day = day or date.today()
+    try:
+        book = _read_daily_pick(day)
+        if book is None:
+            _draw_daily_pick(day)
+            book = _read_daily_pick(day)
+    except OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        # Database not migrated yet (python -m database.connection); pick without storing
+        return get_random_book()
+    return book
+
+
+def get_top_rated_books(limit: int = 6) -> List[BookView]:
     """
     Get top-rated books based on summary rating.
     
@@ -294,24 +655,19 @@ def get_top_rated_books(limit: int = 6) -> List[Book]:
         limit: Maximum number of books to return
     
     Returns:
-        List[Book]: Top-rated books with genres loaded
+        List[BookView]: Top-rated books with genres attached
     """
-    with get_db_session() as session:
-        books = (
-            session.query(Book)
-            .join(Summary)
-            .options(joinedload(Book.genre))
+    with get_read_session() as session:
+        query = (
+            select_books()
+            .join(Summary, Summary.book_id == Book.id)
             .order_by(Summary.rating.desc(), Book.title)
             .limit(limit)
-            .all()
         )
-        for book in books:
-            _ = book.genre
-        session.expunge_all()
-        return books
+        return book_views(session.execute(query))
 
 
-def get_recent_books(limit: int = 6) -> List[Book]:
+def get_recent_books(limit: int = 6) -> List[BookView]:
     """
     Get most recently added books.
     
@@ -319,18 +675,13 @@ def get_recent_books(limit: int = 6) -> List[Book]:
         limit: Maximum number of books to return
     
     Returns:
-        List[Book]: Recent books with genres loaded
+        List[BookView]: Recent books with genres attached
     """
-    with get_db_session() as session:
-        books = (
-            session.query(Book)
-            .options(joinedload(Book.genre))
+    with get_read_session() as session:
+        query = (
+            select_books()
             .order_by(Book.created_at.desc())
             .limit(limit)
-            .all()
         )
-        for book in books:
-            _ = book.genre
-        session.expunge_all()
-        return books
+        return book_views(session.execute(query))
 
@@ -0,0 +1,269 @@
+"""
+Full-text search for BookWise.
+Maintains an SQLite FTS5 index over book titles, authors and summary text,
+kept in sync by triggers, with BM25 ranking, prefix matching and snippet
+highlighting.
+
+Rebuild with: python -m database.search
+"""
+
+import re
+import html
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generator, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection, Engine
+
+from database.models import Book
+from database.connection import get_read_session, engine
+from database.views import BookView, book_views, select_books
+
+
+# BM25 column weights: title, author, overview, executive_summary, key_takeaways
+BM25_WEIGHTS = (10.0, 6.0, 2.0, 1.0, 1.5)
+
+# Snippet settings
+SNIPPET_TOKENS = 12
+SNIPPET_OPEN = '<mark style="background: #fef08a; padding: 0 2px; border-radius: 2px;">'
+SNIPPET_CLOSE = "</mark>"
+
+# Sentinels survive html.escape and are swapped for the mark tags afterwards
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_END = "\x03"
+
+CREATE_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title, author, overview, executive_summary, key_takeaways,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+# One FTS row per book; takeaways JSON is flattened to "title text" pairs
+_FTS_ROW_SELECT = """
+SELECT
+    b.id, b.title, b.author,
+    coalesce(s.overview_text, ''),
+    coalesce(s.executive_summary, ''),
+    CASE WHEN json_valid(s.key_takeaways) THEN (
+        SELECT group_concat(
+            CASE WHEN j.type = 'object'
+                THEN coalesce(json_extract(j.value, '$.title'), '') || ' ' || coalesce(json_extract(j.value, '$.text'), '')
+                ELSE j.value
+            END, ' ')
+        FROM json_each(s.key_takeaways) AS j
+    ) ELSE coalesce(s.key_takeaways, '') END
+FROM books AS b
+LEFT JOIN summaries AS s ON s.book_id = b.id
+"""
+
+_FTS_INSERT = "INSERT INTO books_fts(rowid, title, author, overview, executive_summary, key_takeaways) " + _FTS_ROW_SELECT
+
+TRIGGERS_SQL = [
+    f"""CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        {_FTS_INSERT} WHERE b.id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN
+        DELETE FROM books_fts WHERE rowid = OLD.id;
+        {_FTS_INSERT} WHERE b.id = NEW.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        DELETE FROM books_fts WHERE rowid = OLD.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        DELETE FROM books_fts WHERE rowid = NEW.book_id;
+        {_FTS_INSERT} WHERE b.id = NEW.book_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_au AFTER UPDATE ON summaries BEGIN
+        DELETE FROM books_fts WHERE rowid IN (OLD.book_id, NEW.book_id);
+        {_FTS_INSERT} WHERE b.id IN (OLD.book_id, NEW.book_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        DELETE FROM books_fts WHERE rowid = OLD.book_id;
+        {_FTS_INSERT} WHERE b.id = OLD.book_id;
+    END""",
+]
+
+TRIGGER_NAMES = [re.search(r"CREATE TRIGGER IF NOT EXISTS (\w+)", sql).group(1) for sql in TRIGGERS_SQL]
+
+SEARCH_SQL = f"""
+SELECT
+    rowid,
+    bm25(books_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score,
+    snippet(books_fts, -1, '{_HIGHLIGHT_START}', '{_HIGHLIGHT_END}', '…', {SNIPPET_TOKENS}) AS snippet
+FROM books_fts
+WHERE books_fts MATCH :match
+ORDER BY score
+LIMIT :limit
+"""
+
+# Set once the FTS table and triggers exist on the application engine
+_index_ready = False
+
+
+@dataclass
+class SearchHit:
+    """Represents a ranked search result."""
+    book: BookView
+    score: float  # BM25 score, lower is better
+    snippet: str  # HTML-safe excerpt with matches highlighted
+
+
+def ensure_search_index(bind: Optional[Engine] = None) -> None:
+    """
+    Create the FTS table and sync triggers if missing.
+    
+    A newly created index is populated from the existing catalogue.
+    
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    """
+    global _index_ready
+    bind = bind or engine
+    if bind is engine and _index_ready:
+        return
+    
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'")
+        ).first()
+        conn.execute(text(CREATE_FTS_SQL))
+        for trigger_sql in TRIGGERS_SQL:
+            conn.execute(text(trigger_sql))
+        if not exists:
+            conn.execute(text(_FTS_INSERT))
+    
+    if bind is engine:
+        _index_ready = True
+
+
+def rebuild_search_index(bind: Optional[Engine] = None) -> int:
+    """
+    Repopulate the FTS index from scratch and optimize it.
+    
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    
+    Returns:
+        int: Number of indexed books
+    """
+    bind = bind or engine
+    ensure_search_index(bind)
+    with bind.begin() as conn:
+        conn.execute(text("DELETE FROM books_fts"))
+        conn.execute(text(_FTS_INSERT))
+        conn.execute(text("INSERT INTO books_fts(books_fts) VALUES ('optimize')"))
+        return conn.execute(text("SELECT count(*) FROM books_fts")).scalar()
+
+
+@contextmanager
+def deferred_search_sync(conn: Connection) -> Generator[Set[int], None, None]:
+    """
+    Suspend the FTS sync triggers for a bulk write.
+    
+    Runs inside the caller's transaction: the triggers are dropped, the
+    caller adds the ids of the books it wrote to the yielded set, and on
+    exit those books are reindexed with one INSERT ... SELECT and the
+    triggers recreated. Other connections only ever see the committed,
+    in-sync state; if the block raises, rolling back restores the triggers.
+    Does nothing on a database without a search index.
+    
+    Args:
+        conn: Connection with an open SQLite transaction (BEGIN issued;
+            pysqlite only begins implicitly before DML)
+    
+    Yields:
+        Set[int]: Ids of the books to reindex, filled in by the caller
+    """
+    book_ids: Set[int] = set()
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'")
+    ).first()
+    if not exists:
+        yield book_ids
+        return
+    
+    for name in TRIGGER_NAMES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    yield book_ids
+    if book_ids:
+        ids = {"ids": sorted(book_ids)}
+        conn.execute(text("DELETE FROM books_fts WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)), ids)
+        conn.execute(text(_FTS_INSERT + " WHERE b.id IN :ids").bindparams(bindparam("ids", expanding=True)), ids)
+    for trigger_sql in TRIGGERS_SQL:
+        conn.execute(text(trigger_sql))
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+    
+    Every word becomes a quoted prefix term, so user input can never
+    inject FTS syntax and partial words still match.
+    
+    Args:
+        query: Raw search text
+    
+    Returns:
+        str: MATCH expression, empty if the query has no words
+    """
+    terms = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _render_snippet(raw: Optional[str]) -> str:
+    """Escape a raw FTS snippet and turn highlight sentinels into mark tags."""
+    escaped = html.escape(raw or "")
+    return escaped.replace(_HIGHLIGHT_START, SNIPPET_OPEN).replace(_HIGHLIGHT_END, SNIPPET_CLOSE)
+
+
+def search_book_ids(conn: Connection, match: str, limit: int = 20) -> List[Tuple[int, float, str]]:
+    """
+    Run a ranked FTS query.
+    
+    Args:
+        conn: Open database connection
+        match: MATCH expression from build_match_query
+        limit: Maximum number of results
+    
+    Returns:
+        List of (book_id, score, snippet) tuples, best match first
+    """
+    rows = conn.execute(text(SEARCH_SQL), {"match": match, "limit": limit}).all()
+    return [(row[0], row[1], _render_snippet(row[2])) for row in rows]
+
+
+def search_catalog(query: str, limit: int = 20) -> List[SearchHit]:
+    """
+    Search titles, authors and summary text.
+    
+    Args:
+        query: Search term
+        limit: Maximum number of results
+    
+    Returns:
+        List[SearchHit]: BM25-ranked hits with genres attached
+    """
+    match = build_match_query(query or "")
+    if not match:
+        return []
+    
+    ensure_search_index()
+    with get_read_session() as session:
+        rows = search_book_ids(session.connection(), match, limit)
+        ids = [row[0] for row in rows]
+        books = book_views(session.execute(select_books().where(Book.id.in_(ids)))) if ids else []
+    
+    books_by_id = {b.id: b for b in books}
+    return [
+        SearchHit(book=books_by_id[book_id], score=score, snippet=snippet)
+        for book_id, score, snippet in rows
+        if book_id in books_by_id
+    ]
+
+
+if __name__ == "__main__":
+    count = rebuild_search_index()
+    print(f"🔍 Search index rebuilt for {count} books.")
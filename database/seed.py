@@ -5,42 +5,25 @@ Updated to include Analogies, Action Steps, Quotes, and Executive Summaries.
 SAFE SEEDING: Does NOT drop existing data. Uses upsert pattern.
 """
 
-from sqlalchemy.orm import Session
-from database.connection import get_session, engine
-from database.models import Base, Genre, Book, Summary, SummaryImage
+from database.connection import init_db
+from database.ingest import ingest_books, upsert_genres
 import json
 import sys
 
-# Create tables only if they don't exist (SAFE - never drops data)
-Base.metadata.create_all(bind=engine)
-
-
-def get_or_create_genre(db: Session, name: str, slug: str, icon: str, description: str) -> Genre:
-    """Get existing genre or create new one (upsert pattern)."""
-    existing = db.query(Genre).filter(Genre.slug == slug).first()
-    if existing:
-        return existing
-    
-    genre = Genre(name=name, slug=slug, icon=icon, description=description)
-    db.add(genre)
-    db.commit()
-    return genre
-
-
-def book_exists(db: Session, slug: str) -> bool:
-    """Check if a book already exists."""
-    return db.query(Book).filter(Book.slug == slug).first() is not None
+# Create tables and search index only if they don't exist (SAFE - never drops data)
+init_db()
 
 
 def seed_data(force: bool = False):
     """
     Seed the database with initial data.
     
+    Books are collected first and written by database.ingest in one
+    batched transaction.
+    
     Args:
-        force: If True, will add books even if they exist (updates them)
+        force: If True, existing books are updated instead of skipped
     """
-    db = get_session()
-    
     print("🌱 Seeding Genres (safe upsert)...")
     genre_data = [
         ("Self-Help", "self-help", "🌱", "Books for personal growth and improvement."),
@@ -52,36 +35,19 @@ def seed_data(force: bool = False):
         ("History", "history", "🏺", "The story of humanity and civilization."),
     ]
     
-    genre_map = {}
-    for name, slug, icon, desc in genre_data:
-        genre_map[slug] = get_or_create_genre(db, name, slug, icon, desc)
+    upsert_genres(
+        {"name": name, "slug": slug, "icon": icon, "description": desc}
+        for name, slug, icon, desc in genre_data
+    )
     
     print("📚 Seeding Books & Summaries...")
+    records = []
     
-    # helper for creating full content
+    # helper for collecting full content
     def create_content(title, author, genre_slug, cover_url, year, summary_data):
         slug = title.lower().replace(" ", "-").replace(":", "").replace("'", "")
         
-        # Skip if book already exists (unless force mode)
-        if book_exists(db, slug) and not force:
-            print(f"  ⏭️  Skipping existing: {title}")
-            return
-        
-        book = Book(
-            title=title,
-            author=author,
-            slug=slug,
-            cover_image_url=cover_url,
-            publication_year=year,
-            genre=genre_map[genre_slug],
-            is_featured=True
-        )
-        db.add(book)
-        db.commit()  # commit to get ID
-        print(f"  ✅ Added: {title}")
-        
-        summary = Summary(
-            book_id=book.id,
+        summary = dict(
             overview_text=summary_data['overview'],
             executive_summary=summary_data.get('executive', summary_data['overview']),
             quote_of_the_book=summary_data.get('main_quote', "A great book is a friend that never lets you down."),
@@ -98,20 +64,24 @@ def seed_data(force: bool = False):
             quotes=json.dumps(summary_data.get('quotes', [])),
             action_steps=json.dumps(summary_data.get('action_steps', []))
         )
-        db.add(summary)
         
-        # Add Concept Images if any
-        if 'images' in summary_data:
-            for img in summary_data['images']:
-                db.add(SummaryImage(
-                    summary=summary,
-                    image_url=img['url'],
-                    caption=img['caption'],
-                    section_type="concept",
-                    section_title="Core Concept"
-                ))
+        # Concept Images if any
+        images = [
+            dict(image_url=img['url'], caption=img['caption'], section_type="concept", section_title="Core Concept")
+            for img in summary_data.get('images', [])
+        ]
         
-        db.commit()
+        records.append(dict(
+            title=title,
+            author=author,
+            slug=slug,
+            cover_image_url=cover_url,
+            publication_year=year,
+            genre_slug=genre_slug,
+            is_featured=True,
+            summary=summary,
+            images=images
+        ))
 
     # ==================== ATOMIC HABITS (COMPREHENSIVE) ====================
     create_content(
@@ -441,8 +411,9 @@ The ability to do what you want, when you want, with who you want, for as long a
         }
     )
 
+    report = ingest_books(records, update_existing=force)
+    print(f"  ✅ {report}")
     print("✅ Database seeded successfully with WORLD-CLASS rich content!")
-    db.close()
 
 if __name__ == "__main__":
     seed_data()
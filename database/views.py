@@ -0,0 +1,233 @@
+"""
+Read models for BookWise.
+Compact, immutable views of genres, books and summaries built from
+column-only queries. Unlike detached ORM instances they carry no session
+state, pickle cheaply for st.cache_data and never trigger lazy loads.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from database.models import Genre, Book, Summary
+
+
+@dataclass(frozen=True, slots=True)
+class GenreView:
+    """Read-only genre record."""
+    id: int
+    name: str
+    slug: str
+    description: str
+    image_url: Optional[str]
+    icon: str
+
+
+@dataclass(frozen=True, slots=True)
+class BookView:
+    """Read-only book record with its genre attached."""
+    id: int
+    title: str
+    author: str
+    slug: str
+    cover_image_url: Optional[str]
+    cover_image_fallback: Optional[str]
+    isbn: Optional[str]
+    publication_year: Optional[int]
+    genre_id: int
+    is_featured: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    genre: Optional[GenreView] = None
+    
+    def get_cover_url(self) -> str:
+        """Return cover image URL with fallback."""
+        return self.cover_image_url or self.cover_image_fallback or "/assets/images/placeholder.png"
+
+
+class FrozenDict(dict):
+    """Read-only dict for list items of views (still JSON- and pickle-friendly)."""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+    
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    def __reduce__(self):
+        return type(self), (dict(self),)
+    
+    def __hash__(self):
+        return hash(tuple(sorted(self.items(), key=repr)))
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert lists to tuples and dicts to FrozenDicts."""
+    if isinstance(value, dict):
+        return FrozenDict({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class SummaryView:
+    """
+    Read-only summary record.
+    
+    List fields are stored as tuples of FrozenDicts or strings, so a
+    view shared through the catalogue snapshot cannot be mutated.
+    """
+    id: int
+    book_id: int
+    overview_text: str
+    main_content: str
+    key_takeaways: Tuple[Mapping[str, str], ...]
+    who_should_read: str
+    difficulty: Optional[str]
+    reading_time: Optional[int]
+    rating: Optional[float]
+    executive_summary: Optional[str]
+    quote_of_the_book: Optional[str]
+    analogies: Optional[Tuple[Mapping[str, str], ...]]
+    quotes: Optional[Tuple[str, ...]]
+    action_steps: Optional[Tuple[str, ...]]
+    seo_title: Optional[str]
+    seo_description: Optional[str]
+    workflow_data: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    
+    def __post_init__(self):
+        for name in SUMMARY_LIST_FIELDS:
+            object.__setattr__(self, name, _freeze(getattr(self, name)))
+
+
+# SummaryView fields holding JSON lists
+SUMMARY_LIST_FIELDS = ("key_takeaways", "analogies", "quotes", "action_steps")
+
+
+@dataclass(frozen=True, slots=True)
+class GenreStats:
+    """Per-genre aggregates."""
+    genre: GenreView
+    book_count: int
+    summary_count: int
+    avg_rating: Optional[float]  # None when no book in the genre has a summary
+    total_reading_time: int  # minutes
+
+
+@dataclass(frozen=True)
+class CatalogueSnapshot:
+    """
+    Every genre, book and summary, loaded together.
+    
+    The lookup maps are built once on construction, so every lookup
+    against a snapshot is O(1). Lists of books keep title order.
+    
+    Attributes:
+        genres: Genres ordered by name
+        books: Books ordered by (title, id), sharing the GenreViews in genres
+        summaries: SummaryView by book id (books without one are absent)
+        version: Data version the snapshot was loaded at (None if unknown)
+        genres_by_slug: GenreView by slug
+        books_by_id: BookView by id
+        books_by_slug: BookView by slug
+        books_by_genre: Books by genre slug
+        books_by_author: Books by lowercased author name
+        featured_books: Featured books
+    """
+    genres: Tuple[GenreView, ...]
+    books: Tuple[BookView, ...]
+    summaries: Mapping[int, SummaryView]
+    version: Optional[Tuple[str, int]] = None
+    genres_by_slug: Mapping[str, GenreView] = field(init=False, repr=False, compare=False)
+    books_by_id: Mapping[int, BookView] = field(init=False, repr=False, compare=False)
+    books_by_slug: Mapping[str, BookView] = field(init=False, repr=False, compare=False)
+    books_by_genre: Mapping[str, Tuple[BookView, ...]] = field(init=False, repr=False, compare=False)
+    books_by_author: Mapping[str, Tuple[BookView, ...]] = field(init=False, repr=False, compare=False)
+    featured_books: Tuple[BookView, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        by_genre: Dict[str, List[BookView]] = {genre.slug: [] for genre in self.genres}
+        by_author: Dict[str, List[BookView]] = {}
+        for book in self.books:
+            if book.genre is not None:
+                by_genre.setdefault(book.genre.slug, []).append(book)
+            by_author.setdefault((book.author or "").lower(), []).append(book)
+        
+        indexes = {
+            "genres_by_slug": {genre.slug: genre for genre in self.genres},
+            "books_by_id": {book.id: book for book in self.books},
+            "books_by_slug": {book.slug: book for book in self.books},
+            "books_by_genre": {slug: tuple(books) for slug, books in by_genre.items()},
+            "books_by_author": {author: tuple(books) for author, books in by_author.items()},
+        }
+        for name, index in indexes.items():
+            object.__setattr__(self, name, MappingProxyType(index))
+        object.__setattr__(self, "featured_books", tuple(b for b in self.books if b.is_featured))
+
+
+# Column lists in dataclass field order
+GENRE_COLUMNS = (Genre.id, Genre.name, Genre.slug, Genre.description, Genre.image_url, Genre.icon)
+BOOK_COLUMNS = (
+    Book.id, Book.title, Book.author, Book.slug, Book.cover_image_url,
+    Book.cover_image_fallback, Book.isbn, Book.publication_year, Book.genre_id,
+    Book.is_featured, Book.created_at, Book.updated_at,
+)
+SUMMARY_COLUMNS = tuple(getattr(Summary, name) for name in SummaryView.__dataclass_fields__)
+
+_BOOK_WIDTH = len(BOOK_COLUMNS)
+
+
+def select_genres() -> Select:
+    """Column-only SELECT for GenreView rows."""
+    return select(*GENRE_COLUMNS)
+
+
+def select_books() -> Select:
+    """Column-only SELECT for BookView rows, joined to their genre."""
+    return select(*BOOK_COLUMNS, *GENRE_COLUMNS).join(Genre, Book.genre_id == Genre.id)
+
+
+def select_summaries() -> Select:
+    """Column-only SELECT for SummaryView rows."""
+    return select(*SUMMARY_COLUMNS)
+
+
+def genre_views(rows: Iterable) -> List[GenreView]:
+    """Build GenreViews from select_genres() rows."""
+    return [GenreView(*row) for row in rows]
+
+
+def book_views(rows: Iterable, genres: Optional[Dict[int, GenreView]] = None) -> List[BookView]:
+    """
+    Build BookViews from select_books() rows.
+    
+    Books in the same genre share a single GenreView instance.
+    
+    Args:
+        rows: Result rows of select_books()
+        genres: GenreViews by id to reuse (new ones are added to it)
+    
+    Returns:
+        List[BookView]: Books in row order
+    """
+    genres = {} if genres is None else genres
+    books = []
+    for row in rows:
+        genre_id = row[_BOOK_WIDTH]
+        genre = genres.get(genre_id)
+        if genre is None:
+            genre = genres[genre_id] = GenreView(*row[_BOOK_WIDTH:])
+        books.append(BookView(*row[:_BOOK_WIDTH], genre=genre))
+    return books
+
+
+def summary_view(row) -> Optional[SummaryView]:
+    """Build a SummaryView from a select_summaries() row, or None."""
+    return SummaryView(*row) if row is not None else None
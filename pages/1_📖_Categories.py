@@ -3,17 +3,14 @@ Categories Page - With Pagination and Theme Support
 """
 
 import streamlit as st
-from database.queries import get_all_genres, get_genre_by_slug, get_books_by_genre
-from components.image_handler import load_image_safe
+from database.queries import get_all_genres, get_genre_by_slug, get_books_by_genre_page, get_genre_page_index, get_genre_stats
+from database.queries import get_filtered_books, count_filtered_books
+from components.image_handler import cover_picture_html, COVER_STYLE
 from components.navigation import render_navigation, render_breadcrumb
 from components.footer import render_footer
 from components.theme import render_global_styles, get_theme_colors, get_genre_color, COLORS
-from components.pagination import paginate_items, render_pagination, PaginationConfig
-
-@st.cache_data(ttl=300)
-def get_genre_book_counts():
-    genres = get_all_genres()
-    return {g.slug: len(get_books_by_genre(g.slug)) for g in genres}
+from components.pagination import paginate_keyset, render_pagination, reset_pagination, PaginationConfig
+from components.filters import render_filters, render_filter_pills, build_book_filter
 
 st.set_page_config(page_title="Categories | BookWise", page_icon="📖", layout="wide", initial_sidebar_state="collapsed")
 
@@ -47,24 +44,47 @@ if genre_slug:
         </div>
         ''', unsafe_allow_html=True)
         
-        # Get all books for this genre
-        all_books = get_books_by_genre(genre_slug)
+        # Pagination config
+        pagination_key = f"genre_{genre_slug}"
+        config = PaginationConfig(items_per_page=12, show_page_size_selector=True)
+        
+        # Filter panel; a new selection starts again from page 1
+        st.markdown('<div style="max-width: 1200px; margin: 0 auto; padding: 16px 20px 0 20px;">', unsafe_allow_html=True)
+        filters = render_filters(genre_slug)
+        render_filter_pills(filters)
+        st.markdown('</div>', unsafe_allow_html=True)
+        book_filter = build_book_filter(filters, genre_slug)
+        if st.session_state.get(f"{pagination_key}_filter", book_filter) != book_filter:
+            reset_pagination(pagination_key)
+        st.session_state[f"{pagination_key}_filter"] = book_filter
         
-        if all_books:
-            # Pagination config
-            pagination_key = f"genre_{genre_slug}"
-            config = PaginationConfig(items_per_page=12, show_page_size_selector=True)
+        # Fetch only the visible page of books
+        if book_filter.is_default:
+            # Title order: seek straight to each page with (title, id) cursors
+            page_index = lambda page_size: get_genre_page_index(genre_slug, page_size)
+            fetch_page = lambda after, page_size: get_books_by_genre_page(genre_slug, page_size, after)
+        else:
+            # Filtered or re-sorted: one SQL query per page, cursors are offsets
+            def page_index(page_size):
+                total = count_filtered_books(book_filter)
+                return total, list(range(page_size, total, page_size))
             
-            # Paginate books
-            paginated_books, current_page, total_pages = paginate_items(
-                all_books, pagination_key, config
-            )
+            fetch_page = lambda after, page_size: get_filtered_books(book_filter, page_size, after or 0)
+        
+        paginated_books, current_page, total_pages, total_books = paginate_keyset(
+            pagination_key,
+            page_index=page_index,
+            fetch_page=fetch_page,
+            config=config
+        )
+        
+        if total_books:
             
             # Header with count
             st.markdown(f'''
             <div style="max-width: 1200px; margin: 0 auto; padding: 16px 20px 8px 20px;">
             <h3 style="font-size: 16px; font-weight: 800; color: {c['text_primary']};">
-            📚 {len(all_books)} Books
+            📚 {total_books} Books
             </h3>
             </div>
             ''', unsafe_allow_html=True)
@@ -73,7 +93,7 @@ if genre_slug:
             cols = st.columns(6, gap="small")
             for idx, book in enumerate(paginated_books):
                 with cols[idx % 6]:
-                    safe_image_url = load_image_safe(book.cover_image_url, "book")
+                    cover_html = cover_picture_html(book.cover_image_url, "book", COVER_STYLE, alt=book.title)
                     st.markdown(f'''
                     <div class="hover-lift" style="
                         background: {c['surface']};
@@ -83,7 +103,7 @@ if genre_slug:
                         margin-bottom: 10px;
                     ">
                     <div style="position: relative; padding-top: 140%; background: {c['background']};">
-                    <img src="{safe_image_url}" style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; object-fit: cover;">
+                    {cover_html}
                     </div>
                     <div style="padding: 10px;">
                     <h4 style="font-size: 13px; font-weight: 700; color: {c['text_primary']}; line-height: 1.3; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; margin: 0;">{book.title}</h4>
@@ -96,10 +116,12 @@ if genre_slug:
             # Render pagination controls
             render_pagination(
                 key=pagination_key,
-                total_items=len(all_books),
+                total_items=total_books,
                 config=config,
                 show_info=True
             )
+        elif not book_filter.is_default:
+            st.info("No books match these filters. Try widening your selection.")
         
         st.markdown(f'<div style="max-width: 1200px; margin: 0 auto; padding: 12px 20px 20px 20px;">', unsafe_allow_html=True)
         if st.button("← Back to Categories", use_container_width=False):
@@ -121,7 +143,7 @@ else:
     st.markdown('<div style="max-width: 1200px; margin: 20px auto; padding: 0 20px;">', unsafe_allow_html=True)
     
     genres = get_all_genres()
-    book_counts = get_genre_book_counts()
+    book_counts = {stats.genre.slug: stats.book_count for stats in get_genre_stats()}
     
     if genres:
         # First row of genres
@@ -4,9 +4,9 @@ Includes: Audio Summaries (TTS), AI Chat (RAG), Smart Recommendations
 """
 
 import streamlit as st
-import json
 from database.queries import get_book_by_slug, get_summary_for_book, get_books_by_genre, get_all_books
 from components.image_handler import load_image_safe
+from services.parsed_summary import get_parsed_summary
 
 st.set_page_config(page_title="Book Summary", page_icon="📖", layout="wide", initial_sidebar_state="collapsed")
 
@@ -41,14 +41,12 @@ if not summary:
     st.link_button("← Home", "/")
     st.stop()
 
-def safe_json(val):
-    try: return json.loads(val or "[]")
-    except: return []
-
-takeaways = safe_json(summary.key_takeaways)
-analogies = safe_json(summary.analogies)
-quotes = safe_json(summary.quotes)
-actions = safe_json(summary.action_steps)
+# JSON fields decoded once per summary version, shared with the AI services
+parsed = get_parsed_summary(summary)
+takeaways = parsed.takeaways
+analogies = parsed.analogies
+quotes = parsed.quotes
+actions = parsed.action_steps
 
 # Build book_data dict for AI services
 book_data = {
@@ -63,7 +61,8 @@ book_data = {
     'analogies': summary.analogies,
     'quotes': summary.quotes,
     'action_steps': summary.action_steps,
-    'who_should_read': summary.who_should_read
+    'who_should_read': summary.who_should_read,
+    'parsed': parsed
 }
 
 # Header
@@ -7,8 +7,8 @@ import streamlit as st
 import json
 from datetime import datetime, timedelta
 from database.queries import (
-    get_books_count, get_all_genres, get_books_by_genre,
-    get_top_rated_books, get_all_books
+    get_books_count, get_all_genres, get_genre_stats,
+    get_top_rated_books, get_all_books, get_summaries_for_books
 )
 from components.navigation import render_navigation
 from components.footer import render_footer
@@ -67,18 +67,15 @@ total_books = get_books_count()
 genres = get_all_genres()
 top_rated = get_top_rated_books(limit=10)
 all_books = get_all_books()
+genre_stats = get_genre_stats()
 
 # Calculate statistics
-genre_counts = {}
-genre_avg_ratings = {}
+genre_counts = {s.genre.name: s.book_count for s in genre_stats if s.book_count}
+genre_avg_ratings = {s.genre.name: s.avg_rating for s in genre_stats if s.avg_rating is not None}
 books_by_year = {}
 author_counts = {}
 
 for book in all_books:
-    # Genre stats
-    genre_name = book.genre.name if book.genre else "Unknown"
-    genre_counts[genre_name] = genre_counts.get(genre_name, 0) + 1
-    
     # Year stats
     year = book.publication_year or 0
     if year > 1900:
@@ -141,7 +138,8 @@ with col3:
     </div>
     """, unsafe_allow_html=True)
 
-avg_rating = sum(book.summaries[0].rating if book.summaries else 0 for book in all_books) / max(len(all_books), 1)
+rated = [s for s in genre_stats if s.avg_rating is not None]
+avg_rating = sum(s.avg_rating * s.summary_count for s in rated) / max(sum(s.summary_count for s in rated), 1)
 
 with col4:
     st.markdown(f"""
@@ -158,7 +156,7 @@ with col4:
     </div>
     """, unsafe_allow_html=True)
 
-total_read_time = sum(book.summaries[0].reading_time if book.summaries else 0 for book in all_books)
+total_read_time = sum(s.total_reading_time for s in genre_stats)
 
 with col5:
     st.markdown(f"""
@@ -319,8 +317,10 @@ with col2:
         </h3>
     """, unsafe_allow_html=True)
     
+    top_summaries = get_summaries_for_books(book.id for book in top_rated[:6])
     for idx, book in enumerate(top_rated[:6], 1):
-        rating = book.summaries[0].rating if book.summaries else 0
+        summary = top_summaries.get(book.id)
+        rating = summary.rating if summary and summary.rating else 0
         st.markdown(f"""
         <div style="
             display: flex;
@@ -7,6 +7,10 @@ from database.queries import get_all_books, get_top_rated_books, get_all_genres
 from components.image_handler import load_image_safe
 from components.navigation import render_navigation
 from components.footer import render_footer
+from services.ai_service import get_ai_service
+from services.passage_index import PassageIndexUnavailable, search_library
+from services.recommendations import RecommendationEngine
+from services.user_profile import get_user_profile
 
 st.set_page_config(page_title="AI Features | BookWise", page_icon="🤖", layout="wide", initial_sidebar_state="collapsed")
 
@@ -156,20 +160,74 @@ with col3:
 
 st.markdown('</div>', unsafe_allow_html=True)
 
-# Personalized Recommendations Section
+# Ask the Whole Library Section
 st.markdown("""
 <div style="max-width: 1200px; margin: 40px auto 0 auto; padding: 0 20px;">
     <h2 style="font-size: 24px; font-weight: 800; color: #1e293b; margin-bottom: 8px;">
-        🎯 Recommended For You
+        📚 Ask the Whole Library
     </h2>
     <p style="font-size: 14px; color: #64748b; margin-bottom: 20px;">
-        Based on popular books and top ratings
+        One question, answered from the most relevant passages across every summary
     </p>
 </div>
 """, unsafe_allow_html=True)
 
-# Get top rated books for recommendations
-top_books = get_top_rated_books(limit=6)
+lib_col1, lib_col2, lib_col3 = st.columns([1, 6, 1])
+with lib_col2:
+    with st.form("library_question"):
+        library_question = st.text_input(
+            "Question",
+            placeholder="e.g. How do different authors suggest building better habits?",
+            label_visibility="collapsed"
+        )
+        asked = st.form_submit_button("🔍 Ask the Library")
+    
+    if asked and library_question.strip():
+        try:
+            hits, index_ready = search_library(library_question), True
+        except PassageIndexUnavailable:
+            hits, index_ready = [], False
+        if not index_ready:
+            st.warning("The library index is being built. Please try again in a moment.")
+        elif not hits:
+            st.info("No passages matched your question. Try different keywords.")
+        else:
+            ai_service = get_ai_service()
+            if ai_service.is_available():
+                with st.chat_message("assistant", avatar="🤖"):
+                    st.write_stream(ai_service.stream_library_answer(library_question, hits))
+            else:
+                for hit in hits:
+                    st.markdown(f"**{hit.book.title}** · _{hit.passage.section}_\n\n{hit.passage.text}")
+            
+            st.caption("Sources")
+            seen = set()
+            for hit in hits:
+                if hit.book.id not in seen:
+                    seen.add(hit.book.id)
+                    st.markdown(f"- [{hit.book.title}](/Book_Detail?slug={hit.book.slug}) by {hit.book.author}")
+
+# Personalized Recommendations Section
+# Books with sections marked read or bookmarked drive the session profile
+profile = get_user_profile()
+if profile:
+    personal = RecommendationEngine().get_profile_recommendations(profile, get_all_books(), limit=6)
+    top_books = [rec.book for rec in personal]
+    subtitle, badge = "Based on your reading progress and bookmarks", "🎯 For You"
+else:
+    top_books = get_top_rated_books(limit=6)
+    subtitle, badge = "Based on popular books and top ratings", "⭐ Top Rated"
+
+st.markdown(f"""
+<div style="max-width: 1200px; margin: 40px auto 0 auto; padding: 0 20px;">
+    <h2 style="font-size: 24px; font-weight: 800; color: #1e293b; margin-bottom: 8px;">
+        🎯 Recommended For You
+    </h2>
+    <p style="font-size: 14px; color: #64748b; margin-bottom: 20px;">
+        {subtitle}
+    </p>
+</div>
+""", unsafe_allow_html=True)
 
 if top_books:
     st.markdown('<div style="max-width: 1200px; margin: 0 auto; padding: 0 20px;">', unsafe_allow_html=True)
@@ -197,7 +255,7 @@ if top_books:
                         padding: 3px 8px;
                         border-radius: 10px;
                         font-weight: 600;
-                    ">⭐ Top Rated</div>
+                    ">{badge}</div>
                 </div>
                 <div style="padding: 12px;">
                     <h4 style="
@@ -4,12 +4,20 @@ Enables conversational interaction with book content.
 """
 
 import os
+import re
 import json
+import time
 import streamlit as st
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from dataclasses import dataclass
 
 
+# Passages retrieved per chat question (None sends the whole summary)
+RETRIEVAL_TOP_K = 4
+
+UNAVAILABLE_MESSAGE = "⚠️ AI service not available. Please configure your GEMINI_API_KEY in environment variables or Streamlit secrets."
+
+
 @dataclass
 class ChatMessage:
     """Represents a chat message."""
@@ -18,26 +26,107 @@ class ChatMessage:
     timestamp: Optional[str] = None
 
 
+@dataclass
+class ModelChunk:
+    """One piece of model output, shaped like a Gemini response chunk."""
+    text: str
+
+
+class FakeStreamingModel:
+    """
+    Local stand-in for a Gemini GenerativeModel.
+    Streams a canned reply word by word so chat can run and be tested offline.
+    """
+    
+    def __init__(self, reply: Optional[str] = None, delay: float = 0.0):
+        """
+        Args:
+            reply: Text to return; defaults to echoing the user question
+            delay: Seconds to wait before each chunk, to mimic network latency
+        """
+        self.reply = reply
+        self.delay = delay
+        self.prompts: List[str] = []
+    
+    def _reply_for(self, prompt: str) -> str:
+        """Canned reply, or an echo of the USER QUESTION line."""
+        if self.reply is not None:
+            return self.reply
+        match = re.search(r"USER QUESTION: (.*)", prompt)
+        question = match.group(1).strip() if match else "your question"
+        return f"This is an offline answer to: {question}"
+    
+    def _chunks(self, text: str) -> Iterator[ModelChunk]:
+        """Yield text one word (with trailing whitespace) at a time."""
+        for word in re.findall(r"\S+\s*", text):
+            if self.delay:
+                time.sleep(self.delay)
+            yield ModelChunk(text=word)
+    
+    def generate_content(self, prompt: str, stream: bool = False):
+        """Mirror of GenerativeModel.generate_content."""
+        self.prompts.append(prompt)
+        text = self._reply_for(prompt)
+        if stream:
+            return self._chunks(text)
+        if self.delay:
+            time.sleep(self.delay * len(text.split()))
+        return ModelChunk(text=text)
+
+
+def _configured_api_key() -> str:
+    """GEMINI_API_KEY from the environment or Streamlit secrets, if any."""
+    if os.getenv("GEMINI_API_KEY"):
+        return os.getenv("GEMINI_API_KEY")
+    try:
+        return st.secrets.get("GEMINI_API_KEY", "")
+    except Exception:
+        # No secrets.toml present
+        return ""
+
+
 class AIService:
     """
     AI Service for book-related queries using Gemini.
     Implements RAG (Retrieval-Augmented Generation) for book chat.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize AI Service with optional API key."""
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY") or st.secrets.get("GEMINI_API_KEY", "")
-        self.model = None
-        self._initialized = False
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Any = None,
+        use_cache: bool = True,
+        retrieval_k: Optional[int] = RETRIEVAL_TOP_K
+    ):
+        """
+        Initialize AI Service with optional API key or model client.
         
+        Args:
+            api_key: Gemini API key (defaults to env/secrets)
+            model: Object with a Gemini-style generate_content(prompt, stream=False);
+                skips Gemini setup when given (e.g. FakeStreamingModel)
+            use_cache: Reuse stored answers from services.response_cache
+            retrieval_k: Passages retrieved per chat question; None sends the
+                whole summary
+        """
+        self.api_key = api_key or ("" if model is not None else _configured_api_key())
+        self.model = model
+        self.use_cache = use_cache
+        self.retrieval_k = retrieval_k
+        self._initialized = model is not None
+    
+    def is_available(self) -> bool:
+        """Whether a model client is configured or can be created."""
+        return self.model is not None or bool(self.api_key)
+    
     def initialize(self) -> bool:
         """Initialize the Gemini model."""
         if self._initialized:
             return True
-            
+        
         if not self.api_key:
             return False
-            
+        
         try:
             import google.generativeai as genai
             genai.configure(api_key=self.api_key)
@@ -48,107 +137,123 @@ class AIService:
             print(f"Failed to initialize Gemini: {e}")
             return False
     
+    def _cached(self, key: str) -> Optional[str]:
+        """Cached answer for a key; cache errors count as a miss."""
+        if not self.use_cache:
+            return None
+        try:
+            from services.response_cache import get_response
+            return get_response(key)
+        except Exception as e:
+            print(f"Response cache read error: {e}")
+            return None
+    
+    def _store(self, key: str, kind: str, response: str, prompt: str, started: float) -> None:
+        """Store a generated answer; cache errors are logged and ignored."""
+        if not self.use_cache:
+            return
+        try:
+            from services.response_cache import put_response
+            put_response(key, kind, response, len(prompt), (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            print(f"Response cache write error: {e}")
+    
+    def _book_header(self, book_data: Dict[str, Any]) -> List[str]:
+        """Book metadata lines shared by every context."""
+        return [
+            f"BOOK TITLE: {book_data.get('title', 'Unknown')}",
+            f"AUTHOR: {book_data.get('author', 'Unknown')}",
+            f"GENRE: {book_data.get('genre', 'Unknown')}",
+            f"PUBLICATION YEAR: {book_data.get('year', 'Unknown')}",
+        ]
+    
+    def create_retrieval_context(self, book_data: Dict[str, Any], question: str, k: int = RETRIEVAL_TOP_K) -> str:
+        """
+        Create a context string with only the passages relevant to a question.
+        
+        Args:
+            book_data: Dictionary containing book and summary data
+            question: The user's question
+            k: Number of passages to include
+        
+        Returns:
+            Book metadata followed by the top-k passages
+        """
+        from services.retrieval import retrieve_passages
+        
+        context_parts = self._book_header(book_data)
+        passages = retrieve_passages(book_data, question, k)
+        if passages:
+            context_parts.append("\nRELEVANT EXCERPTS:")
+            for passage in passages:
+                context_parts.append(f"\n[{passage.section}]\n{passage.text}")
+        return "\n".join(context_parts)
+    
     def create_book_context(self, book_data: Dict[str, Any]) -> str:
-        """Create a rich context string from book data for RAG."""
-        context_parts = []
-        
-        # Book metadata
-        context_parts.append(f"BOOK TITLE: {book_data.get('title', 'Unknown')}")
-        context_parts.append(f"AUTHOR: {book_data.get('author', 'Unknown')}")
-        context_parts.append(f"GENRE: {book_data.get('genre', 'Unknown')}")
-        context_parts.append(f"PUBLICATION YEAR: {book_data.get('year', 'Unknown')}")
-        
-        # Summary content
-        if book_data.get('executive_summary'):
-            context_parts.append(f"\nEXECUTIVE SUMMARY:\n{book_data['executive_summary']}")
-        
-        if book_data.get('main_content'):
-            context_parts.append(f"\nMAIN CONTENT:\n{book_data['main_content']}")
-        
-        # Key takeaways
-        if book_data.get('takeaways'):
-            takeaways = book_data['takeaways']
-            if isinstance(takeaways, str):
-                try:
-                    takeaways = json.loads(takeaways)
-                except:
-                    pass
-            if isinstance(takeaways, list):
-                context_parts.append("\nKEY TAKEAWAYS:")
-                for i, t in enumerate(takeaways, 1):
-                    if isinstance(t, dict):
-                        context_parts.append(f"{i}. {t.get('title', '')}: {t.get('text', '')}")
-                    else:
-                        context_parts.append(f"{i}. {t}")
-        
-        # Analogies
-        if book_data.get('analogies'):
-            analogies = book_data['analogies']
-            if isinstance(analogies, str):
-                try:
-                    analogies = json.loads(analogies)
-                except:
-                    pass
-            if isinstance(analogies, list) and analogies:
-                context_parts.append("\nANALOGIES & MENTAL MODELS:")
-                for a in analogies:
-                    if isinstance(a, dict):
-                        context_parts.append(f"- {a.get('concept', '')}: {a.get('analogy', '')} - {a.get('explanation', '')}")
-        
-        # Quotes
-        if book_data.get('quotes'):
-            quotes = book_data['quotes']
-            if isinstance(quotes, str):
-                try:
-                    quotes = json.loads(quotes)
-                except:
-                    pass
-            if isinstance(quotes, list) and quotes:
-                context_parts.append("\nNOTABLE QUOTES:")
-                for q in quotes[:5]:
-                    context_parts.append(f'- "{q}"')
-        
-        # Action steps
-        if book_data.get('action_steps'):
-            actions = book_data['action_steps']
-            if isinstance(actions, str):
-                try:
-                    actions = json.loads(actions)
-                except:
-                    pass
-            if isinstance(actions, list) and actions:
-                context_parts.append("\nACTION STEPS:")
-                for i, a in enumerate(actions, 1):
-                    context_parts.append(f"{i}. {a}")
-        
-        # Who should read
-        if book_data.get('who_should_read'):
-            context_parts.append(f"\nWHO SHOULD READ:\n{book_data['who_should_read']}")
+        """
+        Create a rich context string from book data for RAG.
+        
+        The summary sections come precomputed from the parsed-summary
+        layer, so JSON fields are not decoded again on every chat turn.
+        
+        Args:
+            book_data: Dictionary containing book and summary data
         
+        Returns:
+            Book metadata followed by the whole summary
+        """
+        from services.parsed_summary import parsed_book_data
+        
+        context_parts = self._book_header(book_data)
+        summary_context = parsed_book_data(book_data).context
+        if summary_context:
+            context_parts.append(summary_context)
         return "\n".join(context_parts)
     
-    def chat_with_book(
-        self, 
-        user_message: str, 
+    def create_chat_context(self, book_data: Dict[str, Any], user_message: str) -> str:
+        """
+        Create the book part of a chat prompt.
+        
+        Retrieved passages when retrieval_k is set, otherwise the whole
+        summary, each after its introduction line.
+        
+        Args:
+            book_data: Dictionary containing book and summary data
+            user_message: The user's question
+        
+        Returns:
+            Introduction line followed by the book context
+        """
+        if self.retrieval_k:
+            book_context = self.create_retrieval_context(book_data, user_message, self.retrieval_k)
+            intro = "Here are the parts of the following book most relevant to the question:"
+        else:
+            book_context = self.create_book_context(book_data)
+            intro = "You have complete knowledge of the following book:"
+        return f"{intro}\n\n{book_context}"
+    
+    def build_chat_prompt(
+        self,
+        user_message: str,
         book_data: Dict[str, Any],
-        chat_history: List[ChatMessage] = None
+        chat_history: List[ChatMessage] = None,
+        chat_context: Optional[str] = None
     ) -> str:
         """
-        Chat with a book using RAG.
+        Build the RAG prompt for a chat turn.
         
         Args:
             user_message: The user's question
             book_data: Dictionary containing book and summary data
             chat_history: Previous messages in the conversation
-            
+            chat_context: Result of create_chat_context() if already built
+        
         Returns:
-            AI response string
+            Prompt string
         """
-        if not self.initialize():
-            return "⚠️ AI service not available. Please configure your GEMINI_API_KEY in environment variables or Streamlit secrets."
-        
-        # Create book context
-        book_context = self.create_book_context(book_data)
+        # Create book context: retrieved passages, or the whole summary
+        if chat_context is None:
+            chat_context = self.create_chat_context(book_data, user_message)
         
         # Build conversation history
         history_text = ""
@@ -158,11 +263,9 @@ class AIService:
                 history_text += f"{msg.role.upper()}: {msg.content}\n"
         
         # Create system prompt
-        system_prompt = f"""You are BookWise AI, an expert assistant specialized in discussing books and their insights.
-
-You have complete knowledge of the following book:
+        return f"""You are BookWise AI, an expert assistant specialized in discussing books and their insights.
 
-{book_context}
+{chat_context}
 
 INSTRUCTIONS:
 1. Answer questions ONLY based on the book content provided above
@@ -178,18 +281,155 @@ USER QUESTION: {user_message}
 
 Provide a helpful, accurate response based on the book content:"""
 
+    def stream_chat_with_book(
+        self,
+        user_message: str,
+        book_data: Dict[str, Any],
+        chat_history: List[ChatMessage] = None
+    ) -> Iterator[str]:
+        """
+        Chat with a book using RAG, yielding the answer as it is generated.
+        
+        Args:
+            user_message: The user's question
+            book_data: Dictionary containing book and summary data
+            chat_history: Previous messages in the conversation
+        
+        Yields:
+            Text chunks of the AI response
+        """
+        if not self.initialize():
+            yield UNAVAILABLE_MESSAGE
+            return
+        
+        from services.response_cache import make_key, normalize_question
+        
+        history_key = "\n".join(
+            f"{msg.role}:{normalize_question(msg.content)}" for msg in (chat_history or [])[-6:]
+        )
+        # Key on the context actually sent, so retrieval settings never share answers
+        chat_context = self.create_chat_context(book_data, user_message)
+        key = make_key("chat", chat_context, user_message, history_key)
+        cached = self._cached(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        prompt = self.build_chat_prompt(user_message, book_data, chat_history, chat_context)
+        yield from self._stream_and_store(prompt, key, "chat")
+    
+    def _stream_and_store(self, prompt: str, key: str, kind: str) -> Iterator[str]:
+        """Stream a generation and cache it once it completes without error."""
+        started = time.perf_counter()
+        parts = []
         try:
-            response = self.model.generate_content(system_prompt)
-            return response.text
+            for chunk in self.model.generate_content(prompt, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Gemini raises for chunks without text (e.g. safety blocks)
+                    continue
+                if text:
+                    parts.append(text)
+                    yield text
         except Exception as e:
-            return f"❌ Error generating response: {str(e)}"
+            prefix = "\n\n" if parts else ""
+            yield f"{prefix}❌ Error generating response: {str(e)}"
+            return
+        
+        if parts:
+            self._store(key, kind, "".join(parts), prompt, started)
+    
+    def build_library_prompt(self, question: str, hits: List[Any]) -> str:
+        """
+        Build the prompt for a question answered from several books.
+        
+        Args:
+            question: The user's question
+            hits: LibraryHit passages from services.passage_index.search_library
+        
+        Returns:
+            Prompt string
+        """
+        excerpts = "\n\n".join(
+            f"[{i}] {hit.book.title} by {hit.book.author} ({hit.passage.section})\n{hit.passage.text}"
+            for i, hit in enumerate(hits, 1)
+        )
+        return f"""You are BookWise AI, an expert assistant who connects ideas across many books.
+
+Here are excerpts from book summaries in our library that are relevant to the question:
+
+{excerpts}
+
+INSTRUCTIONS:
+1. Answer ONLY based on the excerpts above
+2. Compare and connect the ideas of different books where they relate
+3. Name the book whenever you use one of its ideas, citing excerpts like [1]
+4. If the excerpts do not answer the question, say so
+5. Keep responses concise but informative (2-3 paragraphs max)
+6. Use markdown formatting for better readability
+
+USER QUESTION: {question}
+
+Provide a helpful, accurate response based on the excerpts:"""
+
+    def stream_library_answer(self, question: str, hits: List[Any]) -> Iterator[str]:
+        """
+        Answer a question from passages retrieved across the library.
+        
+        Args:
+            question: The user's question
+            hits: LibraryHit passages from services.passage_index.search_library
+        
+        Yields:
+            Text chunks of the AI response
+        """
+        if not self.initialize():
+            yield UNAVAILABLE_MESSAGE
+            return
+        
+        from services.response_cache import make_key
+        
+        context = "\n".join(f"{hit.book.id}:{hit.passage.position}:{hit.passage.text}" for hit in hits)
+        key = make_key("library", context, question)
+        cached = self._cached(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        yield from self._stream_and_store(self.build_library_prompt(question, hits), key, "library")
+    
+    def chat_with_book(
+        self, 
+        user_message: str, 
+        book_data: Dict[str, Any],
+        chat_history: List[ChatMessage] = None
+    ) -> str:
+        """
+        Chat with a book using RAG.
+        
+        Args:
+            user_message: The user's question
+            book_data: Dictionary containing book and summary data
+            chat_history: Previous messages in the conversation
+        
+        Returns:
+            AI response string
+        """
+        return "".join(self.stream_chat_with_book(user_message, book_data, chat_history))
     
     def generate_quiz(self, book_data: Dict[str, Any], num_questions: int = 5) -> List[Dict]:
         """Generate a quiz based on book content."""
         if not self.initialize():
             return []
         
+        from services.response_cache import make_key
+        
         book_context = self.create_book_context(book_data)
+        key = make_key("quiz", book_context, extra=str(num_questions))
+        cached = self._cached(key)
+        if cached is not None:
+            return json.loads(cached)
         
         prompt = f"""Based on this book summary, generate {num_questions} multiple choice questions to test understanding.
 
@@ -209,6 +449,7 @@ Generate questions in this JSON format:
 Return ONLY valid JSON, no other text:"""
 
         try:
+            started = time.perf_counter()
             response = self.model.generate_content(prompt)
             # Parse JSON from response
             text = response.text.strip()
@@ -217,7 +458,9 @@ Return ONLY valid JSON, no other text:"""
                 text = text.split("```")[1]
                 if text.startswith("json"):
                     text = text[4:]
-            return json.loads(text)
+            quiz = json.loads(text)
+            self._store(key, "quiz", json.dumps(quiz), prompt, started)
+            return quiz
         except Exception as e:
             print(f"Quiz generation error: {e}")
             return []
@@ -228,7 +471,13 @@ Return ONLY valid JSON, no other text:"""
             # Fallback to executive summary
             return book_data.get('executive_summary', book_data.get('overview', ''))
         
+        from services.response_cache import make_key
+        
         book_context = self.create_book_context(book_data)
+        key = make_key("audio", book_context)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         
         prompt = f"""Create a 2-minute audio-friendly summary of this book. 
 The summary should:
@@ -243,7 +492,9 @@ BOOK CONTENT:
 Write the audio summary (about 300 words):"""
 
         try:
+            started = time.perf_counter()
             response = self.model.generate_content(prompt)
+            self._store(key, "audio", response.text, prompt, started)
             return response.text
         except:
             return book_data.get('executive_summary', book_data.get('overview', ''))
@@ -0,0 +1,304 @@
+"""
+Approximate Nearest-Neighbour Candidates for BookWise Smart Picks.
+MinHash signatures of each book's keyword set are split into LSH bands;
+books sharing any band bucket with the viewed book are likely to have a
+high keyword Jaccard similarity. Together with the books that can score
+without keyword overlap (same or related author, and the first books of
+the same genre and era), they form a small candidate set that
+CatalogueFeatures re-scores exactly.
+
+More bands and a larger candidate cap raise recall at the cost of
+latency; the fast, balanced and accurate presets span that trade-off.
+Measure recall@K on the catalogue with:
+python -m services.ann_index [--presets fast balanced accurate] [--k 6]
+"""
+
+import time
+import argparse
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from services.recommendation_features import CatalogueFeatures, ERA_YEARS
+
+
+# Mersenne prime for the universal hash family (a * t + b) mod P
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Catalogue size from which RecommendationEngine switches to ANN candidates;
+# below it, exhaustive sparse scoring is as fast as candidate generation
+ANN_MIN_BOOKS = 50000
+
+
+@dataclass(frozen=True)
+class LSHConfig:
+    """
+    MinHash/LSH parameters.
+    
+    Attributes:
+        num_perm: MinHash permutations per signature
+        bands: LSH bands; rows per band is num_perm // bands
+        max_candidates: Keep only the keyword candidates colliding in the
+            most bands (None keeps all)
+        seed: Random seed for the hash family
+    """
+    num_perm: int = 128
+    bands: int = 64
+    max_candidates: Optional[int] = 200
+    seed: int = 1
+    
+    @property
+    def rows_per_band(self) -> int:
+        return self.num_perm // self.bands
+    
+    def threshold(self) -> float:
+        """Jaccard similarity at which a pair collides with probability ~0.5."""
+        return (1 / self.bands) ** (1 / self.rows_per_band)
+
+
+# Two rows per band puts the collision threshold near the keyword bonus
+# threshold (Jaccard > 1/6); max_candidates bounds the exact re-scoring work
+PRESETS = {
+    "fast": LSHConfig(num_perm=64, bands=32, max_candidates=100),
+    "balanced": LSHConfig(),
+    "accurate": LSHConfig(num_perm=256, bands=128, max_candidates=1000),
+}
+DEFAULT_CONFIG = PRESETS["balanced"]
+
+
+class MinHashLSH:
+    """LSH index over the keyword sets of a CatalogueFeatures instance."""
+    
+    def __init__(self, features: CatalogueFeatures, config: LSHConfig = DEFAULT_CONFIG):
+        if config.num_perm % config.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.features = features
+        self.config = config
+        rng = np.random.default_rng(config.seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=config.num_perm, dtype=np.int64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=config.num_perm, dtype=np.int64)
+        self._band_mix = rng.integers(1, 1 << 62, size=config.rows_per_band, dtype=np.int64).astype(np.uint64) | 1
+        
+        signatures = self._signatures()
+        indexed = np.flatnonzero(features.sizes > 0)
+        keys = self._band_keys(signatures[indexed])
+        order = np.argsort(keys, axis=0, kind="stable")
+        self._bucket_keys = np.take_along_axis(keys, order, axis=0).T.copy()
+        self._bucket_rows = indexed[order].T.copy()
+        self._build_structural_maps()
+    
+    def _hash_terms(self, term_ids: np.ndarray) -> np.ndarray:
+        """MinHash values of term ids, shape (num_perm, len(term_ids))."""
+        return ((self._a[:, None] * term_ids + self._b[:, None]) % MERSENNE_PRIME).astype(np.uint32)
+    
+    def _signatures(self) -> np.ndarray:
+        """MinHash signature of every row; rows without keywords stay at the maximum."""
+        features = self.features
+        signatures = np.full((self.config.num_perm, len(features)), np.iinfo(np.uint32).max, dtype=np.uint32)
+        nonempty = np.flatnonzero(features.sizes > 0)
+        if len(nonempty):
+            term_hashes = self._hash_terms(np.arange(len(features.vocabulary), dtype=np.int64))
+            starts = features.row_indptr[nonempty]
+            # One 1-D reduction per permutation over the CSR term lists
+            for perm, hashes in enumerate(term_hashes):
+                signatures[perm, nonempty] = np.minimum.reduceat(hashes[features.row_terms], starts)
+        return signatures.T
+    
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Combine each band of a signature into one 64-bit bucket key, shape (n, bands)."""
+        r = self.config.rows_per_band
+        bands = signatures.reshape(len(signatures), self.config.bands, r).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=2)
+    
+    def _build_structural_maps(self) -> None:
+        """Row lists by author, genre and year for the non-keyword candidates."""
+        features = self.features
+        
+        def group(codes: np.ndarray) -> Dict[int, np.ndarray]:
+            order = np.argsort(codes, kind="stable")
+            values, starts = np.unique(codes[order], return_index=True)
+            return dict(zip(values.tolist(), np.split(order, starts[1:])))
+        
+        self._rows_by_author = group(features.author_codes)
+        self._rows_by_genre = group(features.genre_codes)
+        self._rows_by_year = group(features.years)
+    
+    def keyword_candidates(self, keywords: Sequence[str]) -> np.ndarray:
+        """
+        Rows sharing at least one LSH bucket with a keyword set.
+        
+        Args:
+            keywords: Query keywords
+        
+        Returns:
+            np.ndarray: Candidate rows, most band collisions first when capped
+        """
+        vocabulary = self.features.vocabulary
+        unique = set(keywords)
+        if not unique:
+            return np.zeros(0, dtype=np.int64)
+        # Terms unknown to the catalogue get fresh ids; they never collide
+        fresh = iter(range(len(vocabulary), len(vocabulary) + len(unique)))
+        term_ids = np.array([vocabulary[k] if k in vocabulary else next(fresh) for k in unique], dtype=np.int64)
+        signature = self._hash_terms(term_ids).min(axis=1)
+        keys = self._band_keys(signature[None, :])[0]
+        
+        hits = []
+        for band, key in enumerate(keys):
+            bucket = self._bucket_keys[band]
+            low = np.searchsorted(bucket, key, side="left")
+            high = np.searchsorted(bucket, key, side="right")
+            if high > low:
+                hits.append(self._bucket_rows[band, low:high])
+        if not hits:
+            return np.zeros(0, dtype=np.int64)
+        
+        rows, collisions = np.unique(np.concatenate(hits), return_counts=True)
+        cap = self.config.max_candidates
+        if cap is not None and len(rows) > cap:
+            rows = rows[np.argpartition(-collisions, cap - 1)[:cap]]
+        return rows
+    
+    def candidates(self, book, keywords: Sequence[str], limit: int) -> np.ndarray:
+        """
+        Candidate rows for re-scoring the books most similar to one book.
+        
+        Rows that can score without keyword overlap are added explicitly:
+        same or related author, and the first limit + 1 rows (catalogue
+        order breaks ties) of the same genre, the same era, and both.
+        
+        Args:
+            book: The book being viewed
+            keywords: Its keywords
+            limit: Number of recommendations wanted
+        
+        Returns:
+            np.ndarray: Sorted unique candidate rows
+        """
+        features = self.features
+        head = limit + 1  # The viewed book itself may take a slot
+        parts = [self.keyword_candidates(keywords)]
+        
+        if book.author:
+            # Same author, or an author containing a word of this one's name
+            related = np.flatnonzero(features.related_author_codes(book.author.lower()))
+            parts.extend(self._rows_by_author[code] for code in related.tolist())
+        
+        genre = getattr(book, 'genre', None)
+        genre_code = features.genre_index.get(genre.slug) if genre else None
+        genre_rows = self._rows_by_genre.get(genre_code) if genre_code is not None else None
+        if genre_rows is not None:
+            parts.append(genre_rows[:head])
+        
+        if book.publication_year:
+            year = book.publication_year
+            era_rows = [
+                self._rows_by_year[y] for y in range(year - ERA_YEARS, year + ERA_YEARS + 1)
+                if y and y in self._rows_by_year
+            ]
+            if era_rows:
+                era_rows = np.sort(np.concatenate(era_rows))
+                parts.append(era_rows[:head])
+                if genre_rows is not None:
+                    parts.append(era_rows[features.genre_codes[era_rows] == genre_code][:head])
+        
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+
+def get_ann_index(features: CatalogueFeatures, config: LSHConfig = DEFAULT_CONFIG) -> MinHashLSH:
+    """
+    Get the LSH index for a set of features, building it on first use.
+    
+    Args:
+        features: Catalogue features
+        config: LSH parameters
+    
+    Returns:
+        MinHashLSH: Index cached on the features object
+    """
+    index = features.ann_indexes.get(config)
+    if index is None:
+        index = features.ann_indexes[config] = MinHashLSH(features, config)
+    return index
+
+
+def evaluate_recall(
+    features: CatalogueFeatures,
+    keywords: Sequence[Sequence[str]],
+    config: LSHConfig = DEFAULT_CONFIG,
+    k: int = 6,
+    queries: Optional[Sequence[int]] = None
+) -> Dict[str, float]:
+    """
+    Compare ANN-candidate recommendations with exhaustive scoring.
+    
+    Args:
+        features: Catalogue features
+        keywords: Keywords per feature row
+        config: LSH parameters to evaluate
+        k: Recommendations per query
+        queries: Rows to query (defaults to every row)
+    
+    Returns:
+        Dict with recall (recall@k), exact (share of queries with an
+        identical top-k), candidates (mean), build_s, ann_ms and exact_ms
+    """
+    start = time.perf_counter()
+    index = MinHashLSH(features, config)
+    build_s = time.perf_counter() - start
+    
+    queries = range(len(features)) if queries is None else queries
+    recalls, identical, sizes, ann_ms, exact_ms = [], 0, [], 0.0, 0.0
+    for row in queries:
+        book = features.books[row]
+        
+        start = time.perf_counter()
+        rows = index.candidates(book, keywords[row], k)
+        found = [b.id for b, _, _ in features.similar(book, keywords[row], k, rows)]
+        ann_ms += (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        expected = [b.id for b, _, _ in features.similar(book, keywords[row], k)]
+        exact_ms += (time.perf_counter() - start) * 1000
+        
+        sizes.append(len(rows))
+        recalls.append(len(set(found) & set(expected)) / len(expected) if expected else 1.0)
+        identical += found == expected
+    
+    count = max(len(recalls), 1)
+    return {
+        "recall": sum(recalls) / count,
+        "exact": identical / count,
+        "candidates": sum(sizes) / count,
+        "build_s": build_s,
+        "ann_ms": ann_ms / count,
+        "exact_ms": exact_ms / count,
+    }
+
+
+if __name__ == "__main__":
+    from services.recommendations import RecommendationEngine
+    from database.queries import get_all_books
+    
+    parser = argparse.ArgumentParser(description="Evaluate ANN recall@K on the BookWise catalogue.")
+    parser.add_argument("--presets", nargs="+", choices=sorted(PRESETS), default=list(PRESETS))
+    parser.add_argument("--k", type=int, default=6)
+    args = parser.parse_args()
+    
+    engine = RecommendationEngine()
+    books = get_all_books()
+    features = engine.get_catalogue_features(books)
+    terms = {term_id: term for term, term_id in features.vocabulary.items()}
+    row_keywords = [
+        [terms[t] for t in features.row_terms[features.row_indptr[r]:features.row_indptr[r + 1]].tolist()]
+        for r in range(len(books))
+    ]
+    print(f"{'preset':>8} | {'threshold':>9} | {'recall@' + str(args.k):>9} | {'exact':>5} | {'cands':>6}")
+    for name in args.presets:
+        config = PRESETS[name]
+        stats = evaluate_recall(features, row_keywords, config, args.k)
+        print(
+            f"{name:>8} | {config.threshold():>9.2f} | {stats['recall']:>9.3f} | "
+            f"{stats['exact']:>5.2f} | {stats['candidates']:>6.1f}"
+        )
@@ -0,0 +1,202 @@
+"""
+Filter Facets for BookWise.
+Counts the books behind every value of the filter panel (genre,
+publication year, reading time, difficulty and minimum rating). The
+catalogue snapshot is encoded once into one integer code column per
+facet, so the counts for any selection are a few vectorized masks and
+a bincount per facet instead of a GROUP BY query per facet and render.
+The encoding is rebuilt only when the catalogue data version changes.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from database.queries import READING_TIME_BUCKETS, BookFilter, get_catalogue_snapshot
+from database.views import CatalogueSnapshot
+
+
+# Facets in panel order, named after the BookFilter fields they filter on
+FACETS = ("genre_slug", "year", "reading_time", "difficulty", "min_rating")
+
+# Minimum-rating choices; a book counts towards every threshold it meets
+RATING_THRESHOLDS = (4.5, 4.0, 3.5)
+
+# Known difficulties in display order (case-insensitive); any others follow alphabetically
+DIFFICULTY_ORDER = ("beginner", "intermediate", "advanced")
+
+# Count per value, by facet
+FacetCounts = Dict[str, Dict[Any, int]]
+
+
+def reading_time_bucket(minutes: Optional[int]) -> Optional[str]:
+    """
+    Find the READING_TIME_BUCKETS key containing a reading time.
+    
+    Args:
+        minutes: Reading time of a summary
+    
+    Returns:
+        Optional[str]: Bucket key, or None if the time is unknown
+    """
+    if minutes is None:
+        return None
+    for key, (low, high) in READING_TIME_BUCKETS.items():
+        if (low is None or minutes >= low) and (high is None or minutes <= high):
+            return key
+    return None
+
+
+class FacetIndex:
+    """
+    Facet values of every catalogue book, as code columns.
+    
+    Row i describes snapshot.books[i]. codes[facet][i] indexes
+    values[facet], or is -1 when the book has no value for the facet
+    (summary facets are -1 for books without a summary, matching the
+    inner join of BookFilter). Ratings are kept as floats, NaN if unset.
+    """
+    
+    def __init__(self, snapshot: CatalogueSnapshot):
+        self.version = snapshot.version
+        summaries = snapshot.summaries
+        columns: Dict[str, List[Any]] = {facet: [] for facet in FACETS if facet != "min_rating"}
+        ratings: List[float] = []
+        for book in snapshot.books:
+            summary = summaries.get(book.id)
+            columns["genre_slug"].append(book.genre.slug if book.genre else None)
+            columns["year"].append(book.publication_year)
+            columns["reading_time"].append(reading_time_bucket(summary.reading_time) if summary else None)
+            columns["difficulty"].append(summary.difficulty if summary else None)
+            ratings.append(summary.rating if summary and summary.rating is not None else np.nan)
+        
+        present = {facet: {v for v in column if v is not None} for facet, column in columns.items()}
+        difficulty_rank = {d: rank for rank, d in enumerate(DIFFICULTY_ORDER)}
+        self.values: Dict[str, List[Any]] = {
+            "genre_slug": [g.slug for g in snapshot.genres],
+            "year": sorted(present["year"], reverse=True),
+            "reading_time": list(READING_TIME_BUCKETS),
+            "difficulty": sorted(
+                present["difficulty"], key=lambda d: (difficulty_rank.get(d.lower(), len(difficulty_rank)), d)
+            ),
+            "min_rating": list(RATING_THRESHOLDS),
+        }
+        self.codes: Dict[str, np.ndarray] = {}
+        for facet, column in columns.items():
+            index = {value: code for code, value in enumerate(self.values[facet])}
+            self.codes[facet] = np.fromiter(
+                (index.get(v, -1) for v in column), dtype=np.int64, count=len(column)
+            )
+        self.ratings = np.array(ratings, dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.ratings)
+    
+    def mask(self, facet: str, value: Any) -> np.ndarray:
+        """
+        Flag the books matching one facet value.
+        
+        Args:
+            facet: Name from FACETS
+            value: Selected value (a rating threshold for min_rating)
+        
+        Returns:
+            np.ndarray: Boolean mask over rows
+        """
+        if facet == "min_rating":
+            return self.ratings >= value
+        values = self.values[facet]
+        if value not in values:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[facet] == values.index(value)
+    
+    def _masks(self, book_filter: Optional[BookFilter]) -> Dict[str, np.ndarray]:
+        """Masks of the facets a filter selects."""
+        if book_filter is None:
+            return {}
+        return {
+            facet: self.mask(facet, getattr(book_filter, facet))
+            for facet in FACETS if getattr(book_filter, facet) is not None
+        }
+    
+    def _count(self, facet: str, rows: Optional[np.ndarray]) -> Dict[Any, int]:
+        """Count per value of one facet over the selected rows (all if None)."""
+        if facet == "min_rating":
+            ratings = self.ratings if rows is None else self.ratings[rows]
+            return {t: int(np.count_nonzero(ratings >= t)) for t in RATING_THRESHOLDS}
+        codes = self.codes[facet] if rows is None else self.codes[facet][rows]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.values[facet]))
+        return dict(zip(self.values[facet], counts.tolist()))
+    
+    def counts(self, book_filter: Optional[BookFilter] = None) -> FacetCounts:
+        """
+        Count the books behind every facet value for a selection.
+        
+        Each facet is counted under the selections of the other facets
+        only, so its counts show what choosing another value would give
+        (a selected year does not zero out the other years).
+        
+        Args:
+            book_filter: Current selection (its sort is ignored)
+        
+        Returns:
+            FacetCounts: Count per value, by facet, values in display order
+        """
+        masks = self._masks(book_filter)
+        counts = {}
+        for facet in FACETS:
+            others = [mask for name, mask in masks.items() if name != facet]
+            counts[facet] = self._count(facet, np.logical_and.reduce(others) if others else None)
+        return counts
+    
+    def total(self, book_filter: Optional[BookFilter] = None) -> int:
+        """
+        Count the books matching a selection.
+        
+        Args:
+            book_filter: Selection to count (its sort is ignored)
+        
+        Returns:
+            int: Number of matching books
+        """
+        masks = list(self._masks(book_filter).values())
+        return int(np.count_nonzero(np.logical_and.reduce(masks))) if masks else len(self)
+
+
+_index: Optional[FacetIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_facet_index() -> FacetIndex:
+    """
+    Get the facet index of the current catalogue.
+    
+    Reuses the cached index while the catalogue data version is
+    unchanged; costs the one version read of get_catalogue_snapshot().
+    
+    Returns:
+        FacetIndex: Index built from the current snapshot
+    """
+    global _index
+    snapshot = get_catalogue_snapshot()
+    index = _index
+    if index is not None and index.version == snapshot.version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != snapshot.version:
+            _index = FacetIndex(snapshot)
+        return _index
+
+
+def get_facet_counts(book_filter: Optional[BookFilter] = None) -> FacetCounts:
+    """
+    Count the books behind every filter value for a selection.
+    
+    Args:
+        book_filter: Current selection (None for the whole catalogue)
+    
+    Returns:
+        FacetCounts: Count per value, by facet
+    """
+    return get_facet_index().counts(book_filter)
@@ -0,0 +1,328 @@
+"""
+Local Cover Image Cache for BookWise.
+Downloads each remote cover once, stores resized JPEG/WebP/AVIF
+derivatives in a content-addressed directory under static/ and serves
+them through Streamlit static file serving with real srcset widths.
+
+Populate with: python -m services.image_cache [--all]
+"""
+
+import io
+import time
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from database.models import CachedImage
+from database.connection import get_db_session, get_read_session, engine
+
+
+# Derivatives are written under the app's static/ folder
+STATIC_DIR = Path(__file__).parent.parent / "static"
+CACHE_DIR = STATIC_DIR / "covers"
+STATIC_URL_PREFIX = "/app/static/covers"
+
+# Derivative settings
+DERIVATIVE_WIDTHS = (160, 320, 480)
+DEFAULT_WIDTH = 320
+QUALITY = {"jpeg": 82, "webp": 78, "avif": 55}
+MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp", "avif": "image/avif"}
+EXTENSIONS = {"jpeg": "jpg", "webp": "webp", "avif": "avif"}
+
+# Largest download accepted, in bytes
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+
+# Seconds between reloads of the in-process cache snapshot
+SNAPSHOT_TTL = 60
+
+
+@dataclass(frozen=True)
+class CoverSources:
+    """Local derivative URLs for one cached image."""
+    content_hash: str
+    widths: Tuple[int, ...]
+    formats: Tuple[str, ...]
+    
+    def url(self, width: int, fmt: str = "jpeg") -> str:
+        """Static URL of one derivative."""
+        return f"{STATIC_URL_PREFIX}/{derivative_name(self.content_hash, width, fmt)}"
+    
+    def srcset(self, fmt: str = "jpeg") -> str:
+        """srcset attribute value for one format."""
+        return ", ".join(f"{self.url(w, fmt)} {w}w" for w in self.widths)
+    
+    def default_url(self) -> str:
+        """JPEG derivative closest to DEFAULT_WIDTH."""
+        width = min(self.widths, key=lambda w: abs(w - DEFAULT_WIDTH))
+        return self.url(width, "jpeg")
+
+
+def ensure_image_cache_table() -> None:
+    """Create the cached_images table if it does not exist yet."""
+    CachedImage.__table__.create(bind=engine, checkfirst=True)
+
+
+def supported_formats() -> Tuple[str, ...]:
+    """Derivative formats this Pillow build can encode."""
+    from PIL import features
+    
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.append("webp")
+    if features.check("avif"):
+        formats.append("avif")
+    return tuple(formats)
+
+
+def derivative_name(content_hash: str, width: int, fmt: str) -> str:
+    """Relative path of a derivative inside CACHE_DIR."""
+    return f"{content_hash[:2]}/{content_hash}-{width}.{EXTENSIONS[fmt]}"
+
+
+def write_derivatives(data: bytes, cache_dir: Optional[Path] = None) -> Tuple[str, int, int, List[int], List[str]]:
+    """
+    Resize image bytes into every derivative width and format.
+    
+    Files that already exist for the same content hash are left alone,
+    and images are never upscaled.
+    
+    Args:
+        data: Downloaded image bytes
+        cache_dir: Root of the content-addressed cache (defaults to CACHE_DIR)
+    
+    Returns:
+        Tuple of (content_hash, width, height, widths, formats)
+    """
+    from PIL import Image, ImageOps
+    
+    cache_dir = cache_dir or CACHE_DIR
+    content_hash = hashlib.sha256(data).hexdigest()
+    with Image.open(io.BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ("RGB", "L"):
+            source = source.convert("RGBA")
+            background = Image.new("RGB", source.size, "white")
+            background.paste(source, mask=source.getchannel("A"))
+            source = background
+        elif source.mode == "L":
+            source = source.convert("RGB")
+        width, height = source.size
+        
+        widths = sorted({min(w, width) for w in DERIVATIVE_WIDTHS})
+        formats = list(supported_formats())
+        for target in widths:
+            resized = None
+            for fmt in formats:
+                path = cache_dir / derivative_name(content_hash, target, fmt)
+                if path.exists():
+                    continue
+                if resized is None:
+                    target_height = max(1, round(height * target / width))
+                    resized = source.resize((target, target_height), Image.LANCZOS)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Per-thread temp name: identical bytes may arrive from two URLs at once
+                tmp_path = path.with_suffix(f"{path.suffix}.{threading.get_ident()}.tmp")
+                options = {"quality": QUALITY[fmt]}
+                if fmt == "jpeg":
+                    options.update(optimize=True, progressive=True)
+                resized.save(tmp_path, format=fmt.upper(), **options)
+                tmp_path.replace(path)
+    return content_hash, width, height, widths, formats
+
+
+def cache_image(url: str, timeout: float = 10.0, cache_dir: Optional[Path] = None) -> Optional[CachedImage]:
+    """
+    Download an image and store its derivatives.
+    
+    Re-downloads are conditional on the stored ETag; a 304 only
+    refreshes fetched_at.
+    
+    Args:
+        url: Remote image URL
+        timeout: Request timeout in seconds
+        cache_dir: Root of the content-addressed cache (defaults to CACHE_DIR)
+    
+    Returns:
+        Optional[CachedImage]: Stored entry, or None if the download failed
+    """
+    from services.image_checker import get_http_session
+    
+    ensure_image_cache_table()
+    with get_read_session() as session:
+        existing = session.get(CachedImage, url)
+        if existing is not None:
+            session.expunge(existing)
+    
+    headers = {}
+    if existing is not None and existing.etag:
+        headers["If-None-Match"] = existing.etag
+    
+    try:
+        response = get_http_session().get(url, timeout=timeout, headers=headers, stream=True)
+        if response.status_code == 304 and existing is not None:
+            response.close()
+            data = None
+        elif response.status_code == 200:
+            data = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+            response.close()
+            if len(data) > MAX_IMAGE_BYTES:
+                return None
+        else:
+            response.close()
+            return None
+    except requests.RequestException:
+        return None
+    
+    if data is not None:
+        try:
+            content_hash, width, height, widths, formats = write_derivatives(data, cache_dir)
+        except Exception:
+            # Not a decodable image
+            return None
+    
+    with get_db_session() as session:
+        entry = session.get(CachedImage, url)
+        if data is not None:
+            if entry is None:
+                entry = CachedImage(url=url)
+                session.add(entry)
+            entry.content_hash = content_hash
+            entry.width = width
+            entry.height = height
+            entry.widths = widths
+            entry.formats = formats
+            entry.etag = response.headers.get("ETag")
+        elif entry is None:
+            return None
+        entry.fetched_at = datetime.utcnow()
+        session.flush()
+        session.expunge(entry)
+    
+    _update_snapshot([entry])
+    return entry
+
+
+def cache_images(urls: Iterable[str], workers: int = 4, timeout: float = 10.0) -> Dict[str, int]:
+    """
+    Download and resize images concurrently.
+    
+    Args:
+        urls: Remote image URLs
+        workers: Number of concurrent downloads
+        timeout: Request timeout in seconds
+    
+    Returns:
+        Dict with counts of requested, cached and failed URLs
+    """
+    urls = sorted(set(u for u in urls if u and u.startswith(("http://", "https://"))))
+    if not urls:
+        return {"requested": 0, "cached": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-cache") as pool:
+        entries = list(pool.map(lambda u: cache_image(u, timeout), urls))
+    cached = sum(1 for e in entries if e is not None)
+    return {"requested": len(urls), "cached": cached, "failed": len(urls) - cached}
+
+
+def uncached_urls(urls: Iterable[str]) -> List[str]:
+    """
+    Filter URLs down to those without local derivatives.
+    
+    Args:
+        urls: Candidate URLs
+    
+    Returns:
+        List[str]: URLs not yet in the cache
+    """
+    urls = set(urls)
+    ensure_image_cache_table()
+    with get_read_session() as session:
+        cached = {url for (url,) in session.query(CachedImage.url).filter(CachedImage.url.in_(urls))}
+    return sorted(urls - cached)
+
+
+def refresh_cover_cache(full: bool = False, workers: int = 4) -> Dict[str, int]:
+    """
+    Cache every catalogue image that has no local derivatives yet.
+    
+    Args:
+        full: Revalidate every URL, not just uncached ones
+        workers: Number of concurrent downloads
+    
+    Returns:
+        Dict with counts of requested, cached and failed URLs
+    """
+    from services.image_checker import collect_image_urls
+    
+    urls = collect_image_urls()
+    return cache_images(urls if full else uncached_urls(urls), workers=workers)
+
+
+# ============================================================================
+# RENDER-PATH LOOKUP
+# ============================================================================
+
+_snapshot: Dict[str, CoverSources] = {}
+_snapshot_loaded_at = 0.0
+_snapshot_lock = threading.Lock()
+
+
+def _sources(entry: CachedImage) -> CoverSources:
+    """Build CoverSources from a stored entry."""
+    return CoverSources(
+        content_hash=entry.content_hash,
+        widths=tuple(entry.widths),
+        formats=tuple(entry.formats),
+    )
+
+
+def _update_snapshot(entries: Iterable[CachedImage]) -> None:
+    """Merge fresh entries into the in-process snapshot."""
+    with _snapshot_lock:
+        for entry in entries:
+            _snapshot[entry.url] = _sources(entry)
+
+
+def get_cover_sources(url: Optional[str]) -> Optional[CoverSources]:
+    """
+    Look up local derivatives for an image URL without network I/O.
+    
+    Args:
+        url: Remote image URL
+    
+    Returns:
+        Optional[CoverSources]: Local derivatives, or None if not cached
+    """
+    global _snapshot, _snapshot_loaded_at
+    if not url:
+        return None
+    if time.monotonic() - _snapshot_loaded_at > SNAPSHOT_TTL:
+        try:
+            with get_read_session() as session:
+                snapshot = {e.url: _sources(e) for e in session.query(CachedImage)}
+        except Exception:
+            # Table not created yet
+            snapshot = {}
+        with _snapshot_lock:
+            _snapshot = snapshot
+            _snapshot_loaded_at = time.monotonic()
+    return _snapshot.get(url)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache BookWise cover images locally.")
+    parser.add_argument("--all", action="store_true", help="Revalidate every URL")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent downloads")
+    args = parser.parse_args()
+    
+    stats = refresh_cover_cache(full=args.all, workers=args.workers)
+    print(
+        f"🖼️ Cached {stats['cached']} of {stats['requested']} images "
+        f"({stats['failed']} failed) in {CACHE_DIR}."
+    )
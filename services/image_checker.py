@@ -0,0 +1,363 @@
+"""
+Background Image Checker for BookWise.
+Probes cover and genre image URLs concurrently over pooled HTTP
+connections and stores status, ETag and last-checked time in SQLite.
+Page renders only read the stored results; URLs that have never been
+checked are queued for a background worker thread.
+
+Check all catalogue images with: python -m services.image_checker [--all]
+"""
+
+import time
+import argparse
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from database.models import Book, Genre, ImageCheck
+from database.connection import get_db_session, get_read_session, engine
+
+
+# Probe settings
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 5.0
+BROWSER_HEADERS = {
+    # Browser headers avoid 403 blocks from Amazon/firewalls
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Re-check intervals
+RECHECK_OK_AFTER = timedelta(hours=24)
+RECHECK_FAILED_AFTER = timedelta(hours=1)
+
+# Seconds between reloads of the in-process status snapshot
+SNAPSHOT_TTL = 60
+
+# Background queue settings
+BATCH_SIZE = 32
+BATCH_WAIT = 0.5
+
+
+@dataclass
+class ImageCheckResult:
+    """Represents the outcome of probing one image URL."""
+    url: str
+    ok: bool
+    status_code: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+
+_thread_local = threading.local()
+
+
+def ensure_image_check_table() -> None:
+    """Create the image_checks table if it does not exist yet."""
+    ImageCheck.__table__.create(bind=engine, checkfirst=True)
+
+
+def get_http_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """Per-thread HTTP session so keep-alive connections are reused."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(BROWSER_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _thread_local.session = session
+    return session
+
+
+def probe_image(
+    url: str,
+    timeout: float = DEFAULT_TIMEOUT,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None
+) -> ImageCheckResult:
+    """
+    Check whether an image URL is reachable.
+    
+    Sends a conditional HEAD using the stored validators, so an unchanged
+    image costs a bodiless 304. Falls back to a streamed GET for servers
+    that reject HEAD.
+    
+    Args:
+        url: Image URL to check
+        timeout: Request timeout in seconds
+        etag: ETag from the previous check
+        last_modified: Last-Modified from the previous check
+    
+    Returns:
+        ImageCheckResult: Status and validators for the URL
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    
+    session = get_http_session()
+    try:
+        response = session.head(url, timeout=timeout, allow_redirects=True, headers=headers)
+        if response.status_code not in (200, 304):
+            # Some servers block HEAD; confirm with a GET before failing
+            response = session.get(url, timeout=timeout, stream=True, headers=headers)
+            response.close()
+    except requests.RequestException as e:
+        return ImageCheckResult(url=url, ok=False, error=type(e).__name__)
+    
+    if response.status_code == 304:
+        return ImageCheckResult(url=url, ok=True, status_code=304, etag=etag, last_modified=last_modified)
+    return ImageCheckResult(
+        url=url,
+        ok=response.status_code == 200,
+        status_code=response.status_code,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def save_results(results: Iterable[ImageCheckResult]) -> None:
+    """
+    Upsert check results in a single transaction.
+    
+    Args:
+        results: Probe results to store
+    """
+    now = datetime.utcnow()
+    with get_db_session() as session:
+        for result in results:
+            session.merge(ImageCheck(
+                url=result.url,
+                ok=result.ok,
+                status_code=result.status_code,
+                etag=result.etag,
+                last_modified=result.last_modified,
+                error=result.error,
+                checked_at=now,
+            ))
+
+
+def check_images(
+    urls: Iterable[str],
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT
+) -> List[ImageCheckResult]:
+    """
+    Probe URLs concurrently and store the results.
+    
+    Args:
+        urls: Image URLs to check
+        workers: Number of concurrent probes
+        timeout: Request timeout in seconds
+    
+    Returns:
+        List[ImageCheckResult]: One result per unique URL
+    """
+    urls = sorted(set(u for u in urls if u))
+    if not urls:
+        return []
+    
+    ensure_image_check_table()
+    with get_read_session() as session:
+        previous = {
+            row.url: (row.etag, row.last_modified)
+            for row in session.query(ImageCheck.url, ImageCheck.etag, ImageCheck.last_modified)
+            .filter(ImageCheck.url.in_(urls))
+        }
+    
+    def probe(url: str) -> ImageCheckResult:
+        etag, last_modified = previous.get(url, (None, None))
+        return probe_image(url, timeout, etag, last_modified)
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-check") as pool:
+        results = list(pool.map(probe, urls))
+    
+    save_results(results)
+    _update_snapshot(results)
+    return results
+
+
+def collect_image_urls() -> List[str]:
+    """
+    Get every cover and genre image URL in the catalogue.
+    
+    Returns:
+        List[str]: Unique image URLs
+    """
+    with get_read_session() as session:
+        urls = set()
+        for cover, fallback in session.query(Book.cover_image_url, Book.cover_image_fallback):
+            urls.update((cover, fallback))
+        urls.update(url for (url,) in session.query(Genre.image_url))
+    urls.discard(None)
+    urls.discard("")
+    return sorted(urls)
+
+
+def stale_urls(urls: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+    """
+    Filter URLs down to those never checked or due for a re-check.
+    
+    Args:
+        urls: Candidate URLs
+        now: Reference time (defaults to utcnow)
+    
+    Returns:
+        List[str]: URLs that need probing
+    """
+    now = now or datetime.utcnow()
+    urls = set(urls)
+    ensure_image_check_table()
+    with get_read_session() as session:
+        fresh = {
+            url
+            for url, ok, checked_at in session.query(ImageCheck.url, ImageCheck.ok, ImageCheck.checked_at)
+            .filter(ImageCheck.url.in_(urls))
+            if now - checked_at < (RECHECK_OK_AFTER if ok else RECHECK_FAILED_AFTER)
+        }
+    return sorted(urls - fresh)
+
+
+def refresh_image_checks(
+    full: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT
+) -> Dict[str, int]:
+    """
+    Check catalogue images that are new or due for a re-check.
+    
+    Args:
+        full: Re-check every URL regardless of when it was last checked
+        workers: Number of concurrent probes
+        timeout: Request timeout in seconds
+    
+    Returns:
+        Dict with counts of total, checked, ok and failed URLs
+    """
+    urls = collect_image_urls()
+    targets = urls if full else stale_urls(urls)
+    results = check_images(targets, workers=workers, timeout=timeout)
+    ok = sum(1 for r in results if r.ok)
+    return {"total": len(urls), "checked": len(results), "ok": ok, "failed": len(results) - ok}
+
+
+# ============================================================================
+# RENDER-PATH STATUS LOOKUP AND BACKGROUND QUEUE
+# ============================================================================
+
+_snapshot: Dict[str, bool] = {}
+_snapshot_loaded_at = 0.0
+_snapshot_lock = threading.Lock()
+
+_pending = set()
+_pending_lock = threading.Lock()
+_wake = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def load_image_statuses() -> Dict[str, bool]:
+    """
+    Read every stored check result.
+    
+    Returns:
+        Dict mapping URL to whether it was reachable
+    """
+    try:
+        with get_read_session() as session:
+            return dict(session.query(ImageCheck.url, ImageCheck.ok).all())
+    except Exception:
+        # Table not created yet
+        return {}
+
+
+def _update_snapshot(results: Iterable[ImageCheckResult]) -> None:
+    """Merge fresh results into the in-process snapshot."""
+    with _snapshot_lock:
+        for result in results:
+            _snapshot[result.url] = result.ok
+
+
+def get_image_status(url: str) -> Optional[bool]:
+    """
+    Look up the stored status of an image URL without network I/O.
+    
+    Args:
+        url: Image URL
+    
+    Returns:
+        Optional[bool]: Stored status, or None if never checked
+    """
+    global _snapshot, _snapshot_loaded_at
+    if time.monotonic() - _snapshot_loaded_at > SNAPSHOT_TTL:
+        statuses = load_image_statuses()
+        with _snapshot_lock:
+            _snapshot = statuses
+            _snapshot_loaded_at = time.monotonic()
+    return _snapshot.get(url)
+
+
+def schedule_check(url: str) -> None:
+    """
+    Queue a URL for the background worker.
+    
+    Args:
+        url: Image URL to check
+    """
+    global _worker
+    with _pending_lock:
+        _pending.add(url)
+        if _worker is None:
+            _worker = threading.Thread(target=_worker_loop, name="image-checker", daemon=True)
+            _worker.start()
+    _wake.set()
+
+
+def _worker_loop() -> None:
+    """Drain the queue in batches; exit once it has stayed empty for a while."""
+    global _worker
+    while True:
+        if not _wake.wait(timeout=SNAPSHOT_TTL):
+            with _pending_lock:
+                if not _pending:
+                    _worker = None
+                    return
+            continue
+        # Let a page finish queueing its covers before probing
+        time.sleep(BATCH_WAIT)
+        with _pending_lock:
+            _wake.clear()
+            batch = [_pending.pop() for _ in range(min(BATCH_SIZE, len(_pending)))]
+            if _pending:
+                _wake.set()
+        if not batch:
+            continue
+        try:
+            results = check_images(batch)
+            # Reachable images are also downloaded into the local cover cache
+            from services.image_cache import cache_images, uncached_urls
+            cache_images(uncached_urls(r.url for r in results if r.ok))
+        except Exception:
+            # Leave the URLs unchecked; they are queued again on next render
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check BookWise catalogue image URLs.")
+    parser.add_argument("--all", action="store_true", help="Re-check every URL")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent probes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Request timeout in seconds")
+    args = parser.parse_args()
+    
+    stats = refresh_image_checks(full=args.all, workers=args.workers, timeout=args.timeout)
+    print(
+        f"🖼️ Checked {stats['checked']} of {stats['total']} image URLs: "
+        f"{stats['ok']} ok, {stats['failed']} failed."
+    )
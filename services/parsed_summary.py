@@ -0,0 +1,232 @@
+"""
+Parsed Summary Layer for BookWise.
+Freezes a summary's JSON list columns once per Summary.updated_at version
+and precomputes the text built from them, so the detail page, the AI
+service, retrieval and the recommender share one immutable parse instead
+of each rebuilding it on every render or chat turn. Raw JSON strings, as
+found in hand-built book_data dicts, are decoded here as well.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from database.views import _freeze
+
+
+# Parsed summaries kept in memory
+PARSED_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True, eq=False)
+class ParsedSummary:
+    """
+    Immutable, decoded view of a summary's content.
+    
+    JSON lists are decoded to tuples and their objects to FrozenDicts,
+    so items still support item.get('title').
+    
+    Attributes:
+        book_id: Book the summary belongs to (None when built from a dict)
+        version: Summary.updated_at the parse was built from
+        context: Summary part of the AI context, after the book header
+        keyword_text: Summary text the recommender extracts keywords from
+    """
+    book_id: Optional[int]
+    version: Optional[datetime]
+    executive_summary: str
+    overview: str
+    main_content: str
+    who_should_read: str
+    takeaways: Tuple[Any, ...]
+    analogies: Tuple[Any, ...]
+    quotes: Tuple[Any, ...]
+    action_steps: Tuple[Any, ...]
+    context: str
+    keyword_text: str
+
+
+def decode_list(value: Any) -> Tuple[Any, ...]:
+    """
+    Decode a JSON list column.
+    
+    Plain non-JSON strings become a single item; anything else that is
+    not a list decodes to an empty tuple.
+    
+    Args:
+        value: JSON string, list, or None
+    
+    Returns:
+        Tuple of frozen items
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return (value,) if value.strip() else ()
+    return _freeze(value) if isinstance(value, (list, tuple)) else ()
+
+
+def _context(parsed: Dict[str, Any]) -> str:
+    """Build the summary sections of the AI book context."""
+    parts = []
+    if parsed['executive_summary']:
+        parts.append(f"\nEXECUTIVE SUMMARY:\n{parsed['executive_summary']}")
+    if parsed['main_content']:
+        parts.append(f"\nMAIN CONTENT:\n{parsed['main_content']}")
+    
+    if parsed['takeaways']:
+        parts.append("\nKEY TAKEAWAYS:")
+        for i, t in enumerate(parsed['takeaways'], 1):
+            if isinstance(t, Mapping):
+                parts.append(f"{i}. {t.get('title', '')}: {t.get('text', '')}")
+            else:
+                parts.append(f"{i}. {t}")
+    
+    if parsed['analogies']:
+        parts.append("\nANALOGIES & MENTAL MODELS:")
+        for a in parsed['analogies']:
+            if isinstance(a, Mapping):
+                parts.append(f"- {a.get('concept', '')}: {a.get('analogy', '')} - {a.get('explanation', '')}")
+    
+    if parsed['quotes']:
+        parts.append("\nNOTABLE QUOTES:")
+        for q in parsed['quotes'][:5]:
+            parts.append(f'- "{q}"')
+    
+    if parsed['action_steps']:
+        parts.append("\nACTION STEPS:")
+        for i, a in enumerate(parsed['action_steps'], 1):
+            parts.append(f"{i}. {a}")
+    
+    if parsed['who_should_read']:
+        parts.append(f"\nWHO SHOULD READ:\n{parsed['who_should_read']}")
+    return "\n".join(parts)
+
+
+def _keyword_text(parsed: Dict[str, Any]) -> str:
+    """Join the summary text and JSON item values for keyword extraction."""
+    parts = [parsed[f] for f in ('executive_summary', 'main_content', 'who_should_read') if parsed[f]]
+    for field in ('takeaways', 'analogies', 'quotes', 'action_steps'):
+        for item in parsed[field]:
+            if isinstance(item, Mapping):
+                parts.extend(str(v) for v in item.values())
+            else:
+                parts.append(str(item))
+    return " ".join(parts)
+
+
+def parse_fields(
+    executive_summary: Optional[str] = None,
+    overview: Optional[str] = None,
+    main_content: Optional[str] = None,
+    who_should_read: Optional[str] = None,
+    takeaways: Any = None,
+    analogies: Any = None,
+    quotes: Any = None,
+    action_steps: Any = None,
+    book_id: Optional[int] = None,
+    version: Optional[datetime] = None
+) -> ParsedSummary:
+    """
+    Decode summary fields and precompute derived text (uncached).
+    
+    Returns:
+        ParsedSummary: Immutable parsed summary
+    """
+    parsed = {
+        'executive_summary': executive_summary or "",
+        'overview': overview or "",
+        'main_content': main_content or "",
+        'who_should_read': who_should_read or "",
+        'takeaways': decode_list(takeaways),
+        'analogies': decode_list(analogies),
+        'quotes': decode_list(quotes),
+        'action_steps': decode_list(action_steps),
+    }
+    return ParsedSummary(
+        book_id=book_id,
+        version=version,
+        context=_context(parsed),
+        keyword_text=_keyword_text(parsed),
+        **parsed,
+    )
+
+
+_parsed_cache: "OrderedDict[Tuple[int, datetime], ParsedSummary]" = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+
+def get_parsed_summary(summary: Any) -> ParsedSummary:
+    """
+    Get the parsed form of a summary, decoding it once per version.
+    
+    Entries are keyed by (summary id, updated_at), so an edited summary
+    is re-parsed automatically. Summaries without a timestamp are parsed
+    without caching.
+    
+    Args:
+        summary: Summary row or SummaryView
+    
+    Returns:
+        ParsedSummary: Shared immutable parse
+    """
+    version = getattr(summary, 'updated_at', None)
+    key = (getattr(summary, 'id', None), version)
+    cacheable = isinstance(key[0], int) and isinstance(version, datetime)
+    if cacheable:
+        with _parsed_cache_lock:
+            parsed = _parsed_cache.get(key)
+            if parsed is not None:
+                _parsed_cache.move_to_end(key)
+                return parsed
+    
+    parsed = parse_fields(
+        executive_summary=getattr(summary, 'executive_summary', None),
+        overview=getattr(summary, 'overview_text', None),
+        main_content=getattr(summary, 'main_content', None),
+        who_should_read=getattr(summary, 'who_should_read', None),
+        takeaways=getattr(summary, 'key_takeaways', None),
+        analogies=getattr(summary, 'analogies', None),
+        quotes=getattr(summary, 'quotes', None),
+        action_steps=getattr(summary, 'action_steps', None),
+        book_id=getattr(summary, 'book_id', None),
+        version=version,
+    )
+    if cacheable:
+        with _parsed_cache_lock:
+            _parsed_cache[key] = parsed
+            while len(_parsed_cache) > PARSED_CACHE_SIZE:
+                _parsed_cache.popitem(last=False)
+    return parsed
+
+
+def parsed_book_data(book_data: Dict[str, Any]) -> ParsedSummary:
+    """
+    Get the parsed summary for an AIService book_data dict.
+    
+    Uses the shared parse under book_data['parsed'] when the caller
+    attached one, otherwise parses the raw fields.
+    
+    Args:
+        book_data: Dictionary with book and summary fields
+    
+    Returns:
+        ParsedSummary: Parsed summary content
+    """
+    parsed = book_data.get('parsed')
+    if isinstance(parsed, ParsedSummary):
+        return parsed
+    return parse_fields(
+        executive_summary=book_data.get('executive_summary'),
+        overview=book_data.get('overview'),
+        main_content=book_data.get('main_content'),
+        who_should_read=book_data.get('who_should_read'),
+        takeaways=book_data.get('takeaways'),
+        analogies=book_data.get('analogies'),
+        quotes=book_data.get('quotes'),
+        action_steps=book_data.get('action_steps'),
+    )
@@ -0,0 +1,354 @@
+"""
+Library-wide Passage Index for BookWise.
+Splits every summary into passages and stores them in an SQLite FTS5
+table ranked with BM25, so one question can retrieve relevant excerpts
+from across the whole library. Only books whose summary changed since
+the last build are re-indexed; search_library starts a background
+refresh whenever the catalogue data version changes and always queries
+the last-built index.
+
+Build or refresh with: python -m services.passage_index [--full]
+"""
+
+import argparse
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from database.models import Book, Summary, PassageIndexEntry
+from database.connection import get_read_session, engine
+from database.data_version import Version, get_data_version
+from database.views import BookView, book_views, select_books
+from services.parsed_summary import get_parsed_summary
+from services.retrieval import Passage, split_passages, tokenize
+
+
+logger = logging.getLogger(__name__)
+
+# rowid = book_id * PASSAGES_PER_BOOK + position, so a book's rows are one range
+PASSAGES_PER_BOOK = 1000
+
+# BM25 column weights: section, text
+BM25_WEIGHTS = (2.0, 1.0)
+
+# Candidates fetched per requested hit before capping passages per book
+CANDIDATE_FACTOR = 4
+
+# Books loaded and indexed per batch during a build
+BUILD_BATCH_SIZE = 500
+
+CREATE_PASSAGES_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+    section, text,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+)
+"""
+
+PASSAGE_SEARCH_SQL = f"""
+SELECT rowid, section, text, bm25(passages_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score
+FROM passages_fts
+WHERE passages_fts MATCH :match
+ORDER BY score
+LIMIT :limit
+"""
+
+
+class PassageIndexUnavailable(RuntimeError):
+    """Raised when the passage index has not been built."""
+
+
+@dataclass
+class LibraryHit:
+    """Represents a passage retrieved from the library."""
+    book: BookView
+    passage: Passage
+    score: float  # BM25 score, lower is better
+
+
+def ensure_passage_index(bind: Optional[Engine] = None) -> None:
+    """
+    Create the passage FTS table and bookkeeping table if missing.
+    
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    """
+    bind = bind or engine
+    with bind.begin() as conn:
+        conn.execute(text(CREATE_PASSAGES_FTS_SQL))
+    PassageIndexEntry.__table__.create(bind=bind, checkfirst=True)
+
+
+def summary_book_data(book: Any, summary: Any) -> Dict[str, Any]:
+    """
+    Build the book_data dict used by AIService and split_passages.
+    
+    Args:
+        book: Book row or view
+        summary: Summary row or view
+    
+    Returns:
+        Dict with book and summary fields
+    """
+    return {
+        'title': book.title,
+        'author': book.author,
+        'year': book.publication_year,
+        'executive_summary': summary.executive_summary,
+        'main_content': summary.main_content,
+        'overview': summary.overview_text,
+        'takeaways': summary.key_takeaways,
+        'analogies': summary.analogies,
+        'quotes': summary.quotes,
+        'action_steps': summary.action_steps,
+        'who_should_read': summary.who_should_read,
+        'parsed': get_parsed_summary(summary),
+    }
+
+
+def _delete_book_rows(conn: Connection, book_ids: List[int]) -> None:
+    """Remove every indexed passage of the given books."""
+    conn.execute(
+        text("DELETE FROM passages_fts WHERE rowid BETWEEN :low AND :high"),
+        [{"low": i * PASSAGES_PER_BOOK, "high": (i + 1) * PASSAGES_PER_BOOK - 1} for i in book_ids],
+    )
+
+
+def build_passage_index(full: bool = False, bind: Optional[Engine] = None) -> Dict[str, int]:
+    """
+    Build or incrementally refresh the passage index.
+    
+    Books are re-split only when Summary.updated_at differs from the
+    indexed value; books that were deleted or lost their summary are
+    dropped from the index.
+    
+    Args:
+        full: Re-index every book regardless of timestamps
+        bind: Engine to use (defaults to the application engine)
+    
+    Returns:
+        Dict with counts of indexed, refreshed and removed books and passages written
+    """
+    bind = bind or engine
+    ensure_passage_index(bind)
+    
+    with Session(bind) as session, session.begin():
+        current = dict(session.execute(select(Summary.book_id, Summary.updated_at)).all())
+        indexed = dict(session.execute(
+            select(PassageIndexEntry.book_id, PassageIndexEntry.summary_updated_at)
+        ).all())
+        
+        removed_ids = sorted(set(indexed) - set(current))
+        changed_ids = sorted(
+            book_id for book_id, updated_at in current.items()
+            if full or book_id not in indexed or indexed[book_id] != updated_at
+        )
+        
+        conn = session.connection()
+        if removed_ids:
+            _delete_book_rows(conn, removed_ids)
+            session.query(PassageIndexEntry).filter(
+                PassageIndexEntry.book_id.in_(removed_ids)
+            ).delete(synchronize_session=False)
+        
+        written = 0
+        for start in range(0, len(changed_ids), BUILD_BATCH_SIZE):
+            batch = changed_ids[start:start + BUILD_BATCH_SIZE]
+            rows = session.execute(
+                select(Book, Summary).join(Summary, Summary.book_id == Book.id).where(Book.id.in_(batch))
+            ).all()
+            _delete_book_rows(conn, batch)
+            
+            passage_rows = []
+            for book, summary in rows:
+                passages = split_passages(summary_book_data(book, summary), book.id)[:PASSAGES_PER_BOOK]
+                passage_rows.extend(
+                    {"rowid": book.id * PASSAGES_PER_BOOK + p.position, "section": p.section, "text": p.text}
+                    for p in passages
+                )
+                session.merge(PassageIndexEntry(
+                    book_id=book.id,
+                    passage_count=len(passages),
+                    summary_updated_at=summary.updated_at,
+                ))
+            if passage_rows:
+                conn.execute(
+                    text("INSERT INTO passages_fts(rowid, section, text) VALUES (:rowid, :section, :text)"),
+                    passage_rows,
+                )
+            written += len(passage_rows)
+            session.flush()
+            session.expunge_all()
+        
+        if full:
+            conn.execute(text("INSERT INTO passages_fts(passages_fts) VALUES ('optimize')"))
+    
+    return {
+        "indexed": len(current),
+        "refreshed": len(changed_ids),
+        "removed": len(removed_ids),
+        "passages": written,
+    }
+
+
+# ============================================================================
+# BACKGROUND REFRESH
+# ============================================================================
+
+_indexed_version: Optional[Version] = None
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _refresh(version: Version) -> None:
+    """Worker body: incrementally rebuild the index for a data version."""
+    global _indexed_version, _refresh_thread
+    try:
+        build_passage_index()
+        _indexed_version = version
+    except Exception:
+        # Retried on the next question; searches use the last-built index meanwhile
+        logger.exception("Passage index refresh failed")
+    finally:
+        with _refresh_lock:
+            _refresh_thread = None
+
+
+def schedule_refresh() -> Optional[threading.Thread]:
+    """
+    Refresh the index in a background thread when the catalogue changed.
+    
+    Cheap enough to call on every question: one data-version read, and
+    at most one worker runs at a time. A fresh or edited database is
+    indexed without the caller waiting for the build.
+    
+    Returns:
+        The started worker thread, or None if the index is current or a
+        refresh is already running
+    """
+    global _refresh_thread
+    version = get_data_version()
+    with _refresh_lock:
+        if version == _indexed_version or _refresh_thread is not None:
+            return None
+        _refresh_thread = threading.Thread(
+            target=_refresh, args=(version,), name="passage-index", daemon=True
+        )
+        _refresh_thread.start()
+        return _refresh_thread
+
+
+def build_library_query(question: str) -> str:
+    """
+    Turn a question into an FTS5 MATCH expression.
+    
+    Stop words are dropped and the remaining terms are OR-ed, so BM25
+    ranks passages by how many rare question terms they contain. Terms
+    are quoted, so user input can never inject FTS syntax.
+    
+    Args:
+        question: Raw question text
+    
+    Returns:
+        str: MATCH expression, empty if the question has no content words
+    """
+    terms = list(dict.fromkeys(tokenize(question)))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search_passages(conn: Connection, match: str, limit: int = 24) -> List[Tuple[int, int, str, str, float]]:
+    """
+    Run a ranked passage query.
+    
+    Args:
+        conn: Open database connection
+        match: MATCH expression from build_library_query
+        limit: Maximum number of passages
+    
+    Returns:
+        List of (book_id, position, section, text, score) tuples, best match first
+    """
+    rows = conn.execute(text(PASSAGE_SEARCH_SQL), {"match": match, "limit": limit}).all()
+    return [
+        (rowid // PASSAGES_PER_BOOK, rowid % PASSAGES_PER_BOOK, section, passage_text, score)
+        for rowid, section, passage_text, score in rows
+    ]
+
+
+def search_library(question: str, limit: int = 6, per_book: int = 2) -> List[LibraryHit]:
+    """
+    Retrieve the passages most relevant to a question from every summary.
+    
+    Never waits for indexing: a catalogue change starts a background
+    refresh and this question is answered from the last-built index.
+    
+    Args:
+        question: User question
+        limit: Maximum number of passages
+        per_book: Maximum passages from any single book
+    
+    Returns:
+        List[LibraryHit]: BM25-ranked passages with their books attached
+    
+    Raises:
+        PassageIndexUnavailable: If the index has not been built yet
+    """
+    match = build_library_query(question or "")
+    if not match:
+        return []
+    
+    try:
+        schedule_refresh()
+    except OperationalError:
+        # Database busy: search the index as last built
+        pass
+    
+    try:
+        with get_read_session() as session:
+            rows = search_passages(session.connection(), match, limit * CANDIDATE_FACTOR)
+            
+            selected, per_book_count = [], {}
+            for row in rows:
+                book_id = row[0]
+                if per_book_count.get(book_id, 0) < per_book:
+                    per_book_count[book_id] = per_book_count.get(book_id, 0) + 1
+                    selected.append(row)
+                    if len(selected) == limit:
+                        break
+            
+            ids = list(per_book_count)
+            books = book_views(session.execute(select_books().where(Book.id.in_(ids)))) if ids else []
+    except OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        raise PassageIndexUnavailable(
+            "The passage index has not been built; run: python -m services.passage_index"
+        ) from e
+    
+    books_by_id = {b.id: b for b in books}
+    return [
+        LibraryHit(
+            book=books_by_id[book_id],
+            passage=Passage(section=section, text=passage_text, book_id=book_id, position=position),
+            score=score,
+        )
+        for book_id, position, section, passage_text, score in selected
+        if book_id in books_by_id
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the BookWise library passage index.")
+    parser.add_argument("--full", action="store_true", help="Re-index every book")
+    args = parser.parse_args()
+    
+    stats = build_passage_index(full=args.full)
+    print(
+        f"📚 Passage index covers {stats['indexed']} summaries: {stats['refreshed']} re-indexed "
+        f"({stats['passages']} passages), {stats['removed']} removed."
+    )
@@ -0,0 +1,425 @@
+"""
+Vectorized Recommendation Scoring for BookWise.
+Holds the catalogue as arrays: keyword sets as a sparse book-by-term
+incidence matrix (kept in both CSR and CSC layout), plus genre, author
+and publication-year columns. Every candidate is scored against a book
+or a reading history in one batched NumPy operation, and the top-K is
+taken with argpartition. Scores, reasons and tie order match
+RecommendationEngine.score_candidate and get_personalized_recommendations.
+"""
+
+import operator
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.queries import get_catalogue_snapshot
+
+
+# Similar-book weights (see RecommendationEngine.score_candidate)
+GENRE_WEIGHT = 40.0
+SAME_AUTHOR_WEIGHT = 30.0
+RELATED_AUTHOR_WEIGHT = 15.0
+KEYWORD_WEIGHT = 30.0
+MIN_KEYWORD_SCORE = 5.0
+ERA_WEIGHT = 5.0
+ERA_YEARS = 5
+
+# Reading-history weights (see RecommendationEngine.get_personalized_recommendations)
+HISTORY_GENRE_WEIGHT = 20
+HISTORY_AUTHOR_WEIGHT = 25
+HISTORY_OVERLAP_WEIGHT = 2
+MIN_HISTORY_OVERLAP = 5
+MAX_HISTORY_OVERLAP_SCORE = 30
+
+# (book, score, reasons) as returned by the ranking methods
+Ranked = Tuple[Any, float, List[str]]
+
+
+def _codes(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Map values to integer codes; falsy values get -1."""
+    index: Dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) if v else -1 for v in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+def top_rows(scores: np.ndarray, limit: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Select the highest positive scores.
+    
+    argpartition finds the limit-th best score in linear time; every row
+    at or above it is then sorted by score and row, so ties keep
+    catalogue order exactly like a stable sort of the full list.
+    
+    Args:
+        scores: Score per catalogue row
+        limit: Number of rows to return
+        candidates: Rows eligible for selection (defaults to all)
+    
+    Returns:
+        np.ndarray: Row indices, best first
+    """
+    rows = np.flatnonzero(scores > 0) if candidates is None else candidates[scores[candidates] > 0]
+    if limit <= 0 or not len(rows):
+        return rows[:0]
+    if len(rows) > limit:
+        values = scores[rows]
+        kth = values[np.argpartition(-values, limit - 1)[limit - 1]]
+        rows = rows[values >= kth]
+    order = np.lexsort((rows, -scores[rows]))
+    return rows[order][:limit]
+
+
+class CatalogueFeatures:
+    """
+    Array representation of the catalogue for batched scoring.
+    
+    Row i describes books[i]; keywords[i] are that book's keywords
+    (empty for books without a summary).
+    """
+    
+    def __init__(self, books: Sequence, keywords: Sequence[Sequence[str]]):
+        self.books = list(books)
+        count = len(self.books)
+        self.ids = np.fromiter((b.id for b in self.books), dtype=np.int64, count=count)
+        self.row_of = {book_id: row for row, book_id in enumerate(self.ids.tolist())}
+        self.row_of_slug = {b.slug: row for row, b in enumerate(self.books)}
+        
+        # Binary book x term matrix: CSR for a book's terms, CSC for a term's books
+        self.vocabulary: Dict[str, int] = {}
+        row_terms = [
+            np.unique(np.fromiter(
+                (self.vocabulary.setdefault(k, len(self.vocabulary)) for k in kws), dtype=np.int64
+            ))
+            for kws in keywords
+        ]
+        self.sizes = np.fromiter((len(t) for t in row_terms), dtype=np.int64, count=count)
+        self.row_indptr = np.concatenate(([0], np.cumsum(self.sizes)))
+        self.row_terms = np.concatenate(row_terms) if count else np.zeros(0, dtype=np.int64)
+        entry_rows = np.repeat(np.arange(count, dtype=np.int64), self.sizes)
+        order = np.argsort(self.row_terms, kind="stable")
+        self.term_rows = entry_rows[order]
+        self.term_indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(self.row_terms, minlength=len(self.vocabulary))))
+        )
+        
+        genres = [getattr(b, 'genre', None) for b in self.books]
+        self.genre_codes, self.genre_slugs = _codes([g.slug if g else None for g in genres])
+        self.author_codes, self.authors = _codes([b.author.lower() if b.author else None for b in self.books])
+        self.genre_index = {slug: code for code, slug in enumerate(self.genre_slugs)}
+        self.author_index = {author: code for code, author in enumerate(self.authors)}
+        self.years = np.fromiter((b.publication_year or 0 for b in self.books), dtype=np.int64, count=count)
+        self._related_authors: Dict[str, np.ndarray] = {}
+        self._author_text: Optional[str] = None
+        self._author_starts: Optional[np.ndarray] = None
+        # LSH indexes over these features, by LSHConfig (see services.ann_index)
+        self.ann_indexes: Dict[Any, Any] = {}
+    
+    def __len__(self) -> int:
+        return len(self.books)
+    
+    def _term_ids(self, keywords: Sequence[str]) -> Tuple[np.ndarray, int]:
+        """Known term ids of a keyword list and the size of its keyword set."""
+        unique = set(keywords)
+        ids = [self.vocabulary[k] for k in unique if k in self.vocabulary]
+        return np.array(ids, dtype=np.int64), len(unique)
+    
+    def overlap(self, term_ids: np.ndarray) -> np.ndarray:
+        """
+        Count shared terms with every book (sparse matrix-vector product).
+        
+        Args:
+            term_ids: Unique term ids of the query
+        
+        Returns:
+            np.ndarray: Intersection size per row
+        """
+        if not len(term_ids):
+            return np.zeros(len(self), dtype=np.int64)
+        starts, ends = self.term_indptr[term_ids], self.term_indptr[term_ids + 1]
+        postings = np.concatenate([self.term_rows[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        return np.bincount(postings, minlength=len(self))
+    
+    def related_author_codes(self, author: str) -> np.ndarray:
+        """
+        Flag authors containing any word of the given (lowercased) author.
+        
+        Words are searched in one newline-joined string of all authors and
+        each match offset is mapped back to its author, instead of testing
+        every author name in Python.
+        
+        Args:
+            author: Lowercased author name
+        
+        Returns:
+            np.ndarray: Boolean mask over author codes
+        """
+        mask = self._related_authors.get(author)
+        if mask is None:
+            if self._author_text is None:
+                self._author_text = "\n".join(self.authors)
+                lengths = np.fromiter((len(a) + 1 for a in self.authors), dtype=np.int64, count=len(self.authors))
+                self._author_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            text = self._author_text
+            offsets = []
+            for name in set(author.split()):
+                start = text.find(name)
+                while start != -1:
+                    offsets.append(start)
+                    start = text.find(name, start + 1)
+            mask = np.zeros(len(self.authors), dtype=bool)
+            if offsets:
+                mask[np.searchsorted(self._author_starts, offsets, side="right") - 1] = True
+            self._related_authors[author] = mask
+        return mask
+    
+    def _by_code(self, codes: np.ndarray, values: np.ndarray, default) -> np.ndarray:
+        """Look up a per-code value for each row, using default for code -1."""
+        return np.where(codes >= 0, values[np.maximum(codes, 0)] if len(values) else default, default)
+    
+    def overlap_rows(self, term_ids: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Count shared terms with selected books only, reading their CSR rows.
+        
+        Args:
+            term_ids: Unique term ids of the query
+            rows: Rows to score
+        
+        Returns:
+            np.ndarray: Intersection size per selected row
+        """
+        lengths = self.sizes[rows]
+        total = int(lengths.sum())
+        if not len(term_ids) or not total:
+            return np.zeros(len(rows), dtype=np.int64)
+        # Flat positions of every selected row's terms
+        offsets = np.repeat(self.row_indptr[rows] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        hits = np.isin(self.row_terms[offsets + np.arange(total)], term_ids)
+        return np.bincount(np.repeat(np.arange(len(rows)), lengths), weights=hits, minlength=len(rows)).astype(np.int64)
+    
+    def similar_components(
+        self,
+        book,
+        keywords: Sequence[str],
+        rows: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute every score component against one book.
+        
+        Args:
+            book: The book being viewed
+            keywords: Its keywords
+            rows: Rows to score (defaults to every row)
+        
+        Returns:
+            Dict of arrays aligned with rows: genre, same_author,
+            related_author, similarity, keyword and era, plus the total score
+        """
+        take = (lambda a: a) if rows is None else (lambda a: a[rows])
+        count = len(self) if rows is None else len(rows)
+        genre_codes, author_codes, sizes, years = (
+            take(self.genre_codes), take(self.author_codes), take(self.sizes), take(self.years)
+        )
+        
+        genre = getattr(book, 'genre', None)
+        genre_code = self.genre_index.get(genre.slug) if genre else None
+        same_genre = genre_codes == genre_code if genre_code is not None else np.zeros(count, dtype=bool)
+        
+        author = book.author.lower() if book.author else None
+        has_author = author_codes >= 0
+        if author:
+            same_author = has_author & (author_codes == self.author_index.get(author, -2))
+            related = has_author & ~same_author & self._by_code(
+                author_codes, self.related_author_codes(author), False
+            )
+        else:
+            same_author = related = np.zeros(count, dtype=bool)
+        
+        term_ids, query_size = self._term_ids(keywords)
+        inter = self.overlap(term_ids) if rows is None else self.overlap_rows(term_ids, rows)
+        union = sizes + query_size - inter
+        similarity = np.zeros(count)
+        if query_size:
+            np.divide(inter, union, out=similarity, where=(sizes > 0) & (union > 0))
+        keyword = similarity * KEYWORD_WEIGHT
+        keyword_hit = keyword > MIN_KEYWORD_SCORE
+        
+        era = (
+            (years != 0) & (np.abs(years - book.publication_year) <= ERA_YEARS)
+            if book.publication_year else np.zeros(count, dtype=bool)
+        )
+        
+        # Added in the same order as score_candidate so float totals match exactly
+        score = np.zeros(count)
+        score += np.where(same_genre, GENRE_WEIGHT, 0.0)
+        score += np.where(same_author, SAME_AUTHOR_WEIGHT, np.where(related, RELATED_AUTHOR_WEIGHT, 0.0))
+        score += np.where(keyword_hit, keyword, 0.0)
+        score += np.where(era, ERA_WEIGHT, 0.0)
+        return {
+            "score": score,
+            "genre": same_genre,
+            "same_author": same_author,
+            "related_author": related,
+            "similarity": similarity,
+            "keyword": keyword_hit,
+            "era": era,
+        }
+    
+    def similar(self, book, keywords: Sequence[str], limit: int, rows: Optional[np.ndarray] = None) -> List[Ranked]:
+        """
+        Rank catalogue books by similarity to one book.
+        
+        Args:
+            book: The book being viewed (excluded from results)
+            keywords: Its keywords
+            limit: Maximum results
+            rows: Only score these rows, e.g. ANN candidates (defaults to all)
+        
+        Returns:
+            List of (book, score, reasons), best first
+        """
+        # Sorted rows keep ties in catalogue order
+        rows = None if rows is None else np.unique(np.asarray(rows, dtype=np.int64))
+        parts = self.similar_components(book, keywords, rows)
+        scores = parts["score"]
+        own_row = self.row_of.get(book.id)
+        if own_row is not None:
+            scores[(rows == own_row) if rows is not None else own_row] = 0.0
+        
+        ranked = []
+        for i in top_rows(scores, limit).tolist():
+            other = self.books[i if rows is None else rows[i]]
+            reasons = []
+            if parts["genre"][i]:
+                reasons.append(f"Same genre: {other.genre.name}")
+            if parts["same_author"][i]:
+                reasons.append(f"Same author: {other.author}")
+            elif parts["related_author"][i]:
+                reasons.append("Related author")
+            if parts["keyword"][i]:
+                if parts["similarity"][i] > 0.2:
+                    reasons.append("Similar themes")
+                elif parts["similarity"][i] > 0.1:
+                    reasons.append("Related topics")
+            if parts["era"][i]:
+                reasons.append("Similar era")
+            ranked.append((other, float(scores[i]), reasons))
+        return ranked
+    
+    def for_history(self, read_rows: Sequence[int], limit: int) -> List[Ranked]:
+        """
+        Rank unread books against a reading history.
+        
+        Args:
+            read_rows: Rows of the books the user has read
+            limit: Maximum results
+        
+        Returns:
+            List of (book, score, reasons), best first
+        """
+        read_rows = np.asarray(read_rows, dtype=np.int64)
+        genre_counts = np.bincount(
+            self.genre_codes[read_rows][self.genre_codes[read_rows] >= 0], minlength=len(self.genre_slugs)
+        )
+        author_counts = np.bincount(
+            self.author_codes[read_rows][self.author_codes[read_rows] >= 0], minlength=len(self.authors)
+        )
+        history_terms = np.unique(np.concatenate(
+            [self.row_terms[self.row_indptr[r]:self.row_indptr[r + 1]] for r in read_rows.tolist()]
+            or [np.zeros(0, dtype=np.int64)]
+        ))
+        return self.for_profile(genre_counts, author_counts, self.overlap(history_terms), read_rows, limit)
+    
+    def for_profile(
+        self,
+        genre_counts: np.ndarray,
+        author_counts: np.ndarray,
+        overlap: np.ndarray,
+        read_rows: Sequence[int],
+        limit: int
+    ) -> List[Ranked]:
+        """
+        Rank unread books against precomputed history vectors.
+        
+        Args:
+            genre_counts: Books read per genre code
+            author_counts: Books read per author code
+            overlap: Keyword overlap of every row with the history's keyword set
+            read_rows: Rows to exclude
+            limit: Maximum results
+        
+        Returns:
+            List of (book, score, reasons), best first
+        """
+        genre_score = self._by_code(self.genre_codes, genre_counts * HISTORY_GENRE_WEIGHT, 0)
+        author_hit = self._by_code(self.author_codes, author_counts > 0, False)
+        overlap_hit = overlap > MIN_HISTORY_OVERLAP
+        
+        score = np.zeros(len(self))
+        score += genre_score
+        score += np.where(author_hit, HISTORY_AUTHOR_WEIGHT, 0)
+        score += np.where(overlap_hit, np.minimum(overlap * HISTORY_OVERLAP_WEIGHT, MAX_HISTORY_OVERLAP_SCORE), 0)
+        score[np.asarray(read_rows, dtype=np.int64)] = 0.0
+        
+        ranked = []
+        for row in top_rows(score, limit).tolist():
+            book = self.books[row]
+            reasons = []
+            if genre_score[row] > 0:
+                reasons.append(f"You like {book.genre.name}")
+            if author_hit[row]:
+                reasons.append(f"You've read {book.author}")
+            if overlap_hit[row]:
+                reasons.append("Matches your interests")
+            ranked.append((book, float(score[row]), reasons))
+        return ranked
+
+
+_features_key: Optional[Tuple] = None
+_features: Optional[CatalogueFeatures] = None
+_features_lock = threading.Lock()
+
+
+def load_catalogue_features(
+    books: Sequence,
+    keywords_for: Callable[[Any, Any], List[str]]
+) -> CatalogueFeatures:
+    """
+    Get features for a list of books, using the catalogue snapshot's summaries.
+    
+    The last result is reused while the catalogue data version, the
+    keyword extractor (its function, for bound methods) and the book
+    views passed in are unchanged.
+    
+    Args:
+        books: Catalogue books, in the order ties should be broken
+        keywords_for: Keyword extractor taking (book, summary)
+    
+    Returns:
+        CatalogueFeatures: Features for the books
+    """
+    global _features_key, _features
+    snapshot = get_catalogue_snapshot()
+    key = (snapshot.version, getattr(keywords_for, "__func__", keywords_for))
+    with _features_lock:
+        cached_key, features = _features_key, _features
+    if (
+        key == cached_key
+        and len(features.books) == len(books)
+        and all(map(operator.is_, features.books, books))
+    ):
+        return features
+    
+    summaries = snapshot.summaries
+    features = CatalogueFeatures(
+        books,
+        [keywords_for(b, summaries[b.id]) if b.id in summaries else [] for b in books],
+    )
+    with _features_lock:
+        _features_key, _features = key, features
+    return features
@@ -0,0 +1,345 @@
+"""
+Materialized Recommendation Index for BookWise.
+Stores per-book keyword sets in book_index and each book's top-K similar
+books as rows of book_recommendations, so the detail page reads its
+recommendations with one indexed query instead of scoring the catalogue.
+
+Build or refresh with: python -m services.recommendation_index [--full]
+The app also refreshes it in a background thread when books or summaries
+change (see schedule_refresh).
+"""
+
+import time
+import logging
+import argparse
+import threading
+from typing import List, Dict, Optional
+
+import numpy as np
+from sqlalchemy import delete, insert, inspect, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload
+
+from database.models import Book, Summary, BookIndexEntry, BookRecommendation, IndexBuild
+from database.connection import get_db_session, get_read_session, engine
+from database.data_version import ensure_data_version, get_data_version, read_data_version
+from database.views import book_views, select_books
+
+
+logger = logging.getLogger(__name__)
+
+# Number of neighbours stored per book
+DEFAULT_TOP_K = 12
+
+# Books whose rows are replaced per DELETE/INSERT batch
+WRITE_BATCH_SIZE = 500
+
+# Minimum seconds between background staleness checks per process
+REFRESH_INTERVAL = 300
+
+# IndexBuild row recording the data version of the last build
+INDEX_NAME = "recommendations"
+
+
+def ensure_index_table() -> None:
+    """
+    Create the book_index, book_recommendations and index_builds tables if needed.
+    
+    A book_index table from before the recommendations were materialized
+    (neighbours stored as JSON) is derived data, so it is dropped and
+    rebuilt by the next refresh.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns(BookIndexEntry.__tablename__)}
+    if columns and "book_updated_at" not in columns:
+        BookIndexEntry.__table__.drop(bind=engine)
+    BookIndexEntry.__table__.create(bind=engine, checkfirst=True)
+    BookRecommendation.__table__.create(bind=engine, checkfirst=True)
+    IndexBuild.__table__.create(bind=engine, checkfirst=True)
+
+
+def _rank_neighbours(
+    features,
+    book,
+    keywords: List[str],
+    top_k: int,
+    rows: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Score candidates against a book and keep the top-K.
+    
+    Args:
+        features: CatalogueFeatures of every indexed book
+        book: Book being indexed
+        keywords: Keywords of the book being indexed
+        top_k: Number of neighbours to keep
+        rows: Restrict candidates to these feature rows (defaults to all)
+    
+    Returns:
+        List of neighbour dicts sorted by score descending
+    """
+    # Ties keep feature row order, i.e. title order
+    return [
+        {"id": other.id, "score": round(score, 4), "reasons": reasons[:3]}
+        for other, score, reasons in features.similar(book, keywords, top_k, rows)
+    ]
+
+
+def _load_neighbours(session) -> Dict[int, List[Dict]]:
+    """Read every stored recommendation list, in rank order."""
+    neighbours: Dict[int, List[Dict]] = {}
+    rows = session.execute(
+        select(
+            BookRecommendation.book_id,
+            BookRecommendation.rec_book_id,
+            BookRecommendation.score,
+            BookRecommendation.reasons,
+        ).order_by(BookRecommendation.book_id, BookRecommendation.rank)
+    )
+    for book_id, rec_book_id, score, reasons in rows:
+        neighbours.setdefault(book_id, []).append({"id": rec_book_id, "score": score, "reasons": reasons})
+    return neighbours
+
+
+def _delete_lists(session, book_ids: List[int]) -> None:
+    """Delete the stored recommendation rows of the given books."""
+    for start in range(0, len(book_ids), WRITE_BATCH_SIZE):
+        batch = book_ids[start:start + WRITE_BATCH_SIZE]
+        session.execute(delete(BookRecommendation).where(BookRecommendation.book_id.in_(batch)))
+
+
+def _write_lists(session, lists: Dict[int, List[Dict]]) -> None:
+    """Replace the stored recommendation rows of the given books."""
+    _delete_lists(session, list(lists))
+    rows = [
+        {"book_id": book_id, "rec_book_id": n["id"], "rank": rank, "score": n["score"], "reasons": n["reasons"]}
+        for book_id, neighbours in lists.items()
+        for rank, n in enumerate(neighbours)
+    ]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        session.execute(insert(BookRecommendation), rows[start:start + WRITE_BATCH_SIZE])
+
+
+def build_recommendation_index(full: bool = False, top_k: int = DEFAULT_TOP_K) -> Dict[str, int]:
+    """
+    Build or incrementally refresh the recommendation index.
+    
+    Keywords are re-extracted only for books whose Book.updated_at or
+    Summary.updated_at differs from the indexed value. Neighbour lists
+    are fully recomputed for those books, and for any other book whose
+    stored list references a changed or removed book; the remaining
+    lists are merged with the scores of the changed books only. Only
+    lists that actually changed are rewritten.
+    
+    Args:
+        full: Rebuild every entry regardless of timestamps
+        top_k: Number of neighbours stored per book
+    
+    Returns:
+        Dict with counts of indexed, refreshed, merged and removed books
+    """
+    from services.recommendations import RecommendationEngine
+    from services.recommendation_features import CatalogueFeatures
+    
+    ensure_index_table()
+    ensure_data_version()
+    rec_engine = RecommendationEngine()
+    
+    with get_db_session() as session:
+        # Read before the catalogue, so a concurrent write leaves the index stale
+        epoch, version = read_data_version(session)
+        rows = (
+            session.query(Book, Summary)
+            .outerjoin(Summary, Summary.book_id == Book.id)
+            .options(joinedload(Book.genre))
+            .order_by(Book.title)
+            .all()
+        )
+        entries = {e.book_id: e for e in session.query(BookIndexEntry).all()}
+        stored = _load_neighbours(session)
+        
+        book_ids = {book.id for book, _ in rows}
+        removed_ids = set(entries) - book_ids
+        for book_id in removed_ids:
+            session.delete(entries.pop(book_id))
+        _delete_lists(session, [book_id for book_id in stored if book_id not in book_ids])
+        
+        # Re-extract keywords only where the book or its summary changed
+        keywords = {}
+        changed_ids = set()
+        for book, summary in rows:
+            entry = entries.get(book.id)
+            summary_updated_at = summary.updated_at if summary else None
+            if (
+                full or entry is None
+                or entry.book_updated_at != book.updated_at
+                or entry.summary_updated_at != summary_updated_at
+            ):
+                keywords[book.id] = rec_engine.get_book_keywords(book, summary) if summary else []
+                changed_ids.add(book.id)
+            else:
+                keywords[book.id] = entry.keywords
+        
+        features = CatalogueFeatures([book for book, _ in rows], [keywords[book.id] for book, _ in rows])
+        changed_rows = np.array(sorted(features.row_of[i] for i in changed_ids), dtype=np.int64)
+        dirty_ids = changed_ids | removed_ids
+        
+        refreshed = 0
+        merged = 0
+        updated: Dict[int, List[Dict]] = {}
+        for book, summary in rows:
+            entry = entries.get(book.id)
+            old_neighbours = stored.get(book.id, [])
+            
+            stale = book.id in changed_ids or any(n["id"] in dirty_ids for n in old_neighbours)
+            if not stale and not len(changed_rows):
+                continue
+            
+            # Large catalogues only score the LSH candidates of each book
+            candidates = rec_engine.candidate_rows(features, book, keywords[book.id], top_k)
+            if stale:
+                neighbours = _rank_neighbours(features, book, keywords[book.id], top_k, candidates)
+                refreshed += 1
+            else:
+                merge_rows = changed_rows if candidates is None else np.intersect1d(changed_rows, candidates)
+                neighbours = old_neighbours + _rank_neighbours(
+                    features, book, keywords[book.id], top_k, merge_rows
+                )
+                neighbours.sort(key=lambda n: -n["score"])
+                neighbours = neighbours[:top_k]
+                merged += 1
+            
+            if neighbours != old_neighbours:
+                updated[book.id] = neighbours
+            if entry is None:
+                entry = BookIndexEntry(book_id=book.id)
+                session.add(entry)
+            entry.keywords = keywords[book.id]
+            entry.book_updated_at = book.updated_at
+            entry.summary_updated_at = summary.updated_at if summary else None
+        
+        _write_lists(session, updated)
+        session.merge(IndexBuild(name=INDEX_NAME, epoch=epoch, version=version))
+        
+        return {
+            "indexed": len(rows),
+            "refreshed": refreshed,
+            "merged": merged,
+            "removed": len(removed_ids),
+        }
+
+
+def get_indexed_recommendations(book_id: int, limit: int = 6) -> Optional[List]:
+    """
+    Get precomputed recommendations for a book.
+    
+    Args:
+        book_id: Book database ID
+        limit: Maximum recommendations to return
+    
+    Returns:
+        List of BookScore in score order, or None if the book is not indexed
+    """
+    from services.recommendations import BookScore
+    
+    try:
+        with get_read_session() as session:
+            # One range scan of ix_book_recommendations_book_rank joined to books
+            rows = session.execute(
+                select_books()
+                .add_columns(BookRecommendation.score, BookRecommendation.reasons)
+                .join(BookRecommendation, BookRecommendation.rec_book_id == Book.id)
+                .where(BookRecommendation.book_id == book_id)
+                .order_by(BookRecommendation.rank)
+                .limit(limit)
+            ).all()
+            if not rows and session.get(BookIndexEntry, book_id) is None:
+                return None
+    except OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        # Index not built yet; callers fall back to live scoring
+        return None
+    
+    books = book_views(row[:-2] for row in rows)
+    return [
+        BookScore(book=book, score=row[-2], reasons=row[-1])
+        for book, row in zip(books, rows)
+    ]
+
+
+def index_is_stale() -> bool:
+    """
+    Check cheaply whether the catalogue changed since the last build.
+    
+    Compares the current data version with the one the last build
+    recorded, so every write to genres, books or summaries counts,
+    deletes included.
+    
+    Returns:
+        bool: True when the index may be out of date
+    """
+    ensure_index_table()
+    current = get_data_version()
+    with get_read_session() as session:
+        built = session.get(IndexBuild, INDEX_NAME)
+    return built is None or (built.epoch, built.version) != current
+
+
+# ============================================================================
+# BACKGROUND REFRESH
+# ============================================================================
+
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+_last_check = float("-inf")
+
+
+def _refresh_if_stale() -> None:
+    """Worker body: refresh the index when it is out of date."""
+    global _refresh_thread
+    try:
+        if index_is_stale():
+            build_recommendation_index()
+    except Exception:
+        # Retried on the next check; pages fall back to live scoring meanwhile
+        logger.exception("Recommendation index refresh failed")
+    finally:
+        with _refresh_lock:
+            _refresh_thread = None
+
+
+def schedule_refresh(force: bool = False) -> Optional[threading.Thread]:
+    """
+    Refresh the index in a background thread when it is stale.
+    
+    Cheap enough to call on every render: at most one check starts per
+    REFRESH_INTERVAL seconds and at most one worker runs at a time.
+    
+    Args:
+        force: Check now regardless of REFRESH_INTERVAL
+    
+    Returns:
+        The started worker thread, or None if no check was started
+    """
+    global _refresh_thread, _last_check
+    with _refresh_lock:
+        now = time.monotonic()
+        if _refresh_thread is not None or (not force and now - _last_check < REFRESH_INTERVAL):
+            return None
+        _last_check = now
+        _refresh_thread = threading.Thread(target=_refresh_if_stale, name="recommendation-index", daemon=True)
+        _refresh_thread.start()
+        return _refresh_thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the BookWise recommendation index.")
+    parser.add_argument("--full", action="store_true", help="Rebuild every entry")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Neighbours stored per book")
+    args = parser.parse_args()
+    
+    stats = build_recommendation_index(full=args.full, top_k=args.top_k)
+    print(
+        f"🎯 Indexed {stats['indexed']} books: {stats['refreshed']} refreshed, "
+        f"{stats['merged']} merged, {stats['removed']} removed."
+    )
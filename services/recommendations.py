@@ -3,18 +3,19 @@ Smart Recommendation Engine for BookWise.
 Content-based filtering with genre, author, and keyword similarity.
 """
 
-import json
 import re
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 import streamlit as st
 
+from services.parsed_summary import get_parsed_summary
+
 
 @dataclass
 class BookScore:
     """Represents a book with its recommendation score."""
-    book: any  # Book model
+    book: any  # BookView
     score: float
     reasons: List[str]
 
@@ -34,7 +35,16 @@ class RecommendationEngine:
         'content': 1.0
     }
     
-    def __init__(self):
+    def __init__(self, ann_config=None, ann_min_books: Optional[int] = None):
+        """
+        Args:
+            ann_config: LSHConfig for approximate candidate generation
+                (defaults to the balanced preset)
+            ann_min_books: Catalogue size from which candidates come from the
+                LSH index instead of scoring every book (None for ANN_MIN_BOOKS)
+        """
+        self.ann_config = ann_config
+        self.ann_min_books = ann_min_books
         self._book_cache = {}
         self._keyword_index = defaultdict(list)
         self._author_index = defaultdict(list)
@@ -101,32 +111,116 @@ class RecommendationEngine:
         all_text.append(book.author)
         
         if summary:
-            # Add summary content
-            if summary.executive_summary:
-                all_text.append(summary.executive_summary)
-            if summary.main_content:
-                all_text.append(summary.main_content)
-            if summary.who_should_read:
-                all_text.append(summary.who_should_read)
-            
-            # Parse JSON fields
-            for field in ['key_takeaways', 'analogies', 'quotes', 'action_steps']:
-                value = getattr(summary, field, None)
-                if value:
-                    try:
-                        parsed = json.loads(value) if isinstance(value, str) else value
-                        if isinstance(parsed, list):
-                            for item in parsed:
-                                if isinstance(item, dict):
-                                    all_text.extend(str(v) for v in item.values())
-                                else:
-                                    all_text.append(str(item))
-                    except:
-                        all_text.append(str(value))
+            # Summary text and JSON fields, decoded once per summary version
+            all_text.append(get_parsed_summary(summary).keyword_text)
         
         combined = ' '.join(all_text)
         return self._extract_keywords(combined)
     
+    def get_catalogue_features(self, all_books: List):
+        """
+        Get vectorized features for the catalogue.
+        
+        Args:
+            all_books: List of all available books
+        
+        Returns:
+            CatalogueFeatures: Keyword matrix and genre/author/year arrays
+        """
+        from services.recommendation_features import load_catalogue_features
+        return load_catalogue_features(all_books, self.get_book_keywords)
+    
+    def candidate_rows(self, features, book, keywords: List[str], limit: int):
+        """
+        Pick the feature rows to score exactly for a book.
+        
+        Small catalogues are scored in full. From ann_min_books books on,
+        candidates come from the MinHash/LSH index, which may miss books
+        whose only link is a weak keyword overlap.
+        
+        Args:
+            features: CatalogueFeatures of the catalogue
+            book: The book recommendations are for
+            keywords: Its keywords
+            limit: Number of recommendations wanted
+        
+        Returns:
+            np.ndarray of candidate rows, or None to score every row
+        """
+        from services.ann_index import ANN_MIN_BOOKS, DEFAULT_CONFIG, get_ann_index
+        
+        min_books = ANN_MIN_BOOKS if self.ann_min_books is None else self.ann_min_books
+        if len(features) < min_books:
+            return None
+        index = get_ann_index(features, self.ann_config or DEFAULT_CONFIG)
+        return index.candidates(book, keywords, limit)
+    
+    def score_candidate(
+        self,
+        current_book,
+        current_keywords: List[str],
+        book,
+        book_keywords: List[str]
+    ) -> Tuple[float, List[str]]:
+        """
+        Score a single candidate book against the current book.
+        
+        Args:
+            current_book: The book user is viewing
+            current_keywords: Keywords extracted for the current book
+            book: Candidate book
+            book_keywords: Keywords extracted for the candidate book
+        
+        Returns:
+            Tuple of (score, reasons)
+        """
+        score = 0.0
+        reasons = []
+        
+        current_genre = current_book.genre.slug if hasattr(current_book, 'genre') and current_book.genre else None
+        current_author = current_book.author.lower() if current_book.author else None
+        
+        # Same genre bonus (40% weight)
+        try:
+            if current_genre and hasattr(book, 'genre') and book.genre:
+                if book.genre.slug == current_genre:
+                    score += 40.0
+                    reasons.append(f"Same genre: {book.genre.name}")
+        except Exception:
+            pass
+        
+        # Same author bonus (30% weight)
+        if current_author and book.author:
+            if book.author.lower() == current_author:
+                score += 30.0
+                reasons.append(f"Same author: {book.author}")
+            elif any(name in book.author.lower() for name in current_author.split()):
+                score += 15.0
+                reasons.append("Related author")
+        
+        # Keyword similarity (30% weight)
+        if book_keywords:
+            similarity = self._calculate_keyword_similarity(current_keywords, book_keywords)
+            keyword_score = similarity * 30.0
+            if keyword_score > 5:
+                score += keyword_score
+                if similarity > 0.2:
+                    reasons.append("Similar themes")
+                elif similarity > 0.1:
+                    reasons.append("Related topics")
+        
+        # Publication year proximity bonus (small)
+        try:
+            if current_book.publication_year and book.publication_year:
+                year_diff = abs(current_book.publication_year - book.publication_year)
+                if year_diff <= 5:
+                    score += 5.0
+                    reasons.append("Similar era")
+        except Exception:
+            pass
+        
+        return score, reasons
+    
     def get_recommendations(
         self,
         current_book,
@@ -142,83 +236,25 @@ class RecommendationEngine:
             current_summary: Summary of current book
             all_books: List of all available books
             limit: Maximum recommendations to return
-            
+        
         Returns:
             List of BookScore with scores and reasons
         """
-        from database.queries import get_summary_for_book
+        from services.recommendation_index import get_indexed_recommendations
         
-        recommendations = []
+        # Serve from the precomputed index when this book has been indexed
+        indexed = get_indexed_recommendations(current_book.id, limit=limit)
+        if indexed is not None:
+            return indexed
         
-        # Get current book's keywords and metadata
+        # Score the candidates in one batched pass over the catalogue features
         current_keywords = self.get_book_keywords(current_book, current_summary)
-        current_genre = current_book.genre.slug if hasattr(current_book, 'genre') and current_book.genre else None
-        current_author = current_book.author.lower() if current_book.author else None
-        
-        for book in all_books:
-            # Skip the current book
-            if book.id == current_book.id:
-                continue
-            
-            score = 0.0
-            reasons = []
-            
-            # Same genre bonus (40% weight)
-            try:
-                if current_genre and hasattr(book, 'genre') and book.genre:
-                    if book.genre.slug == current_genre:
-                        score += 40.0
-                        reasons.append(f"Same genre: {book.genre.name}")
-            except Exception:
-                pass
-            
-            # Same author bonus (30% weight)
-            if current_author and book.author:
-                if book.author.lower() == current_author:
-                    score += 30.0
-                    reasons.append(f"Same author: {book.author}")
-                elif any(name in book.author.lower() for name in current_author.split()):
-                    score += 15.0
-                    reasons.append("Related author")
-            
-            # Keyword similarity (30% weight)
-            # Get summary properly via query function
-            try:
-                book_summary = get_summary_for_book(book.id)
-                if book_summary:
-                    book_keywords = self.get_book_keywords(book, book_summary)
-                    similarity = self._calculate_keyword_similarity(current_keywords, book_keywords)
-                    keyword_score = similarity * 30.0
-                    if keyword_score > 5:
-                        score += keyword_score
-                        if similarity > 0.2:
-                            reasons.append("Similar themes")
-                        elif similarity > 0.1:
-                            reasons.append("Related topics")
-            except Exception:
-                pass
-            
-            # Publication year proximity bonus (small)
-            try:
-                if current_book.publication_year and book.publication_year:
-                    year_diff = abs(current_book.publication_year - book.publication_year)
-                    if year_diff <= 5:
-                        score += 5.0
-                        reasons.append("Similar era")
-            except Exception:
-                pass
-            
-            if score > 0:
-                recommendations.append(BookScore(
-                    book=book,
-                    score=score,
-                    reasons=reasons[:3]  # Top 3 reasons
-                ))
-        
-        # Sort by score descending
-        recommendations.sort(key=lambda x: x.score, reverse=True)
-        
-        return recommendations[:limit]
+        features = self.get_catalogue_features(all_books)
+        rows = self.candidate_rows(features, current_book, current_keywords, limit)
+        return [
+            BookScore(book=book, score=score, reasons=reasons[:3])  # Top 3 reasons
+            for book, score, reasons in features.similar(current_book, current_keywords, limit, rows)
+        ]
     
     def get_personalized_recommendations(
         self,
@@ -233,88 +269,56 @@ class RecommendationEngine:
             user_history: Slugs of books user has read/liked
             all_books: All available books
             limit: Max recommendations
-            
+        
         Returns:
             List of recommended books
         """
         if not user_history:
             # Return top-rated books as fallback
-            from database.queries import get_top_rated_books, get_summary_for_book
+            from database.queries import get_top_rated_books
             top_books = get_top_rated_books(limit=limit)
             return [BookScore(book=b, score=100, reasons=["Top Rated"]) for b in top_books]
         
-        from database.queries import get_summary_for_book
-        
-        # Aggregate preferences from reading history
-        genre_counts = defaultdict(int)
-        author_counts = defaultdict(int)
-        all_keywords = []
-        read_ids = set()
-        
-        for book in all_books:
-            if book.slug in user_history:
-                read_ids.add(book.id)
-                try:
-                    if hasattr(book, 'genre') and book.genre:
-                        genre_counts[book.genre.slug] += 1
-                except Exception:
-                    pass
-                if book.author:
-                    author_counts[book.author.lower()] += 1
-                try:
-                    summary = get_summary_for_book(book.id)
-                    if summary:
-                        all_keywords.extend(self.get_book_keywords(book, summary))
-                except Exception:
-                    pass
-        
-        # Score all unread books
-        recommendations = []
-        
-        for book in all_books:
-            if book.id in read_ids:
-                continue
-            
-            score = 0.0
-            reasons = []
-            
-            # Genre preference
-            try:
-                if hasattr(book, 'genre') and book.genre:
-                    genre_score = genre_counts.get(book.genre.slug, 0) * 20
-                    if genre_score > 0:
-                        score += genre_score
-                        reasons.append(f"You like {book.genre.name}")
-            except Exception:
-                pass
-            
-            # Author preference
-            if book.author and author_counts.get(book.author.lower(), 0) > 0:
-                score += 25
-                reasons.append(f"You've read {book.author}")
-            
-            # Keyword overlap
-            if all_keywords:
-                try:
-                    book_summary = get_summary_for_book(book.id)
-                    if book_summary:
-                        book_keywords = self.get_book_keywords(book, book_summary)
-                        overlap = len(set(all_keywords) & set(book_keywords))
-                        if overlap > 5:
-                            score += min(overlap * 2, 30)
-                            reasons.append("Matches your interests")
-                except Exception:
-                    pass
-            
-            if score > 0:
-                recommendations.append(BookScore(
-                    book=book,
-                    score=score,
-                    reasons=reasons[:3]
-                ))
-        
-        recommendations.sort(key=lambda x: x.score, reverse=True)
-        return recommendations[:limit]
+        # Genre, author and keyword preferences of the read books, scored in one batch
+        features = self.get_catalogue_features(all_books)
+        history = set(user_history)
+        read_rows = [row for row, book in enumerate(features.books) if book.slug in history]
+        return [
+            BookScore(book=book, score=score, reasons=reasons[:3])
+            for book, score, reasons in features.for_history(read_rows, limit)
+        ]
+    
+    def get_profile_recommendations(
+        self,
+        profile,
+        all_books: List,
+        limit: int = 6
+    ) -> List[BookScore]:
+        """
+        Get recommendations from a session's incremental reading profile.
+        
+        Scores match get_personalized_recommendations for the profile's
+        books, but the profile's vectors are reused across calls instead
+        of being rebuilt from the history.
+        
+        Args:
+            profile: UserProfile of the session
+            all_books: All available books
+            limit: Max recommendations
+        
+        Returns:
+            List of recommended books
+        """
+        if not profile:
+            from database.queries import get_top_rated_books
+            top_books = get_top_rated_books(limit=limit)
+            return [BookScore(book=b, score=100, reasons=["Top Rated"]) for b in top_books]
+        
+        features = self.get_catalogue_features(all_books)
+        return [
+            BookScore(book=book, score=score, reasons=reasons[:3])
+            for book, score, reasons in profile.recommend(features, limit)
+        ]
 
 
 def render_smart_recommendations(
@@ -330,19 +334,22 @@ def render_smart_recommendations(
         current_summary: Summary of current book
         show_reasons: Whether to show recommendation reasons
     """
-    from database.queries import get_all_books
+    from services.recommendation_index import get_indexed_recommendations, schedule_refresh
     from components.image_handler import load_image_safe
     
     try:
-        engine = RecommendationEngine()
-        all_books = get_all_books()
-        
-        recommendations = engine.get_recommendations(
-            current_book=current_book,
-            current_summary=current_summary,
-            all_books=all_books,
-            limit=4
-        )
+        # One indexed query against the materialized book_recommendations table
+        recommendations = get_indexed_recommendations(current_book.id, limit=4)
+        schedule_refresh()
+        if recommendations is None:
+            # Not materialized yet: score live while the background refresh catches up
+            from database.queries import get_all_books
+            recommendations = RecommendationEngine().get_recommendations(
+                current_book=current_book,
+                current_summary=current_summary,
+                all_books=get_all_books(),
+                limit=4
+            )
         
         if not recommendations:
             st.info("No recommendations available yet. Check back as we add more books!")
@@ -392,7 +399,7 @@ def render_smart_recommendations(
 <p style="font-size: 11px; color: #64748b; margin: 4px 0 0 0;">{book.author}</p>
 </div>
 </div>""", unsafe_allow_html=True)
-            
+
             # Reasons shown separately with simpler markup
             if reasons_text:
                 st.caption(f"🎯 {reasons_text}")
@@ -0,0 +1,253 @@
+"""
+Persistent AI Response Cache for BookWise.
+Stores generated chat answers, quizzes and audio summaries in SQLite,
+keyed by prompt template version, book content and normalized question.
+Entries expire after a per-kind TTL and the least recently used ones are
+evicted once the cache is full. Hit counts and original generation times
+show how much latency and spend the cache saves.
+
+Show metrics with: python -m services.response_cache [--clear]
+"""
+
+import re
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+
+from database.models import AIResponse
+from database.connection import get_db_session, get_read_session, engine
+
+
+# Bump a kind's version whenever its prompt template changes
+PROMPT_VERSIONS = {"chat": 2, "quiz": 1, "audio": 1, "library": 1}
+
+# How long an answer stays valid
+TTL = {
+    "chat": timedelta(days=7),
+    "quiz": timedelta(days=30),
+    "audio": timedelta(days=30),
+    "library": timedelta(days=7),
+}
+
+# Entries kept before least recently used ones are evicted
+MAX_ENTRIES = 5000
+
+# Rough token estimate and gemini-1.5-flash list prices (USD per 1K tokens)
+CHARS_PER_TOKEN = 4
+INPUT_COST_PER_1K = 0.000075
+OUTPUT_COST_PER_1K = 0.0003
+
+
+_table_ready = False
+_counters = {"hits": 0, "misses": 0}
+_counters_lock = threading.Lock()
+
+
+def ensure_response_cache_table() -> None:
+    """Create the ai_responses table if it does not exist yet."""
+    global _table_ready
+    if not _table_ready:
+        AIResponse.__table__.create(bind=engine, checkfirst=True)
+        _table_ready = True
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share a key.
+    
+    Args:
+        question: Raw user question
+    
+    Returns:
+        str: Lowercased question with collapsed whitespace and no trailing punctuation
+    """
+    return re.sub(r"\s+", " ", question or "").strip().lower().rstrip("?!. ")
+
+
+def make_key(kind: str, context: str, question: str = "", extra: str = "") -> str:
+    """
+    Build a cache key.
+    
+    Args:
+        kind: Request type (chat, quiz, audio or library)
+        context: Book context the prompt is built from
+        question: User question, normalized before hashing
+        extra: Anything else the prompt depends on (history, options)
+    
+    Returns:
+        str: SHA-256 hex digest
+    """
+    parts = [kind, str(PROMPT_VERSIONS[kind]), context, normalize_question(question), extra]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _count(name: str) -> None:
+    """Increment an in-process hit/miss counter."""
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def get_response(key: str, now: Optional[datetime] = None) -> Optional[str]:
+    """
+    Look up a cached answer and mark it as recently used.
+    
+    Args:
+        key: Cache key from make_key
+        now: Reference time (defaults to utcnow)
+    
+    Returns:
+        Optional[str]: Cached text, or None on a miss or expired entry
+    """
+    now = now or datetime.utcnow()
+    ensure_response_cache_table()
+    with get_db_session() as session:
+        entry = session.get(AIResponse, key)
+        if entry is None:
+            _count("misses")
+            return None
+        if now - entry.created_at > TTL[entry.kind]:
+            session.delete(entry)
+            _count("misses")
+            return None
+        entry.hits += 1
+        entry.last_used_at = now
+        _count("hits")
+        return entry.response
+
+
+def put_response(
+    key: str,
+    kind: str,
+    response: str,
+    prompt_chars: int = 0,
+    generation_ms: float = 0.0,
+    now: Optional[datetime] = None
+) -> None:
+    """
+    Store a generated answer, evicting the least recently used entries if full.
+    
+    Args:
+        key: Cache key from make_key
+        kind: Request type (chat, quiz, audio or library)
+        response: Generated text
+        prompt_chars: Prompt length, for token-savings estimates
+        generation_ms: Time the generation took
+        now: Reference time (defaults to utcnow)
+    """
+    now = now or datetime.utcnow()
+    ensure_response_cache_table()
+    with get_db_session() as session:
+        session.merge(AIResponse(
+            key=key,
+            kind=kind,
+            response=response,
+            prompt_chars=prompt_chars,
+            generation_ms=generation_ms,
+            hits=0,
+            created_at=now,
+            last_used_at=now,
+        ))
+        session.flush()
+        evict(session, now)
+
+
+def evict(session, now: Optional[datetime] = None) -> int:
+    """
+    Drop expired entries, then the least recently used beyond MAX_ENTRIES.
+    
+    Args:
+        session: Open write session
+        now: Reference time (defaults to utcnow)
+    
+    Returns:
+        int: Number of entries removed
+    """
+    now = now or datetime.utcnow()
+    removed = 0
+    for kind, ttl in TTL.items():
+        removed += session.query(AIResponse).filter(
+            AIResponse.kind == kind, AIResponse.created_at < now - ttl
+        ).delete(synchronize_session=False)
+    
+    overflow = session.query(func.count(AIResponse.key)).scalar() - MAX_ENTRIES
+    if overflow > 0:
+        oldest = (
+            session.query(AIResponse.key)
+            .order_by(AIResponse.last_used_at, AIResponse.created_at)
+            .limit(overflow)
+            .subquery()
+        )
+        removed += session.query(AIResponse).filter(
+            AIResponse.key.in_(oldest.select())
+        ).delete(synchronize_session=False)
+    return removed
+
+
+def clear_cache() -> int:
+    """
+    Remove every cached answer.
+    
+    Returns:
+        int: Number of entries removed
+    """
+    ensure_response_cache_table()
+    with get_db_session() as session:
+        return session.query(AIResponse).delete(synchronize_session=False)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Summarize cache size and savings.
+    
+    Hits and saved latency/spend come from stored hit counts, so they
+    survive restarts; misses are counted in-process since startup.
+    
+    Returns:
+        Dict with entries, hits, session_hits, misses, hit_rate,
+        saved_seconds, saved_tokens and saved_usd
+    """
+    ensure_response_cache_table()
+    with get_read_session() as session:
+        entries, hits, saved_ms, prompt_chars, response_chars = session.query(
+            func.count(AIResponse.key),
+            func.coalesce(func.sum(AIResponse.hits), 0),
+            func.coalesce(func.sum(AIResponse.hits * AIResponse.generation_ms), 0.0),
+            func.coalesce(func.sum(AIResponse.hits * AIResponse.prompt_chars), 0),
+            func.coalesce(func.sum(AIResponse.hits * func.length(AIResponse.response)), 0),
+        ).one()
+    
+    with _counters_lock:
+        session_hits, misses = _counters["hits"], _counters["misses"]
+    lookups = session_hits + misses
+    input_tokens = prompt_chars / CHARS_PER_TOKEN
+    output_tokens = response_chars / CHARS_PER_TOKEN
+    return {
+        "entries": entries,
+        "hits": hits,
+        "session_hits": session_hits,
+        "misses": misses,
+        "hit_rate": session_hits / lookups if lookups else 0.0,
+        "saved_seconds": saved_ms / 1000,
+        "saved_tokens": int(input_tokens + output_tokens),
+        "saved_usd": (input_tokens * INPUT_COST_PER_1K + output_tokens * OUTPUT_COST_PER_1K) / 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show or clear the BookWise AI response cache.")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached answer")
+    args = parser.parse_args()
+    
+    if args.clear:
+        print(f"🧹 Removed {clear_cache()} cached answers.")
+    else:
+        stats = get_cache_stats()
+        print(
+            f"🧠 {stats['entries']} cached answers served {stats['hits']} times, "
+            f"saving {stats['saved_seconds']:.1f}s of generation, "
+            f"~{stats['saved_tokens']:,} tokens (${stats['saved_usd']:.4f})."
+        )
@@ -0,0 +1,271 @@
+"""
+Passage Retrieval for BookWise RAG.
+Splits a book summary into short passages and ranks them against a
+question with a local BM25 index, so chat prompts carry only the most
+relevant excerpts instead of the whole summary.
+"""
+
+import re
+import json
+import math
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from services.parsed_summary import ParsedSummary, parsed_book_data
+
+
+# Passage and ranking settings
+MAX_PASSAGE_WORDS = 120
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Per-book indexes kept in memory
+INDEX_CACHE_SIZE = 64
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'shall', 'can', 'to', 'of', 'in',
+    'for', 'on', 'with', 'at', 'by', 'from', 'up', 'about', 'into', 'over',
+    'after', 'and', 'but', 'or', 'as', 'if', 'when', 'than', 'because',
+    'while', 'where', 'so', 'this', 'that', 'these', 'those', 'it', 'its',
+    'you', 'your', 'we', 'our', 'they', 'their', 'what', 'which', 'who',
+    'how', 'all', 'each', 'me', 'my', 'i', 'book', 'author', 'tell',
+})
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class Passage:
+    """A retrievable excerpt of a book summary."""
+    section: str
+    text: str
+    book_id: Optional[int] = None
+    position: int = 0
+
+
+def _stem(word: str) -> str:
+    """Fold common plural endings so 'habits' matches 'habit'."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase, stemmed terms without stop words.
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        List[str]: Terms in order of appearance
+    """
+    return [_stem(w) for w in _WORD_RE.findall(text.lower()) if w not in STOP_WORDS and len(w) > 1]
+
+
+def _windows(text: str, max_words: int) -> List[str]:
+    """Group paragraphs into chunks of at most max_words, splitting long paragraphs."""
+    chunks, current, count = [], [], 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        words = paragraph.split()
+        if not words:
+            continue
+        while len(words) > max_words:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, count = [], 0
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        if count + len(words) > max_words and current:
+            chunks.append("\n\n".join(current))
+            current, count = [], 0
+        current.append(" ".join(words) if len(words) < len(paragraph.split()) else paragraph.strip())
+        count += len(words)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def split_passages(
+    book_data: Dict[str, Any],
+    book_id: Optional[int] = None,
+    max_words: int = MAX_PASSAGE_WORDS
+) -> List[Passage]:
+    """
+    Split a book's summary fields into passages.
+    
+    Main content is split at markdown headings and then grouped into
+    windows of at most max_words; takeaways and analogies become one
+    passage each; quotes and action steps are grouped.
+    
+    Args:
+        book_data: Dictionary with book and summary fields (as used by AIService)
+        book_id: Book ID to tag passages with
+        max_words: Maximum words per passage
+    
+    Returns:
+        List[Passage]: Passages in document order
+    """
+    parsed = parsed_book_data(book_data)
+    passages: List[Passage] = []
+    
+    def add(section: str, text: str) -> None:
+        for chunk in _windows(text, max_words):
+            passages.append(Passage(section=section, text=chunk, book_id=book_id, position=len(passages)))
+    
+    if parsed.executive_summary:
+        add("Executive Summary", parsed.executive_summary)
+    if parsed.overview and parsed.overview != parsed.executive_summary:
+        add("Overview", parsed.overview)
+    
+    if parsed.main_content:
+        heading = "Main Content"
+        body: List[str] = []
+        for line in parsed.main_content.splitlines():
+            match = re.match(r"^#{1,6}\s+(.*)", line)
+            if match:
+                add(heading, "\n".join(body))
+                heading, body = match.group(1).strip(), []
+            else:
+                body.append(line)
+        add(heading, "\n".join(body))
+    
+    for i, takeaway in enumerate(parsed.takeaways, 1):
+        if isinstance(takeaway, Mapping):
+            add(f"Key Takeaway {i}", f"{takeaway.get('title', '')}: {takeaway.get('text', '')}")
+        else:
+            add(f"Key Takeaway {i}", str(takeaway))
+    
+    for analogy in parsed.analogies:
+        if isinstance(analogy, Mapping):
+            add(
+                "Analogy & Mental Model",
+                f"{analogy.get('concept', '')}: {analogy.get('analogy', '')} - {analogy.get('explanation', '')}"
+            )
+    
+    if parsed.quotes:
+        add("Notable Quotes", "\n\n".join(f'"{q}"' for q in parsed.quotes))
+    
+    if parsed.action_steps:
+        add("Action Steps", "\n\n".join(f"{i}. {a}" for i, a in enumerate(parsed.action_steps, 1)))
+    
+    if parsed.who_should_read:
+        add("Who Should Read", parsed.who_should_read)
+    
+    return passages
+
+
+class BM25Index:
+    """
+    In-memory BM25 index over passages.
+    Section names are indexed with the text so questions like
+    "key takeaways" or "action steps" find those sections.
+    """
+    
+    def __init__(self, passages: List[Passage], k1: float = BM25_K1, b: float = BM25_B):
+        self.passages = passages
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.lengths: List[int] = []
+        
+        for doc_id, passage in enumerate(passages):
+            terms = tokenize(f"{passage.section} {passage.text}")
+            self.lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+        
+        count = len(passages)
+        self.avg_length = sum(self.lengths) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+    
+    def search(self, query: str, k: int = 4) -> List[Tuple[Passage, float]]:
+        """
+        Rank passages against a query.
+        
+        Args:
+            query: Question text
+            k: Number of passages to return
+        
+        Returns:
+            List of (passage, score) pairs, best first; empty if no term matches
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.passages[doc_id], score) for doc_id, score in ranked]
+
+
+_index_cache: "OrderedDict[str, BM25Index]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_book_index(book_data: Dict[str, Any]) -> BM25Index:
+    """
+    Get the BM25 index for a book, building it on first use.
+    
+    Indexes are cached by summary version when book_data carries a
+    parsed summary, otherwise by a hash of the book content, so edited
+    summaries are re-indexed automatically.
+    
+    Args:
+        book_data: Dictionary with book and summary fields
+    
+    Returns:
+        BM25Index: Index over the book's passages
+    """
+    parsed = book_data.get('parsed')
+    if isinstance(parsed, ParsedSummary) and parsed.version is not None:
+        key = f"{parsed.book_id}:{parsed.version.isoformat()}"
+    else:
+        key = hashlib.sha1(json.dumps(book_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+    
+    index = BM25Index(split_passages(book_data))
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def retrieve_passages(book_data: Dict[str, Any], question: str, k: int = 4) -> List[Passage]:
+    """
+    Select the passages most relevant to a question.
+    
+    Falls back to the opening passages (executive summary first) when the
+    question shares no terms with the book, e.g. "summarize this".
+    
+    Args:
+        book_data: Dictionary with book and summary fields
+        question: User question
+        k: Number of passages to return
+    
+    Returns:
+        List[Passage]: Selected passages in document order
+    """
+    index = get_book_index(book_data)
+    hits = [passage for passage, _ in index.search(question, k)]
+    if not hits:
+        hits = index.passages[:k]
+    return sorted(hits, key=lambda p: p.position)
@@ -0,0 +1,160 @@
+"""
+Session Reading Profile for BookWise.
+Turns the books a visitor has started reading (any section marked read)
+or bookmarked into a profile that is updated incrementally: adding or
+removing a book only touches its genre, its author and the keywords that
+enter or leave the profile. The profile keeps the product of the
+catalogue's book x keyword matrix with its keyword indicator vector (each
+book's keyword overlap with the profile), so scoring the catalogue needs
+no keyword work at all.
+"""
+
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import streamlit as st
+
+from services.recommendation_features import CatalogueFeatures, Ranked
+
+
+# Session state key holding the UserProfile
+PROFILE_KEY = "user_profile"
+
+# Profile sources
+SOURCE_READ = "read"
+SOURCE_BOOKMARK = "bookmark"
+
+
+class UserProfile:
+    """
+    Incremental reading profile of one session.
+    
+    Books are recorded by slug together with why they are in the profile.
+    Vectors are aligned with one CatalogueFeatures instance; sync() applies
+    the books added or removed since the last sync and rebuilds only when
+    the catalogue features themselves were replaced.
+    """
+    
+    def __init__(self):
+        self.sources: Dict[str, Set[str]] = {}
+        self._features: Optional[CatalogueFeatures] = None
+        self._applied: Set[int] = set()
+        self.genre_counts = np.zeros(0, dtype=np.int64)
+        self.author_counts = np.zeros(0, dtype=np.int64)
+        self.term_counts = np.zeros(0, dtype=np.int64)
+        self.overlap = np.zeros(0, dtype=np.int64)
+    
+    def __bool__(self) -> bool:
+        return bool(self.sources)
+    
+    @property
+    def slugs(self) -> List[str]:
+        """Slugs of the books in the profile."""
+        return list(self.sources)
+    
+    def add(self, slug: str, source: str) -> None:
+        """
+        Record a book as read or bookmarked.
+        
+        Args:
+            slug: Book slug
+            source: SOURCE_READ or SOURCE_BOOKMARK
+        """
+        self.sources.setdefault(slug, set()).add(source)
+    
+    def remove(self, slug: str, source: str) -> None:
+        """
+        Drop one reason for a book; the book leaves once it has none.
+        
+        Args:
+            slug: Book slug
+            source: SOURCE_READ or SOURCE_BOOKMARK
+        """
+        reasons = self.sources.get(slug)
+        if reasons is not None:
+            reasons.discard(source)
+            if not reasons:
+                del self.sources[slug]
+    
+    def _reset(self, features: CatalogueFeatures) -> None:
+        """Zero the vectors for a new set of catalogue features."""
+        self._features = features
+        self._applied = set()
+        self.genre_counts = np.zeros(len(features.genre_slugs), dtype=np.int64)
+        self.author_counts = np.zeros(len(features.authors), dtype=np.int64)
+        self.term_counts = np.zeros(len(features.vocabulary), dtype=np.int64)
+        self.overlap = np.zeros(len(features), dtype=np.int64)
+    
+    def _apply(self, row: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one book's contribution."""
+        features = self._features
+        genre_code, author_code = features.genre_codes[row], features.author_codes[row]
+        if genre_code >= 0:
+            self.genre_counts[genre_code] += sign
+        if author_code >= 0:
+            self.author_counts[author_code] += sign
+        
+        terms = features.row_terms[features.row_indptr[row]:features.row_indptr[row + 1]]
+        before = self.term_counts[terms]
+        self.term_counts[terms] += sign
+        # Only keywords entering or leaving the profile change the overlap
+        flipped = terms[before == 0] if sign > 0 else terms[self.term_counts[terms] == 0]
+        if len(flipped):
+            self.overlap += sign * features.overlap(flipped)
+    
+    def sync(self, features: CatalogueFeatures) -> List[int]:
+        """
+        Bring the vectors up to date with the recorded books.
+        
+        Args:
+            features: Current catalogue features
+        
+        Returns:
+            List[int]: Feature rows of the profile's books
+        """
+        if features is not self._features:
+            self._reset(features)
+        rows = {features.row_of_slug[s] for s in self.sources if s in features.row_of_slug}
+        for row in self._applied - rows:
+            self._apply(row, -1)
+        for row in rows - self._applied:
+            self._apply(row, 1)
+        self._applied = rows
+        return sorted(rows)
+    
+    def recommend(self, features: CatalogueFeatures, limit: int) -> List[Ranked]:
+        """
+        Rank the books outside the profile.
+        
+        Args:
+            features: Current catalogue features
+            limit: Maximum results
+        
+        Returns:
+            List of (book, score, reasons), best first
+        """
+        rows = self.sync(features)
+        return features.for_profile(self.genre_counts, self.author_counts, self.overlap, rows, limit)
+
+
+def get_user_profile(state=None) -> UserProfile:
+    """
+    Get this session's profile, seeding it from existing progress and bookmarks.
+    
+    Args:
+        state: Session state mapping (defaults to st.session_state)
+    
+    Returns:
+        UserProfile: Profile stored in the session state
+    """
+    state = st.session_state if state is None else state
+    profile = state.get(PROFILE_KEY)
+    if profile is None:
+        profile = UserProfile()
+        for slug, progress in state.get("reading_progress", {}).items():
+            if progress.get("sections_read"):
+                profile.add(slug, SOURCE_READ)
+        for bookmark in state.get("bookmarks", []):
+            profile.add(bookmark["slug"], SOURCE_BOOKMARK)
+        state[PROFILE_KEY] = profile
+    return profile
@@ -176,6 +176,21 @@ class TestDiscoveryComponent:
         with patch.object(discovery, 'st', st_mock):
             result = discovery.is_bookmarked("test-slug")
             assert result is False
+    
+    def test_bookmarks_update_profile(self):
+        """Test bookmarking adds to and unbookmarking removes from the session profile"""
+        st_mock = MagicMock()
+        st_mock.session_state = {}
+        
+        import components.discovery as discovery
+        
+        with patch.object(discovery, 'st', st_mock):
+            discovery.add_bookmark("test-slug", "Test Book", "Test Author")
+            profile = st_mock.session_state["user_profile"]
+            assert profile.slugs == ["test-slug"]
+            
+            discovery.remove_bookmark("test-slug")
+            assert not profile
 
 
 # ============================================================================
@@ -260,6 +275,18 @@ class TestProgressTracker:
             assert progress["percentage"] == 100
             assert progress["completed_at"] is not None
     
+    def test_section_read_updates_profile(self):
+        """Test marking a section read adds the book to the session profile"""
+        st_mock = MagicMock()
+        st_mock.session_state = {}
+        
+        import components.progress_tracker as progress_tracker
+        
+        with patch.object(progress_tracker, 'st', st_mock):
+            progress_tracker.update_reading_progress("test-book", "Section 1", 5)
+            
+            assert st_mock.session_state["user_profile"].slugs == ["test-book"]
+    
     def test_get_books_in_progress(self):
         """Test getting books in progress"""
         st_mock = MagicMock()
@@ -446,6 +473,42 @@ class TestFiltersComponent:
         
         assert result[0].publication_year == 2000
         assert result[1].publication_year == 2023
+    
+    def test_build_book_filter(self):
+        """Test panel values translate into a database filter"""
+        from components.filters import build_book_filter
+        
+        book_filter = build_book_filter(
+            {"year": 2020, "reading_time": "15-20 min", "difficulty": "Advanced",
+             "min_rating": 4.5, "sort": "Rating"},
+            genre_slug="business",
+        )
+        
+        assert book_filter.genre_slug == "business"
+        assert book_filter.year == 2020
+        assert book_filter.reading_time == "16_20"
+        assert book_filter.difficulty == "Advanced"
+        assert book_filter.min_rating == 4.5
+        assert book_filter.sort == "rating"
+    
+    def test_difficulty_options_match_books(self):
+        """Test every difficulty offered by the panel selects books"""
+        from components.filters import build_book_filter, get_filter_options
+        from database.queries import count_filtered_books
+        
+        difficulties = get_filter_options()["difficulties"]
+        
+        assert difficulties
+        for difficulty in difficulties:
+            assert count_filtered_books(build_book_filter({"difficulty": difficulty})) > 0
+    
+    def test_build_book_filter_defaults(self):
+        """Test an untouched panel keeps the default title order"""
+        from components.filters import build_book_filter
+        
+        book_filter = build_book_filter({"year": None, "reading_time": "Any Time", "sort": "Title (A-Z)"})
+        
+        assert book_filter.is_default
 
 
 # ============================================================================
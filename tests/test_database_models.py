@@ -49,6 +49,82 @@ class TestDatabaseConnection:
         
         assert engine is not None
         assert engine.url is not None
+    
+    def test_writer_uses_wal_and_pragmas(self):
+        """Test the writer engine applies WAL and tuning pragmas"""
+        from sqlalchemy import text
+        from database.connection import engine, ENGINE_CONFIG
+        
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -ENGINE_CONFIG.cache_size_kib
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    
+    def test_read_session_rejects_writes(self):
+        """Test get_read_session cannot modify the database"""
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+        from database.connection import get_read_session
+        from database.models import Genre
+        
+        with get_read_session() as session:
+            assert session.query(Genre).count() > 0
+            with pytest.raises(OperationalError):
+                session.execute(text("UPDATE genres SET name = name"))
+    
+    def test_read_session_sees_committed_writes(self):
+        """Test the read-only engine sees writes committed by the writer"""
+        from database.connection import get_db_session, get_read_session
+        from database.models import Genre
+        
+        with get_db_session() as session:
+            session.add(Genre(name="Pool Test Genre", slug="pool-test-genre", description="tmp"))
+        try:
+            with get_read_session() as session:
+                assert session.query(Genre).filter(Genre.slug == "pool-test-genre").count() == 1
+        finally:
+            with get_db_session() as session:
+                session.query(Genre).filter(Genre.slug == "pool-test-genre").delete()
+    
+    def test_engine_config_from_env(self, monkeypatch):
+        """Test EngineConfig reads BOOKWISE_DB_* overrides"""
+        from database.connection import EngineConfig
+        
+        monkeypatch.setenv("BOOKWISE_DB_POOL_SIZE", "3")
+        monkeypatch.setenv("BOOKWISE_DB_BUSY_TIMEOUT", "1.5")
+        monkeypatch.setenv("BOOKWISE_DB_READ_ONLY_QUERIES", "false")
+        config = EngineConfig.from_env()
+        assert config.pool_size == 3
+        assert config.busy_timeout == 1.5
+        assert config.read_only_queries is False
+        assert config.journal_mode == "WAL"
+    
+    def test_create_sqlite_engine_on_new_file(self, tmp_path):
+        """Test create_sqlite_engine configures a fresh database"""
+        from sqlalchemy import text
+        from database.connection import EngineConfig, create_sqlite_engine
+        
+        new_engine = create_sqlite_engine(tmp_path / "pool.db", EngineConfig(pool_size=2))
+        with new_engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert new_engine.pool.size() == 2
+        new_engine.dispose()
+    
+    def test_migrate_indexes_adds_missing(self, tmp_path):
+        """Test migrate_indexes creates indexes added after the tables existed"""
+        from sqlalchemy import text
+        from database.connection import EngineConfig, create_sqlite_engine, migrate_indexes
+        from database.models import Base
+        
+        new_engine = create_sqlite_engine(tmp_path / "migrate.db", EngineConfig())
+        Base.metadata.create_all(bind=new_engine)
+        with new_engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_books_created_at"))
+            conn.execute(text("DROP INDEX ix_summaries_rating"))
+        
+        assert sorted(migrate_indexes(new_engine)) == ["ix_books_created_at", "ix_summaries_rating"]
+        assert migrate_indexes(new_engine) == []
+        new_engine.dispose()
 
 
 # ============================================================================
@@ -171,6 +247,131 @@ class TestSummaryModel:
         assert hasattr(Summary, 'book')
 
 
+class TestJSONColumns:
+    """Test typed JSON list columns"""
+    
+    @pytest.fixture
+    def temp_engine(self, tmp_path):
+        """Fresh database with one genre and book"""
+        from sqlalchemy import text
+        from database.connection import EngineConfig, create_sqlite_engine
+        from database.models import Base
+        
+        new_engine = create_sqlite_engine(tmp_path / "json.db", EngineConfig())
+        Base.metadata.create_all(bind=new_engine)
+        with new_engine.begin() as conn:
+            conn.execute(text("INSERT INTO genres (id, name, slug, description) VALUES (1, 'G', 'g', '')"))
+            conn.execute(text(
+                "INSERT INTO books (id, title, author, slug, genre_id) VALUES "
+                "(1, 'A', 'A', 'a', 1), (2, 'B', 'B', 'b', 1), (3, 'C', 'C', 'c', 1)"
+            ))
+        yield new_engine
+        new_engine.dispose()
+    
+    def test_round_trip_decodes_once(self, temp_engine):
+        """Test lists and JSON strings are stored as JSON and loaded as lists"""
+        from sqlalchemy.orm import Session
+        from database.models import Summary
+        
+        with Session(temp_engine) as session, session.begin():
+            session.add(Summary(
+                book_id=1, overview_text="", main_content="", who_should_read="",
+                key_takeaways=[{"title": "T", "text": "X"}], quotes='["Q"]',
+            ))
+        
+        with Session(temp_engine) as session:
+            summary = session.query(Summary).one()
+            assert summary.key_takeaways == [{"title": "T", "text": "X"}]
+            assert summary.quotes == ["Q"]
+            assert summary.action_steps is None
+    
+    def test_invalid_items_rejected_on_write(self, temp_engine):
+        """Test writes with the wrong item shape fail"""
+        from sqlalchemy.exc import StatementError
+        from sqlalchemy.orm import Session
+        from database.models import Summary
+        
+        with pytest.raises(StatementError, match="title, text"):
+            with Session(temp_engine) as session, session.begin():
+                session.add(Summary(
+                    book_id=1, overview_text="", main_content="", who_should_read="",
+                    key_takeaways=[{"title": "Missing text"}],
+                ))
+        with pytest.raises(StatementError, match="string"):
+            with Session(temp_engine) as session, session.begin():
+                session.add(Summary(
+                    book_id=1, overview_text="", main_content="", who_should_read="",
+                    key_takeaways=[], quotes=[42],
+                ))
+    
+    def test_integer_items(self, temp_engine):
+        """Test int item columns round-trip and reject other item types"""
+        from sqlalchemy.exc import StatementError
+        from sqlalchemy.orm import Session
+        from database.models import CachedImage
+        
+        image = dict(url="u", content_hash="h", width=1, height=1, formats=["jpeg"])
+        with Session(temp_engine) as session, session.begin():
+            session.add(CachedImage(widths=[160, 200], **image))
+        with Session(temp_engine) as session:
+            assert session.get(CachedImage, "u").widths == [160, 200]
+        
+        with pytest.raises(StatementError, match="int"):
+            with Session(temp_engine) as session, session.begin():
+                session.add(CachedImage(widths=["160"], **dict(image, url="v")))
+    
+    def test_malformed_legacy_value_loads_empty(self, temp_engine):
+        """Test rows written outside the ORM never raise on load"""
+        from sqlalchemy import text
+        from sqlalchemy.orm import Session
+        from database.models import Summary
+        
+        with temp_engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO summaries (book_id, overview_text, main_content, key_takeaways, who_should_read, quotes) "
+                "VALUES (1, '', '', 'not json', '', '[\"ok\", 7]')"
+            ))
+        
+        with Session(temp_engine) as session:
+            summary = session.query(Summary).one()
+            assert summary.key_takeaways == []
+            assert summary.quotes == ["ok"]
+            assert summary.takeaway_count == 0
+    
+    def test_filter_on_counts_in_sql(self, temp_engine):
+        """Test takeaway_count and has_quotes filter without loading JSON in Python"""
+        from sqlalchemy import text
+        from sqlalchemy.orm import Session
+        from database.models import Summary
+        
+        with temp_engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO summaries (book_id, overview_text, main_content, key_takeaways, who_should_read, quotes) VALUES "
+                "(1, '', '', '[{\"title\": \"a\", \"text\": \"b\"}]', '', '[\"q\"]'), "
+                "(2, '', '', '[]', '', NULL), "
+                "(3, '', '', 'broken', '', '[]')"
+            ))
+        
+        with Session(temp_engine) as session:
+            with_takeaways = session.query(Summary.book_id).filter(Summary.takeaway_count >= 1).all()
+            with_quotes = session.query(Summary.book_id).filter(Summary.has_quotes).all()
+        
+        assert [r.book_id for r in with_takeaways] == [1]
+        assert [r.book_id for r in with_quotes] == [1]
+    
+    def test_seeded_counts_match_python(self):
+        """Test SQL counts agree with the decoded lists on the app database"""
+        from database.connection import get_read_session
+        from database.models import Summary
+        
+        with get_read_session() as session:
+            for summary, count, has_quotes in session.query(
+                Summary, Summary.takeaway_count, Summary.has_quotes
+            ).limit(20):
+                assert count == len(summary.key_takeaways)
+                assert bool(has_quotes) == bool(summary.quotes)
+
+
 class TestSummaryImageModel:
     """Test SummaryImage model"""
     
@@ -320,8 +521,7 @@ class TestSummaryContent:
                     assert len(summary.executive_summary) > 50, "Executive summary too short"
     
     def test_takeaways_valid_json(self):
-        """Test key_takeaways is valid JSON"""
-        import json
+        """Test key_takeaways is decoded to a validated list"""
         from database.connection import get_db_session
         from database.models import Summary
         
@@ -330,15 +530,11 @@ class TestSummaryContent:
             
             for summary in summaries:
                 if summary.key_takeaways:
-                    try:
-                        takeaways = json.loads(summary.key_takeaways)
-                        assert isinstance(takeaways, list)
-                    except json.JSONDecodeError:
-                        pytest.fail(f"Invalid JSON in key_takeaways for summary {summary.id}")
+                    assert isinstance(summary.key_takeaways, list)
+                    assert all("title" in t and "text" in t for t in summary.key_takeaways)
     
     def test_quotes_valid_json(self):
-        """Test quotes is valid JSON"""
-        import json
+        """Test quotes is decoded to a validated list"""
         from database.connection import get_db_session
         from database.models import Summary
         
@@ -347,15 +543,11 @@ class TestSummaryContent:
             
             for summary in summaries:
                 if summary.quotes:
-                    try:
-                        quotes = json.loads(summary.quotes)
-                        assert isinstance(quotes, list)
-                    except json.JSONDecodeError:
-                        pytest.fail(f"Invalid JSON in quotes for summary {summary.id}")
+                    assert isinstance(summary.quotes, list)
+                    assert all(isinstance(q, str) for q in summary.quotes)
     
     def test_action_steps_valid_json(self):
-        """Test action_steps is valid JSON"""
-        import json
+        """Test action_steps is decoded to a validated list"""
         from database.connection import get_db_session
         from database.models import Summary
         
@@ -364,11 +556,8 @@ class TestSummaryContent:
             
             for summary in summaries:
                 if summary.action_steps:
-                    try:
-                        steps = json.loads(summary.action_steps)
-                        assert isinstance(steps, list)
-                    except json.JSONDecodeError:
-                        pytest.fail(f"Invalid JSON in action_steps for summary {summary.id}")
+                    assert isinstance(summary.action_steps, list)
+                    assert all(isinstance(s, str) for s in summary.action_steps)
 
 
 # ============================================================================
@@ -425,5 +614,195 @@ class TestQueryEdgeCases:
         assert len(result) == 0
 
 
+
+class TestIngestBooks:
+    """Test bulk catalogue ingest"""
+    
+    @pytest.fixture
+    def ingest_engine(self, tmp_path):
+        """Fresh database with search index, data version and two genres"""
+        from database.connection import EngineConfig, create_sqlite_engine
+        from database.data_version import ensure_data_version
+        from database.ingest import upsert_genres
+        from database.models import Base
+        from database.search import ensure_search_index
+        
+        new_engine = create_sqlite_engine(tmp_path / "ingest.db", EngineConfig())
+        Base.metadata.create_all(bind=new_engine)
+        ensure_search_index(new_engine)
+        ensure_data_version(new_engine)
+        upsert_genres(
+            [{"name": "G", "slug": "g", "description": ""}, {"name": "H", "slug": "h", "description": ""}],
+            bind=new_engine,
+        )
+        yield new_engine
+        new_engine.dispose()
+    
+    def _scalar(self, bind, sql):
+        from sqlalchemy import text
+        
+        with bind.connect() as conn:
+            return conn.execute(text(sql)).scalar()
+    
+    def test_inserts_books_summaries_and_images(self, ingest_engine):
+        """Test records become books, summaries, images and search rows"""
+        from database.ingest import ingest_books, synthetic_records
+        
+        records = list(synthetic_records(25, ["g", "h"]))
+        records[0]["images"] = [{"image_url": "/a.png", "section_type": "concept", "section_title": "Core"}]
+        triggers = self._scalar(ingest_engine, "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+        
+        report = ingest_books(records, batch_size=10, bind=ingest_engine)
+        
+        assert (report.inserted, report.skipped, report.summaries, report.images) == (25, 0, 25, 1)
+        assert report.rows == 51 and report.rows_per_second > 0
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 25
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM summaries") == 25
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM summary_images") == 1
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books_fts WHERE books_fts MATCH 'lesson'") == 25
+        # Sync triggers are back, and the version moved once per batch
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'") == triggers
+        assert self._scalar(ingest_engine, "SELECT version FROM data_version") == 2 + 3
+    
+    def test_rerun_skips_existing(self, ingest_engine):
+        """Test existing slugs are skipped without writing"""
+        from database.ingest import ingest_books, synthetic_records
+        
+        ingest_books(synthetic_records(10, ["g"]), bind=ingest_engine)
+        version = self._scalar(ingest_engine, "SELECT version FROM data_version")
+        
+        report = ingest_books(synthetic_records(12, ["g"]), bind=ingest_engine)
+        
+        assert (report.inserted, report.updated, report.skipped) == (2, 0, 10)
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 12
+        assert self._scalar(ingest_engine, "SELECT version FROM data_version") == version + 1
+    
+    def test_update_existing_upserts(self, ingest_engine):
+        """Test update_existing overwrites books and summaries in place"""
+        from database.ingest import ingest_books, synthetic_records
+        
+        ingest_books(synthetic_records(5, ["g"]), bind=ingest_engine)
+        book_id = self._scalar(ingest_engine, "SELECT id FROM books WHERE slug = 'synthetic-book-3'")
+        records = list(synthetic_records(5, ["g"]))
+        records[3].update(title="Renamed Volume", genre_slug="h")
+        records[3]["summary"]["rating"] = 1
+        
+        report = ingest_books(records, update_existing=True, bind=ingest_engine)
+        
+        assert (report.inserted, report.updated) == (0, 5)
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 5
+        assert self._scalar(ingest_engine, "SELECT id FROM books WHERE title = 'Renamed Volume'") == book_id
+        assert self._scalar(ingest_engine, f"SELECT rating FROM summaries WHERE book_id = {book_id}") == 1
+        assert self._scalar(ingest_engine, "SELECT rowid FROM books_fts WHERE books_fts MATCH 'renamed'") == book_id
+    
+    def test_update_keeps_fields_records_omit(self, ingest_engine):
+        """Test an upsert only overwrites the fields a record supplies"""
+        from database.ingest import ingest_books, synthetic_records
+    
+        records = list(synthetic_records(2, ["g"]))
+        records[0].update(isbn="978-0", cover_image_fallback="/fallback.png")
+        records[0]["summary"].update(difficulty="Advanced", seo_title="Kept")
+        ingest_books(records, bind=ingest_engine)
+    
+        records = list(synthetic_records(2, ["g"]))
+        records[0]["title"] = "Retitled"
+        records[0]["summary"] = {"rating": 2.5}
+        report = ingest_books(records, update_existing=True, bind=ingest_engine)
+    
+        assert report.updated == 2
+        book = "SELECT {} FROM books WHERE slug = 'synthetic-book-0'"
+        assert self._scalar(ingest_engine, book.format("title")) == "Retitled"
+        assert self._scalar(ingest_engine, book.format("isbn")) == "978-0"
+        assert self._scalar(ingest_engine, book.format("cover_image_fallback")) == "/fallback.png"
+        summary = f"SELECT {{}} FROM summaries WHERE book_id = ({book.format('id')})"
+        assert self._scalar(ingest_engine, summary.format("rating")) == 2.5
+        assert self._scalar(ingest_engine, summary.format("difficulty")) == "Advanced"
+        assert self._scalar(ingest_engine, summary.format("seo_title")) == "Kept"
+        assert self._scalar(ingest_engine, summary.format("overview_text")) == "Overview of synthetic book 0."
+    
+    def test_failed_batch_rolls_back(self, ingest_engine):
+        """Test a failing batch leaves earlier batches and the triggers intact"""
+        from sqlalchemy.exc import IntegrityError
+        from database.ingest import ingest_books, synthetic_records
+        
+        records = list(synthetic_records(4, ["g"]))
+        del records[3]["summary"]["overview_text"]
+        triggers = self._scalar(ingest_engine, "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+        
+        with pytest.raises(IntegrityError):
+            ingest_books(records, batch_size=2, bind=ingest_engine)
+        
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 2
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM sqlite_master WHERE type = 'trigger'") == triggers
+    
+    def test_duplicate_slug_in_batch_last_wins(self, ingest_engine):
+        """Test a slug repeated within a batch is counted and written once, from its last record"""
+        from database.ingest import ingest_books, synthetic_records
+        
+        records = list(synthetic_records(2, ["g"]))
+        report = ingest_books(records + [dict(records[0], title="Second")], bind=ingest_engine)
+        
+        assert (report.inserted, report.updated, report.summaries) == (2, 0, 2)
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 2
+        assert self._scalar(ingest_engine, "SELECT title FROM books WHERE slug = 'synthetic-book-0'") == "Second"
+        
+        updates = [dict(records[1], title="First"), dict(records[1], title="Last")]
+        report = ingest_books(updates, update_existing=True, bind=ingest_engine)
+        
+        assert report.updated == 1
+        assert self._scalar(ingest_engine, "SELECT title FROM books WHERE slug = 'synthetic-book-1'") == "Last"
+    
+    def test_failed_batch_leaves_existing_slugs(self, ingest_engine):
+        """Test a batch that fails does not record its slugs as existing"""
+        from sqlalchemy.exc import IntegrityError
+        from database.ingest import _ingest_batch, synthetic_records
+        
+        records = list(synthetic_records(2, ["g"]))
+        del records[1]["summary"]["overview_text"]
+        existing = set()
+        
+        with pytest.raises(IntegrityError):
+            with ingest_engine.begin() as conn:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                _ingest_batch(conn, records, existing, {"g": 1}, False)
+        
+        assert existing == set()
+    
+    def test_unknown_genre_raises(self, ingest_engine):
+        """Test records must name an existing genre"""
+        from database.ingest import ingest_books, synthetic_records
+        
+        with pytest.raises(ValueError):
+            ingest_books(synthetic_records(3, ["missing"]), bind=ingest_engine)
+        assert self._scalar(ingest_engine, "SELECT count(*) FROM books") == 0
+    
+    def test_statements_per_batch_not_per_book(self, ingest_engine):
+        """Test the statement count depends on batches, not books"""
+        from sqlalchemy import event
+        from database.ingest import ingest_books, synthetic_records
+        
+        def run(count, first):
+            statements = []
+            record = lambda *args: statements.append(args[2])
+            event.listen(ingest_engine, "before_cursor_execute", record)
+            try:
+                records = list(synthetic_records(first + count, ["g"]))[first:]
+                ingest_books(records, batch_size=count, bind=ingest_engine)
+            finally:
+                event.remove(ingest_engine, "before_cursor_execute", record)
+            return len(statements)
+        
+        assert run(5, 0) == run(50, 5)
+    
+    def test_upsert_genres_is_idempotent(self, ingest_engine):
+        """Test existing genres are kept and ids returned for all"""
+        from database.ingest import upsert_genres
+        
+        ids = upsert_genres([{"name": "G2", "slug": "g", "description": "changed"}], bind=ingest_engine)
+        
+        assert set(ids) == {"g", "h"}
+        assert self._scalar(ingest_engine, "SELECT description FROM genres WHERE slug = 'g'") == ""
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
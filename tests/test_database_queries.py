@@ -7,7 +7,7 @@ import pytest
 import sys
 import os
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime
+from datetime import date, datetime
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -175,6 +175,176 @@ class TestGetSummaryForBook:
         assert result is None
 
 
+def _count_statements(func, *args):
+    """Run func and return (result, number of SQL statements on the read engine)."""
+    from sqlalchemy import event
+    from database.connection import read_engine
+    
+    statements = []
+    
+    def count(conn, cursor, statement, *rest):
+        statements.append(statement)
+    
+    event.listen(read_engine, "before_cursor_execute", count)
+    try:
+        result = func(*args)
+    finally:
+        event.remove(read_engine, "before_cursor_execute", count)
+    return result, len(statements)
+
+
+class TestGetSummariesForBooks:
+    """Test get_summaries_for_books function"""
+    
+    def test_matches_single_lookups(self):
+        """Test that bulk summaries equal per-book lookups"""
+        from database.queries import get_all_books, get_summary_for_book, get_summaries_for_books
+        
+        books = get_all_books()
+        summaries = get_summaries_for_books(b.id for b in books)
+        for book in books:
+            assert summaries.get(book.id) == get_summary_for_book(book.id)
+    
+    def test_one_query_for_many_books(self):
+        """Test that a batch of books costs a single statement"""
+        from database.queries import get_all_books, get_summaries_for_books
+        
+        ids = [b.id for b in get_all_books()]
+        summaries, statements = _count_statements(get_summaries_for_books, ids)
+        assert summaries
+        assert statements == 1
+    
+    def test_batches_large_id_lists(self):
+        """Test that ids are split into SUMMARY_BATCH_SIZE queries"""
+        from database.queries import get_all_books, get_summaries_for_books
+        
+        ids = [b.id for b in get_all_books()]
+        with patch('database.queries.SUMMARY_BATCH_SIZE', 2):
+            summaries, statements = _count_statements(get_summaries_for_books, ids)
+        assert statements == (len(ids) + 1) // 2
+        assert summaries == get_summaries_for_books(ids)
+    
+    def test_empty_and_unknown_ids(self):
+        """Test that no ids issue no query and unknown ids are absent"""
+        from database.queries import get_summaries_for_books
+        
+        assert _count_statements(get_summaries_for_books, []) == ({}, 0)
+        assert get_summaries_for_books([-1]) == {}
+
+
+class TestLoadCatalogueSnapshot:
+    """Test load_catalogue_snapshot function"""
+    
+    def test_three_queries(self):
+        """Test that genres, books and summaries load in three statements"""
+        from database.queries import load_catalogue_snapshot, get_all_books, get_all_genres
+        
+        snapshot, statements = _count_statements(load_catalogue_snapshot)
+        assert statements == 3
+        assert list(snapshot.books) == get_all_books()
+        assert list(snapshot.genres) == get_all_genres()
+    
+    def test_books_share_genre_views(self):
+        """Test that books reference the snapshot's genre instances"""
+        from database.queries import load_catalogue_snapshot
+        
+        snapshot = load_catalogue_snapshot()
+        genre_ids = {id(g) for g in snapshot.genres}
+        assert all(id(b.genre) in genre_ids for b in snapshot.books)
+    
+    def test_summaries_are_read_only(self):
+        """Test that summaries map book ids and cannot be modified"""
+        from database.queries import load_catalogue_snapshot, get_summary_for_book
+        
+        snapshot = load_catalogue_snapshot()
+        book_id, summary = next(iter(snapshot.summaries.items()))
+        assert summary == get_summary_for_book(book_id)
+        with pytest.raises(TypeError):
+            snapshot.summaries[book_id] = None
+    
+    def test_features_load_without_per_book_queries(self):
+        """Test that a cold catalogue features load only reads the data version"""
+        import services.recommendation_features as rf
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books
+        
+        books = get_all_books()
+        engine = RecommendationEngine()
+        with patch.multiple(rf, _features_key=None, _features=None):
+            features, statements = _count_statements(engine.get_catalogue_features, books)
+        assert len(features) == len(books)
+        assert statements == 1
+
+
+class TestCatalogueSnapshotCache:
+    """Test the process-wide catalogue snapshot"""
+    
+    def test_warm_reads_cost_one_statement(self):
+        """Test that a warm lookup only reads the data version"""
+        from database.queries import get_all_books, get_book_by_slug
+        
+        book = get_all_books()[0]
+        result, statements = _count_statements(get_book_by_slug, book.slug)
+        assert result is book
+        assert statements == 1
+    
+    def test_lookups_match_indexes(self):
+        """Test that id, slug, genre and author lookups agree with the book list"""
+        from database.queries import (
+            get_all_books, get_books_by_author, get_books_by_genre, get_catalogue_snapshot
+        )
+        
+        snapshot = get_catalogue_snapshot()
+        books = get_all_books()
+        for book in books:
+            assert snapshot.books_by_id[book.id] is book
+            assert snapshot.books_by_slug[book.slug] is book
+            assert book in get_books_by_author(book.author.upper())
+        for genre in snapshot.genres:
+            assert get_books_by_genre(genre.slug) == [b for b in books if b.genre_id == genre.id]
+    
+    def test_write_invalidates_snapshot(self):
+        """Test that an edit bumps the data version and is visible immediately"""
+        from database.connection import get_db_session
+        from database.data_version import get_data_version
+        from database.models import Genre
+        from database.queries import get_all_genres, get_genre_by_slug
+        
+        genre = get_all_genres()[0]
+        before = get_data_version()
+        try:
+            with get_db_session() as session:
+                session.get(Genre, genre.id).description = genre.description + " (edited)"
+            assert get_data_version()[1] > before[1]
+            assert get_genre_by_slug(genre.slug).description.endswith("(edited)")
+        finally:
+            with get_db_session() as session:
+                session.get(Genre, genre.id).description = genre.description
+        assert get_genre_by_slug(genre.slug).description == genre.description
+    
+    def test_triggers_on_new_database(self, tmp_path):
+        """Test that a fresh database starts at version 0 and counts catalogue writes"""
+        from sqlalchemy import text
+        from database.connection import EngineConfig, create_sqlite_engine
+        from database.data_version import ensure_data_version
+        from database.models import Base
+        
+        new_engine = create_sqlite_engine(tmp_path / "version.db", EngineConfig())
+        Base.metadata.create_all(bind=new_engine)
+        ensure_data_version(new_engine)
+        ensure_data_version(new_engine)
+        read = lambda: conn.execute(text("SELECT epoch, version FROM data_version")).all()
+        with new_engine.begin() as conn:
+            [(epoch, version)] = read()
+            assert version == 0 and len(epoch) == 32
+            conn.execute(text("INSERT INTO genres (name, slug, description, icon) VALUES ('G', 'g', '', '')"))
+            conn.execute(text("UPDATE genres SET name = 'H'"))
+            conn.execute(text("DELETE FROM genres"))
+            conn.execute(text("INSERT INTO passage_index (book_id, passage_count) VALUES (1, 0)"))
+            assert read() == [(epoch, 3)]
+        new_engine.dispose()
+
+
 class TestGetFeaturedBooks:
     """Test get_featured_books function"""
     
@@ -261,6 +431,161 @@ class TestSearchBooks:
         assert isinstance(result, list)
 
 
+class TestFullTextSearch:
+    """Test the FTS5 search index"""
+    
+    def test_match_query_strips_fts_syntax(self):
+        """Test user input is reduced to quoted prefix terms"""
+        from database.search import build_match_query
+        
+        assert build_match_query('habit" OR title:*') == '"habit"* "or"* "title"*'
+        assert build_match_query("  ") == ""
+    
+    def test_finds_summary_text(self):
+        """Test search matches words that only appear in summary text"""
+        from database.search import search_catalog
+        
+        hits = search_catalog("Cognitive Agricultural")
+        titles = [h.book.title for h in hits]
+        assert "Sapiens" in titles
+    
+    def test_prefix_matching(self):
+        """Test partial words match"""
+        from database.search import search_catalog
+        
+        hits = search_catalog("stoi")
+        assert any("Stoic" in h.book.title for h in hits)
+    
+    def test_results_ranked_by_bm25(self):
+        """Test hits are returned best score first"""
+        from database.search import search_catalog
+        
+        hits = search_catalog("habit")
+        scores = [h.score for h in hits]
+        assert scores == sorted(scores)
+        assert "Habit" in hits[0].book.title
+    
+    def test_snippet_highlights_match(self):
+        """Test snippets mark matched terms and escape HTML"""
+        from database.search import search_catalog, SNIPPET_OPEN
+        
+        hits = search_catalog("habit")
+        assert hits
+        assert SNIPPET_OPEN in hits[0].snippet
+        assert "\x02" not in hits[0].snippet
+    
+    def test_triggers_keep_index_in_sync(self):
+        """Test inserted, updated and deleted books are reflected in search"""
+        from database.connection import get_db_session
+        from database.models import Genre, Book, Summary
+        from database.search import search_catalog
+        
+        with get_db_session() as session:
+            genre = session.query(Genre).first()
+            book = Book(title="Zyzzyva Field Guide", author="Test Author", slug="zyzzyva-field-guide", genre=genre)
+            session.add(book)
+            session.flush()
+            session.add(Summary(
+                book_id=book.id, overview_text="Quixotic xylophones", main_content="",
+                key_takeaways='[{"title": "Wombat", "text": "Burrowing"}]', who_should_read=""
+            ))
+            book_id = book.id
+        
+        try:
+            assert [h.book.id for h in search_catalog("quixotic")] == [book_id]
+            assert [h.book.id for h in search_catalog("wombat")] == [book_id]
+            
+            with get_db_session() as session:
+                session.get(Book, book_id).title = "Aardvark Field Guide"
+            assert search_catalog("zyzzyva") == []
+            assert [h.book.id for h in search_catalog("aardvark")] == [book_id]
+        finally:
+            with get_db_session() as session:
+                session.query(Summary).filter(Summary.book_id == book_id).delete()
+                session.query(Book).filter(Book.id == book_id).delete()
+        
+        assert search_catalog("quixotic") == []
+
+
+class TestReadModels:
+    """Test frozen read-model views returned by query functions"""
+    
+    def test_books_are_frozen_views(self):
+        """Test get_all_books returns immutable BookView instances"""
+        import dataclasses
+        from database.queries import get_all_books
+        from database.views import BookView, GenreView
+        
+        books = get_all_books(limit=5)
+        assert books and all(isinstance(b, BookView) for b in books)
+        assert isinstance(books[0].genre, GenreView)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            books[0].title = "Changed"
+    
+    def test_views_have_no_instance_dict(self):
+        """Test views use __slots__ rather than a per-instance dict"""
+        from database.queries import get_all_books
+        
+        book = get_all_books(limit=1)[0]
+        assert not hasattr(book, "__dict__")
+        assert not hasattr(book, "_sa_instance_state")
+    
+    def test_genre_view_shared_between_books(self):
+        """Test books in the same genre share one GenreView"""
+        from database.queries import get_all_books
+        
+        by_genre = {}
+        for book in get_all_books():
+            by_genre.setdefault(book.genre_id, []).append(book.genre)
+        for genres in by_genre.values():
+            assert all(g is genres[0] for g in genres)
+    
+    def test_views_pickle_round_trip(self):
+        """Test views survive the pickling done by st.cache_data"""
+        import pickle
+        from database.queries import get_book_by_slug, get_summary_for_book
+        
+        book = get_book_by_slug("atomic-habits")
+        summary = get_summary_for_book(book.id)
+        restored_book, restored_summary = pickle.loads(pickle.dumps((book, summary)))
+        assert restored_book == book
+        assert restored_book.genre.slug == book.genre.slug
+        assert restored_summary.key_takeaways == summary.key_takeaways
+    
+    def test_summary_view_lists_are_immutable(self):
+        """Test list fields of a shared SummaryView cannot be mutated"""
+        import json
+        from database.queries import get_book_by_slug, get_summary_for_book
+    
+        summary = get_summary_for_book(get_book_by_slug("atomic-habits").id)
+        assert isinstance(summary.key_takeaways, tuple)
+        assert isinstance(summary.quotes, tuple)
+        with pytest.raises(TypeError):
+            summary.key_takeaways[0]["title"] = "Changed"
+        with pytest.raises(AttributeError):
+            summary.quotes.append("Changed")
+        assert json.loads(json.dumps(summary.key_takeaways))[0]["title"] == summary.key_takeaways[0]["title"]
+    
+    def test_view_columns_match_models(self):
+        """Test every mapped column of Book and Genre is exposed on the views"""
+        from database.models import Book, Genre
+        from database.views import BookView, GenreView
+        
+        book_fields = set(BookView.__dataclass_fields__)
+        genre_fields = set(GenreView.__dataclass_fields__)
+        assert {c.name for c in Book.__table__.columns} <= book_fields
+        assert {c.name for c in Genre.__table__.columns} - {"created_at", "updated_at"} <= genre_fields
+    
+    def test_cover_url_fallback(self):
+        """Test BookView.get_cover_url mirrors Book.get_cover_url"""
+        from database.queries import get_all_books
+        
+        book = get_all_books(limit=1)[0]
+        assert book.get_cover_url() == (
+            book.cover_image_url or book.cover_image_fallback or "/assets/images/placeholder.png"
+        )
+
+
 class TestGetAllBooks:
     """Test get_all_books function"""
     
@@ -297,6 +622,162 @@ class TestGetAllBooks:
             assert hasattr(book, 'slug')
 
 
+class TestKeysetPagination:
+    """Test keyset-paginated genre queries"""
+    
+    def test_pages_cover_genre_in_order(self):
+        """Test walking every page yields the full genre in (title, id) order"""
+        from database.queries import get_books_by_genre, get_books_by_genre_page, get_genre_page_index
+        
+        slug = "self-help"
+        total, cursors = get_genre_page_index(slug, 2)
+        seen = []
+        for page in range(len(cursors) + 1):
+            after = cursors[page - 1] if page else None
+            seen.extend(get_books_by_genre_page(slug, 2, after))
+        expected = sorted(get_books_by_genre(slug), key=lambda b: (b.title, b.id))
+        assert total == len(expected)
+        assert [b.id for b in seen] == [b.id for b in expected]
+    
+    def test_cursor_is_last_book_of_page(self):
+        """Test each cursor matches the last book of the preceding page"""
+        from database.queries import get_books_by_genre_page, get_genre_page_index
+        
+        total, cursors = get_genre_page_index("business", 3)
+        assert len(cursors) == total // 3
+        first_page = get_books_by_genre_page("business", 3)
+        assert cursors[0] == (first_page[-1].title, first_page[-1].id)
+    
+    def test_unknown_genre(self):
+        """Test pagination of an unknown genre is empty"""
+        from database.queries import get_books_by_genre_page, get_genre_page_index
+        
+        assert get_genre_page_index("no-such-genre", 12) == (0, [])
+        assert get_books_by_genre_page("no-such-genre") == []
+    
+    def test_page_query_uses_index(self):
+        """Test the page seek is served by the (genre_id, title, id) index"""
+        from database.connection import read_engine
+        from database.queries import genre_page_query
+        
+        query = genre_page_query("business", 12, ("M", 1))
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+        with read_engine.connect() as conn:
+            plan = " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "ix_books_genre_title" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def _python_filter(book_filter):
+    """Reference result of a BookFilter computed in Python from the snapshot."""
+    from database.queries import READING_TIME_BUCKETS, get_catalogue_snapshot, get_summaries_for_books
+    
+    snapshot = get_catalogue_snapshot()
+    summaries = get_summaries_for_books([book.id for book in snapshot.books])
+    matches = []
+    for book in snapshot.books:
+        summary = summaries.get(book.id)
+        if book_filter.needs_summary and summary is None:
+            continue
+        if book_filter.genre_slug and book.genre.slug != book_filter.genre_slug:
+            continue
+        if book_filter.year is not None and book.publication_year != book_filter.year:
+            continue
+        if book_filter.reading_time:
+            low, high = READING_TIME_BUCKETS[book_filter.reading_time]
+            if summary.reading_time is None:
+                continue
+            if (low is not None and summary.reading_time < low) or (high is not None and summary.reading_time > high):
+                continue
+        if book_filter.difficulty and summary.difficulty != book_filter.difficulty:
+            continue
+        if book_filter.min_rating is not None and (summary.rating is None or summary.rating < book_filter.min_rating):
+            continue
+        matches.append(book)
+    return matches, summaries
+
+
+class TestBookFilter:
+    """Test the BookFilter query builder"""
+    
+    @pytest.mark.parametrize("fields", [
+        {},
+        {"genre_slug": "business"},
+        {"reading_time": "10_15"},
+        {"difficulty": "Beginner"},
+        {"difficulty": "Intermediate", "min_rating": 4.0},
+        {"genre_slug": "self-help", "reading_time": "16_20"},
+    ])
+    def test_matches_python_filter(self, fields):
+        """Test the SQL filter selects the same (non-empty) books as filtering in Python"""
+        from database.queries import BookFilter, get_filtered_books, count_filtered_books
+        
+        book_filter = BookFilter(**fields)
+        expected, _ = _python_filter(book_filter)
+        assert expected, "case must match some books to compare anything"
+        result = get_filtered_books(book_filter, limit=10_000)
+        assert count_filtered_books(book_filter) == len(expected)
+        assert [b.id for b in result] == [b.id for b in expected]
+    
+    def test_year_filter(self):
+        """Test filtering by publication year"""
+        from database.queries import BookFilter, get_filtered_books, get_catalogue_snapshot
+        
+        year = next(b.publication_year for b in get_catalogue_snapshot().books if b.publication_year)
+        result = get_filtered_books(BookFilter(year=year), limit=10_000)
+        assert result
+        assert all(b.publication_year == year for b in result)
+    
+    def test_rating_sort(self):
+        """Test the rating sort orders books by summary rating, best first"""
+        from database.queries import BookFilter, get_filtered_books
+        
+        book_filter = BookFilter(sort="rating")
+        expected, summaries = _python_filter(book_filter)
+        expected.sort(key=lambda b: (-(summaries[b.id].rating or float("-inf")), b.title, b.id))
+        result = get_filtered_books(book_filter, limit=10_000)
+        assert [b.id for b in result] == [b.id for b in expected]
+    
+    def test_reading_time_buckets_partition_summaries(self):
+        """Test every summary with a reading time falls in exactly one bucket"""
+        from database.queries import READING_TIME_BUCKETS, BookFilter, count_filtered_books
+        
+        _, summaries = _python_filter(BookFilter())
+        timed = sum(1 for summary in summaries.values() if summary.reading_time is not None)
+        assert sum(count_filtered_books(BookFilter(reading_time=key)) for key in READING_TIME_BUCKETS) == timed
+    
+    def test_pages_are_single_statements(self):
+        """Test each page is one query and consecutive pages do not overlap"""
+        from database.queries import BookFilter, get_filtered_books
+        
+        book_filter = BookFilter(sort="newest")
+        first, count = _count_statements(get_filtered_books, book_filter, 5)
+        second = get_filtered_books(book_filter, 5, 5)
+        assert count == 1
+        assert len(first) == 5
+        assert not {b.id for b in first} & {b.id for b in second}
+        assert [b.id for b in first + second] == [b.id for b in get_filtered_books(book_filter, 10)]
+    
+    def test_where_returns_modified_copy(self):
+        """Test where() composes without changing the original"""
+        from database.queries import BookFilter
+        
+        base = BookFilter(genre_slug="business")
+        rated = base.where(sort="rating", min_rating=4.0)
+        assert base.sort == "title" and base.min_rating is None
+        assert rated.genre_slug == "business" and rated.sort == "rating"
+        assert base.is_default and not rated.is_default
+    
+    def test_unknown_keys_raise(self):
+        """Test unknown reading-time buckets and sorts are rejected"""
+        from database.queries import BookFilter
+        
+        with pytest.raises(ValueError):
+            BookFilter(reading_time="forever")
+        with pytest.raises(ValueError):
+            BookFilter(sort="popularity")
+
+
 class TestCountFunctions:
     """Test count functions"""
     
@@ -333,6 +814,84 @@ class TestCountFunctions:
         assert count == len(books)
 
 
+class TestGetGenreStats:
+    """Test get_genre_stats aggregate query"""
+    
+    def test_counts_match_books_by_genre(self):
+        """Test per-genre counts match get_books_by_genre"""
+        from database.queries import get_genre_stats, get_books_by_genre
+        
+        for stats in get_genre_stats():
+            assert stats.book_count == len(get_books_by_genre(stats.genre.slug))
+    
+    def test_totals_match_catalogue(self):
+        """Test counts and reading time add up across genres"""
+        from database.connection import get_db_session
+        from database.models import Genre, Summary
+        from database.queries import get_genre_stats, get_books_count
+        
+        stats = get_genre_stats()
+        with get_db_session() as session:
+            assert len(stats) == session.query(Genre).count()
+            total_time = sum(s.reading_time or 0 for s in session.query(Summary).all())
+        assert sum(s.book_count for s in stats) == get_books_count()
+        assert sum(s.total_reading_time for s in stats) == total_time
+    
+    def test_average_rating(self):
+        """Test avg_rating matches a Python average over the genre's summaries"""
+        from database.connection import get_db_session
+        from database.models import Book, Summary
+        from database.queries import get_genre_stats
+        
+        stats = get_genre_stats()[0]
+        with get_db_session() as session:
+            ratings = [
+                s.rating for s in session.query(Summary).join(Book).filter(Book.genre_id == stats.genre.id)
+            ]
+        assert stats.summary_count == len(ratings)
+        assert stats.avg_rating == pytest.approx(sum(ratings) / len(ratings))
+    
+    def test_single_query(self):
+        """Test stats are computed in one SQL statement after the version read"""
+        from sqlalchemy import event
+        import database.queries as q
+        from database.connection import read_engine
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(read_engine, "before_cursor_execute", listener)
+        try:
+            with patch.object(q, "_genre_stats", None):
+                q.get_genre_stats()
+        finally:
+            event.remove(read_engine, "before_cursor_execute", listener)
+        assert len(statements) == 2
+        assert "data_version" in statements[0]
+        assert "GROUP BY" in statements[1]
+    
+    def test_reused_until_data_changes(self):
+        """Test a warm call only reads the version and a write is seen at once"""
+        from database.connection import get_db_session
+        from database.models import Book
+        from database.queries import get_genre_stats
+        
+        stats = get_genre_stats()
+        _, statements = _count_statements(get_genre_stats)
+        assert statements == 1
+        
+        source, target = stats[0].genre.id, stats[-1].genre.id
+        with get_db_session() as session:
+            book = session.query(Book).filter_by(genre_id=source).first()
+            book_id, book.genre_id = book.id, target
+        try:
+            counts = {s.genre.id: s.book_count for s in get_genre_stats()}
+            assert counts[source] == stats[0].book_count - 1
+            assert counts[target] == stats[-1].book_count + 1
+        finally:
+            with get_db_session() as session:
+                session.get(Book, book_id).genre_id = source
+
+
 class TestGetRandomBook:
     """Test get_random_book function"""
     
@@ -368,6 +927,73 @@ class TestGetRandomBook:
         
         # Should have at least 2 different books (probabilistic)
         assert len(book_ids) >= 1
+    
+    def test_single_statement_reaches_every_book(self):
+        """Test that each pick is one statement and every book can be drawn"""
+        from database.queries import get_all_books, get_random_book
+        
+        book, statements = _count_statements(get_random_book)
+        assert book is not None
+        assert statements == 1
+        
+        ids = {b.id for b in get_all_books()}
+        drawn = {get_random_book().id for _ in range(50 * len(ids))}
+        assert drawn == ids
+
+
+class TestGetDailyPick:
+    """Test get_daily_pick function"""
+    
+    DAY = date(2001, 2, 3)
+    
+    def teardown_method(self):
+        from database.connection import get_db_session
+        from database.models import DailyPick
+        
+        with get_db_session() as session:
+            session.query(DailyPick).filter(DailyPick.day == self.DAY).delete()
+    
+    def test_pick_is_stored_for_the_day(self):
+        """Test that the first pick is one insert and is reused with one statement"""
+        from sqlalchemy import event
+        from database.connection import engine
+        from database.queries import get_daily_pick
+        
+        writes = []
+        record = lambda *args: writes.append(args[2])
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            first, reads = _count_statements(get_daily_pick, self.DAY)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        again, statements = _count_statements(get_daily_pick, self.DAY)
+        assert first is not None
+        assert again == first
+        assert reads == 2
+        assert [w.split()[0] for w in writes] == ["INSERT"]
+        assert statements == 1
+    
+    def test_deleted_book_is_replaced(self):
+        """Test that a stored pick whose book is gone is drawn again"""
+        from database.connection import get_db_session
+        from database.models import DailyPick
+        from database.queries import get_daily_pick
+        
+        get_daily_pick(self.DAY)
+        with get_db_session() as session:
+            session.get(DailyPick, self.DAY).book_id = -1
+        
+        book = get_daily_pick(self.DAY)
+        assert book is not None
+        with get_db_session() as session:
+            assert session.get(DailyPick, self.DAY).book_id == book.id
+    
+    def test_book_of_the_day_uses_daily_pick(self):
+        """Test that the Book of the Day component shows today's pick"""
+        from components.book_of_day import get_book_of_the_day
+        from database.queries import get_daily_pick
+        
+        assert get_book_of_the_day() == get_daily_pick()
 
 
 class TestGetTopRatedBooks:
@@ -232,6 +232,40 @@ class TestPaginateItems:
         assert first_page[-1] == 9
 
 
+class TestPaginateKeyset:
+    """Test paginate_keyset function"""
+    
+    def test_fetches_only_current_page(self):
+        """Test paginate_keyset passes the right cursor and page size"""
+        from components.pagination import paginate_keyset, PaginationConfig
+        
+        calls = []
+        fake_state = {"pagination_kp": {"current_page": 3, "items_per_page": 10}}
+        with patch("components.pagination.st.session_state", fake_state):
+            items, page, total_pages, total = paginate_keyset(
+                "kp",
+                page_index=lambda size: (25, ["c10", "c20"]),
+                fetch_page=lambda after, size: calls.append((after, size)) or ["x"] * 5,
+                config=PaginationConfig(items_per_page=10),
+            )
+        assert calls == [("c20", 10)]
+        assert (len(items), page, total_pages, total) == (5, 3, 3, 25)
+    
+    def test_clamps_page_and_skips_empty(self):
+        """Test out-of-range pages are clamped and empty results skip the fetch"""
+        from components.pagination import paginate_keyset
+        
+        fake_state = {"pagination_kp": {"current_page": 9, "items_per_page": 12}}
+        with patch("components.pagination.st.session_state", fake_state):
+            items, page, total_pages, total = paginate_keyset(
+                "kp",
+                page_index=lambda size: (0, []),
+                fetch_page=lambda after, size: pytest.fail("should not fetch"),
+            )
+        assert (items, page, total_pages, total) == ([], 1, 1, 0)
+        assert fake_state["pagination_kp"]["current_page"] == 1
+
+
 class TestGetPaginationState:
     """Test get_pagination_state function"""
     
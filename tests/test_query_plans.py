@@ -0,0 +1,189 @@
+"""
+Query Plan Regression Tests
+Runs EXPLAIN QUERY PLAN on every statement issued by the functions in
+database/queries.py and fails on full table scans of the books table.
+"""
+
+import pytest
+import sys
+import os
+import re
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# How to exercise each public function of database.queries, given a sample
+CALLS = {
+    "get_all_genres": lambda q, s: q.get_all_genres(),
+    "get_genre_stats": lambda q, s: (setattr(q, "_genre_stats", None), q.get_genre_stats()),
+    "get_genre_by_slug": lambda q, s: q.get_genre_by_slug(s.genre_slug),
+    "get_books_by_genre": lambda q, s: q.get_books_by_genre(s.genre_slug, limit=4),
+    "genre_page_query": lambda q, s: s.execute(q.genre_page_query(s.genre_slug, 12, s.cursor)),
+    "get_books_by_genre_page": lambda q, s: q.get_books_by_genre_page(s.genre_slug, 12, s.cursor),
+    "get_genre_page_index": lambda q, s: q.get_genre_page_index(s.genre_slug, 2),
+    "filtered_books_query": lambda q, s: s.execute(q.filtered_books_query(q.BookFilter(), 12, 24)),
+    "get_filtered_books": lambda q, s: q.get_filtered_books(
+        q.BookFilter(genre_slug=s.genre_slug, min_rating=4.0, sort="rating")
+    ),
+    "count_filtered_books": lambda q, s: q.count_filtered_books(
+        q.BookFilter(reading_time="10_15", difficulty="Beginner")
+    ),
+    "get_book_by_slug": lambda q, s: q.get_book_by_slug(s.book_slug),
+    "get_summary_for_book": lambda q, s: q.get_summary_for_book(s.book_id),
+    "get_summaries_for_books": lambda q, s: q.get_summaries_for_books([s.book_id, s.book_id + 1]),
+    "load_catalogue_snapshot": lambda q, s: q.load_catalogue_snapshot(),
+    "get_catalogue_snapshot": lambda q, s: q.get_catalogue_snapshot(),
+    "get_images_for_summary": lambda q, s: q.get_images_for_summary(s.summary_id),
+    "get_featured_books": lambda q, s: q.get_featured_books(),
+    "search_books": lambda q, s: q.search_books("habits"),
+    "get_all_books": lambda q, s: q.get_all_books(limit=5),
+    "get_books_by_author": lambda q, s: q.get_books_by_author(s.author),
+    "get_books_count": lambda q, s: q.get_books_count(),
+    "get_genres_count": lambda q, s: q.get_genres_count(),
+    "get_summaries_count": lambda q, s: q.get_summaries_count(),
+    "random_book_query": lambda q, s: s.execute(q.random_book_query()),
+    "get_random_book": lambda q, s: q.get_random_book(),
+    "get_daily_pick": lambda q, s: q.get_daily_pick(),
+    "get_top_rated_books": lambda q, s: q.get_top_rated_books(),
+    "get_recent_books": lambda q, s: q.get_recent_books(),
+}
+
+# Functions allowed to scan books, and why
+ALLOWED_SCANS = {
+    "load_catalogue_snapshot": "loads the whole catalogue by design",
+}
+
+# A bare table scan; "SCAN books USING [COVERING] INDEX ..." walks an index instead
+BOOKS_SCAN = re.compile(r"^SCAN books\b(?! USING (COVERING )?INDEX)")
+
+
+def _public_query_functions():
+    """Names of the public callables defined in database.queries."""
+    import database.queries as queries
+    
+    return sorted(
+        name for name, obj in vars(queries).items()
+        if callable(obj) and not name.startswith("_")
+        and getattr(obj, "__module__", None) == "database.queries"
+        and not isinstance(obj, type)
+    )
+
+
+def _capture(func):
+    """Run func and return the (statement, parameters) it sent to either engine."""
+    from sqlalchemy import event
+    from database.connection import engine, read_engine
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    engines = {engine, read_engine}
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        func()
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+    return statements
+
+
+def _plan(statement, parameters):
+    """EXPLAIN QUERY PLAN detail lines for a statement."""
+    from database.connection import read_engine
+    
+    with read_engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.fixture(scope="module")
+def sample():
+    """Real ids and slugs to query with, and a warm catalogue snapshot."""
+    from database.connection import get_read_session, migrate_indexes
+    from database.models import SummaryImage
+    from database.queries import get_catalogue_snapshot
+    
+    migrate_indexes()
+    snapshot = get_catalogue_snapshot()
+    book = snapshot.books[len(snapshot.books) // 2]
+    with get_read_session() as session:
+        summary_id = session.query(SummaryImage.summary_id).limit(1).scalar() or 1
+    
+    def execute(query):
+        with get_read_session() as session:
+            return session.execute(query).all()
+    
+    return SimpleNamespace(
+        book_id=book.id,
+        book_slug=book.slug,
+        author=book.author,
+        genre_slug=book.genre.slug,
+        cursor=(book.title, book.id),
+        summary_id=summary_id,
+        execute=execute,
+    )
+
+
+class TestQueryPlanCoverage:
+    """Test that the plan suite covers database.queries"""
+    
+    def test_every_query_function_is_exercised(self):
+        """Test that each public query function has an entry in CALLS"""
+        assert _public_query_functions() == sorted(CALLS)
+    
+    def test_allowed_scans_are_query_functions(self):
+        """Test that the allow-list only names existing functions"""
+        assert set(ALLOWED_SCANS) <= set(CALLS)
+
+
+class TestQueryPlans:
+    """Test query plans of every function in database.queries"""
+    
+    @pytest.mark.parametrize("name", sorted(CALLS))
+    def test_no_full_scan_of_books(self, name, sample):
+        """Test that the function never scans the books table without an index"""
+        import database.queries as queries
+        
+        statements = _capture(lambda: CALLS[name](queries, sample))
+        assert statements, f"{name} issued no SQL"
+        
+        scans = [
+            (statement, detail)
+            for statement, parameters in statements
+            for detail in _plan(statement, parameters)
+            if BOOKS_SCAN.match(detail)
+        ]
+        if name in ALLOWED_SCANS:
+            return
+        assert not scans, f"{name} scans books: {scans}"
+    
+    @pytest.mark.parametrize("index, query", [
+        ("ix_books_featured_title", "SELECT id FROM books WHERE is_featured = 1 ORDER BY title LIMIT 8"),
+        ("ix_books_created_at", "SELECT id FROM books ORDER BY created_at DESC LIMIT 6"),
+        ("ix_books_publication_year", "SELECT DISTINCT publication_year FROM books"),
+        ("ix_books_genre_title", "SELECT id FROM books WHERE genre_id = 1"),
+        ("ix_books_title", "SELECT id FROM books ORDER BY title, id LIMIT 12"),
+        ("ix_summaries_rating", "SELECT book_id FROM summaries ORDER BY rating DESC LIMIT 6"),
+        ("ix_summaries_reading_time", "SELECT book_id FROM summaries WHERE reading_time BETWEEN 10 AND 15"),
+        ("ix_summaries_difficulty", "SELECT book_id FROM summaries WHERE difficulty = 'beginner'"),
+        ("ix_summary_images_summary_order",
+         'SELECT id FROM summary_images WHERE summary_id = 1 ORDER BY "order"'),
+    ])
+    def test_index_is_used(self, index, query, sample):
+        """Test that each access pattern is served by its index"""
+        assert any(index in detail for detail in _plan(query, ()))
+    
+    def test_filter_options_only_read_data_version(self, sample):
+        """Test that warm get_filter_options is served from the facet index"""
+        from components.filters import get_filter_options
+        
+        get_filter_options()
+        statements = _capture(get_filter_options)
+        assert [statement for statement, parameters in statements] == [
+            "SELECT epoch, version FROM data_version WHERE id = 1"
+        ]
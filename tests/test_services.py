@@ -299,7 +299,7 @@ class TestDatabaseIntegration:
         print("✅ Database: Summary has all required fields")
     
     def test_takeaways_json_format(self):
-        """Test that takeaways are valid JSON"""
+        """Test that takeaways decode to a tuple of title/text mappings"""
         from database.queries import get_all_books, get_summary_for_book
         
         books = get_all_books()
@@ -311,14 +311,14 @@ class TestDatabaseIntegration:
             return
         
         if summary.key_takeaways:
-            takeaways = json.loads(summary.key_takeaways)
-            assert isinstance(takeaways, list)
+            takeaways = summary.key_takeaways
+            assert isinstance(takeaways, tuple)
             
             if takeaways:
                 assert "title" in takeaways[0]
                 assert "text" in takeaways[0]
         
-        print("✅ Database: Takeaways are valid JSON format")
+        print("✅ Database: Takeaways decode to a valid list")
     
     def test_biography_content_quality(self):
         """Test biography books have quality content"""
@@ -338,7 +338,7 @@ class TestDatabaseIntegration:
         for book in bio_books:
             summary = db.query(Summary).filter(Summary.book_id == book.id).first()
             if summary and summary.key_takeaways:
-                takeaways = json.loads(summary.key_takeaways)
+                takeaways = summary.key_takeaways
                 if takeaways:
                     # Check content is not placeholder
                     text = takeaways[0].get("text", "")
@@ -191,6 +191,343 @@ class TestAIServiceWithMocking:
             assert callable(getattr(service, method))
 
 
+class TestAIStreaming:
+    """Test streaming chat with an offline model client"""
+    
+    def test_stream_yields_chunks(self):
+        """Test stream_chat_with_book yields the answer incrementally"""
+        from services.ai_service import AIService, FakeStreamingModel
+        
+        service = AIService(model=FakeStreamingModel(reply="Habits compound over time."), use_cache=False)
+        chunks = list(service.stream_chat_with_book("Why habits?", {"title": "Atomic Habits"}))
+        
+        assert chunks == ["Habits ", "compound ", "over ", "time."]
+    
+    def test_prompt_contains_context_and_history(self):
+        """Test the streamed request carries book context, history and question"""
+        from services.ai_service import AIService, ChatMessage, FakeStreamingModel
+        
+        model = FakeStreamingModel()
+        service = AIService(model=model, use_cache=False)
+        history = [ChatMessage(role="user", content="Earlier question")]
+        answer = service.chat_with_book("What is the main idea?", {"title": "Deep Work"}, history)
+        
+        assert answer == "This is an offline answer to: What is the main idea?"
+        assert "BOOK TITLE: Deep Work" in model.prompts[0]
+        assert "USER: Earlier question" in model.prompts[0]
+    
+    def test_first_chunk_arrives_before_full_answer(self):
+        """Test time-to-first-chunk is one chunk, not the whole answer"""
+        import time
+        from services.ai_service import AIService, FakeStreamingModel
+        
+        service = AIService(model=FakeStreamingModel(reply="one two three four five", delay=0.05), use_cache=False)
+        start = time.perf_counter()
+        stream = service.stream_chat_with_book("q", {})
+        next(stream)
+        first = time.perf_counter() - start
+        list(stream)
+        total = time.perf_counter() - start
+        
+        assert first < 0.15
+        assert total >= 0.25
+    
+    def test_error_mid_stream_keeps_partial_answer(self):
+        """Test a failure after some chunks appends an error instead of raising"""
+        from services.ai_service import AIService, ModelChunk
+        
+        class BrokenModel:
+            def generate_content(self, prompt, stream=False):
+                yield ModelChunk(text="Partial ")
+                raise RuntimeError("connection reset")
+        
+        answer = AIService(model=BrokenModel(), use_cache=False).chat_with_book("q", {})
+        
+        assert answer.startswith("Partial ")
+        assert "connection reset" in answer
+    
+    def test_unavailable_without_key_or_model(self, monkeypatch):
+        """Test the service reports unavailable instead of raising without secrets"""
+        from services.ai_service import AIService, UNAVAILABLE_MESSAGE
+        
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        service = AIService()
+        
+        assert not service.is_available()
+        assert list(service.stream_chat_with_book("q", {})) == [UNAVAILABLE_MESSAGE]
+    
+    def test_chat_component_streams_response(self):
+        """Test render_ai_chat writes the streamed answer into the history"""
+        from streamlit.testing.v1 import AppTest
+        
+        def app():
+            import streamlit as st
+            from services.ai_service import AIService, FakeStreamingModel
+            from components.ai_chat import render_ai_chat
+            
+            if "ai_service" not in st.session_state:
+                st.session_state.ai_service = AIService(
+                    model=FakeStreamingModel(reply="Start small."), use_cache=False
+                )
+            render_ai_chat({"title": "Atomic Habits"}, "atomic-habits")
+        
+        at = AppTest.from_function(app).run()
+        at.button(key="quick_1_atomic-habits").click().run()
+        
+        history = at.session_state.book_chats["atomic-habits"]
+        assert [(m.role, m.content) for m in history] == [
+            ("user", "Key takeaways"), ("assistant", "Start small.")
+        ]
+        assert any("Start small." in m.value for m in at.markdown)
+
+
+class TestResponseCache:
+    """Test persistent AI response cache"""
+    
+    @pytest.fixture(autouse=True)
+    def new_rows_removed(self):
+        """Delete cache rows created by each test"""
+        from database.connection import get_db_session
+        from database.models import AIResponse
+        from services.response_cache import ensure_response_cache_table
+        
+        ensure_response_cache_table()
+        with get_db_session() as session:
+            existing = {key for (key,) in session.query(AIResponse.key)}
+        yield
+        with get_db_session() as session:
+            session.query(AIResponse).filter(~AIResponse.key.in_(existing)).delete(synchronize_session=False)
+    
+    @pytest.fixture
+    def book_data(self):
+        """Book data with a unique title so keys never collide across runs"""
+        import uuid
+        return {"title": f"Cache Test {uuid.uuid4().hex}", "author": "Test Author"}
+    
+    def test_key_normalizes_question(self, monkeypatch):
+        """Test keys ignore case/spacing/punctuation but track version and context"""
+        import services.response_cache as cache
+        
+        key = cache.make_key("chat", "ctx", "What is the main idea?")
+        assert key == cache.make_key("chat", "ctx", "  what is  the MAIN idea ")
+        assert key != cache.make_key("chat", "other ctx", "What is the main idea?")
+        assert key != cache.make_key("audio", "ctx", "What is the main idea?")
+        monkeypatch.setitem(cache.PROMPT_VERSIONS, "chat", cache.PROMPT_VERSIONS["chat"] + 1)
+        assert key != cache.make_key("chat", "ctx", "What is the main idea?")
+    
+    def test_chat_answer_reused(self, book_data):
+        """Test an identical question is answered from cache without calling the model"""
+        from services.ai_service import AIService, FakeStreamingModel
+        from services.response_cache import get_cache_stats
+        
+        model = FakeStreamingModel(reply="Focus deeply.")
+        service = AIService(model=model)
+        hits_before = get_cache_stats()["session_hits"]
+        
+        first = service.chat_with_book("What is the main idea?", book_data)
+        second = service.chat_with_book("what is the main idea", book_data)
+        
+        assert first == second == "Focus deeply."
+        assert len(model.prompts) == 1
+        assert get_cache_stats()["session_hits"] == hits_before + 1
+    
+    def test_chat_history_changes_key(self, book_data):
+        """Test follow-up questions with different history are not shared"""
+        from services.ai_service import AIService, ChatMessage, FakeStreamingModel
+        
+        model = FakeStreamingModel()
+        service = AIService(model=model)
+        service.chat_with_book("Explain more", book_data, [ChatMessage("user", "About habits")])
+        service.chat_with_book("Explain more", book_data, [ChatMessage("user", "About goals")])
+        
+        assert len(model.prompts) == 2
+    
+    def test_retrieval_setting_changes_key(self, book_data):
+        """Test services sending different book context do not share answers"""
+        from services.ai_service import AIService, FakeStreamingModel
+    
+        book_data = dict(book_data, main_content="Habits compound.\n\nSystems beat goals.")
+        retrieval_model, whole_model = FakeStreamingModel(reply="Excerpts."), FakeStreamingModel(reply="Whole.")
+    
+        assert AIService(model=retrieval_model, retrieval_k=1).chat_with_book("Why habits?", book_data) == "Excerpts."
+        assert AIService(model=whole_model, retrieval_k=None).chat_with_book("Why habits?", book_data) == "Whole."
+        assert len(retrieval_model.prompts) == len(whole_model.prompts) == 1
+    
+    def test_quiz_and_audio_reused(self, book_data):
+        """Test quizzes and audio summaries are generated once per book"""
+        import json
+        from services.ai_service import AIService, FakeStreamingModel
+        
+        quiz = [{"question": "Q?", "options": ["A) 1", "B) 2"], "correct": "A", "explanation": "E"}]
+        quiz_model = FakeStreamingModel(reply=json.dumps(quiz))
+        service = AIService(model=quiz_model)
+        assert service.generate_quiz(book_data) == service.generate_quiz(book_data) == quiz
+        assert len(quiz_model.prompts) == 1
+        
+        audio_model = FakeStreamingModel(reply="Listen up.")
+        service = AIService(model=audio_model)
+        assert service.summarize_for_audio(book_data) == service.summarize_for_audio(book_data) == "Listen up."
+        assert len(audio_model.prompts) == 1
+    
+    def test_errors_not_cached(self, book_data):
+        """Test failed generations are retried instead of served from cache"""
+        from services.ai_service import AIService, ModelChunk
+        
+        calls = []
+        
+        class BrokenModel:
+            def generate_content(self, prompt, stream=False):
+                calls.append(prompt)
+                yield ModelChunk(text="Partial ")
+                raise RuntimeError("timeout")
+        
+        service = AIService(model=BrokenModel())
+        service.chat_with_book("q", book_data)
+        service.chat_with_book("q", book_data)
+        
+        assert len(calls) == 2
+    
+    def test_ttl_expiry(self):
+        """Test expired entries are misses and get removed"""
+        from datetime import timedelta
+        from services.response_cache import make_key, get_response, put_response, TTL
+        
+        key = make_key("chat", "ttl test context", "q")
+        old = datetime.utcnow() - TTL["chat"] - timedelta(minutes=1)
+        put_response(key, "chat", "stale", now=old)
+        
+        assert get_response(key) is None
+        assert get_response(key, now=old) is None
+    
+    def test_lru_eviction(self, monkeypatch):
+        """Test the least recently used entry is evicted when full"""
+        from datetime import timedelta
+        import services.response_cache as cache
+        from database.connection import get_db_session
+        from database.models import AIResponse
+        
+        base = datetime.utcnow() - timedelta(days=29)
+        keys = [cache.make_key("quiz", f"lru test {i}") for i in range(4)]
+        for i, key in enumerate(keys[:3]):
+            cache.put_response(key, "quiz", f"answer {i}", now=base + timedelta(minutes=i))
+        # Touching the oldest entry makes the second one least recently used
+        assert cache.get_response(keys[0]) == "answer 0"
+        
+        with get_db_session() as session:
+            count = session.query(AIResponse).count()
+        monkeypatch.setattr(cache, "MAX_ENTRIES", count)
+        cache.put_response(keys[3], "quiz", "answer 3")
+        
+        assert cache.get_response(keys[1]) is None
+        assert cache.get_response(keys[0]) == "answer 0"
+        assert cache.get_response(keys[2]) == "answer 2"
+        assert cache.get_response(keys[3]) == "answer 3"
+    
+    def test_stats_report_savings(self, book_data):
+        """Test hit metrics include saved generation time and tokens"""
+        from services.ai_service import AIService, FakeStreamingModel
+        from services.response_cache import get_cache_stats
+        
+        before = get_cache_stats()
+        service = AIService(model=FakeStreamingModel(reply="one two three", delay=0.01))
+        service.chat_with_book("q", book_data)
+        service.chat_with_book("q", book_data)
+        after = get_cache_stats()
+        
+        assert after["hits"] == before["hits"] + 1
+        assert after["saved_seconds"] - before["saved_seconds"] >= 0.03
+        assert after["saved_tokens"] > before["saved_tokens"]
+        assert after["saved_usd"] > before["saved_usd"]
+
+
+class TestRetrieval:
+    """Test passage splitting and BM25 retrieval for RAG"""
+    
+    @pytest.fixture
+    def book_data(self):
+        """Book with headed main content, takeaways and action steps"""
+        return {
+            "title": "Retrieval Test Book",
+            "author": "Test Author",
+            "executive_summary": "A short overview of compounding habits.",
+            "main_content": (
+                "### Identity\n\nEvery action is a vote for the person you want to become.\n\n"
+                "### Environment\n\nDesign your kitchen so fruit is visible and snacks are hidden.\n\n"
+                "### Finance\n\n" + " ".join(["Budgeting"] * 300)
+            ),
+            "takeaways": json.dumps([
+                {"title": "Systems", "text": "Fall to the level of your systems."},
+                {"title": "Plateau", "text": "Breakthroughs follow latent potential."},
+            ]),
+            "action_steps": json.dumps(["Stack a new habit onto an old one"]),
+        }
+    
+    def test_split_passages_sections(self, book_data):
+        """Test headings, takeaways and action steps become labelled passages"""
+        from services.retrieval import split_passages, MAX_PASSAGE_WORDS
+        
+        passages = split_passages(book_data, book_id=7)
+        sections = [p.section for p in passages]
+        
+        assert sections[:3] == ["Executive Summary", "Identity", "Environment"]
+        assert "Key Takeaway 1" in sections and "Key Takeaway 2" in sections
+        assert "Action Steps" in sections
+        assert sections.count("Finance") == 3
+        assert all(len(p.text.split()) <= MAX_PASSAGE_WORDS for p in passages)
+        assert all(p.book_id == 7 for p in passages)
+        assert [p.position for p in passages] == list(range(len(passages)))
+    
+    def test_bm25_ranks_relevant_passage_first(self, book_data):
+        """Test the passage sharing rare terms ranks first, with plural folding"""
+        from services.retrieval import BM25Index, split_passages
+        
+        index = BM25Index(split_passages(book_data))
+        
+        assert index.search("how should I arrange snacks in my kitchen?", k=1)[0][0].section == "Environment"
+        assert index.search("what about votes and identities", k=1)[0][0].section == "Identity"
+        assert index.search("quantum chromodynamics") == []
+    
+    def test_section_names_are_searchable(self, book_data):
+        """Test generic requests like 'key takeaways' find those sections"""
+        from services.retrieval import retrieve_passages
+        
+        sections = {p.section for p in retrieve_passages(book_data, "Key takeaways", k=2)}
+        
+        assert sections == {"Key Takeaway 1", "Key Takeaway 2"}
+    
+    def test_fallback_to_opening_passages(self, book_data):
+        """Test questions with no matching terms get the opening passages"""
+        from services.retrieval import retrieve_passages
+        
+        passages = retrieve_passages(book_data, "Summarize in 3 points", k=2)
+        
+        assert [p.section for p in passages] == ["Executive Summary", "Identity"]
+    
+    def test_index_cached_per_content(self, book_data):
+        """Test the index is reused until the summary changes"""
+        from services.retrieval import get_book_index
+        
+        index = get_book_index(book_data)
+        assert get_book_index(dict(book_data)) is index
+        
+        edited = dict(book_data, executive_summary="Rewritten overview.")
+        assert get_book_index(edited) is not index
+    
+    def test_chat_prompt_carries_only_relevant_passages(self, book_data):
+        """Test retrieval prompts are smaller and skip unrelated sections"""
+        from services.ai_service import AIService, FakeStreamingModel
+        
+        question = "How do I set up my kitchen environment?"
+        retrieval = AIService(model=FakeStreamingModel(), use_cache=False, retrieval_k=2)
+        whole = AIService(model=FakeStreamingModel(), use_cache=False, retrieval_k=None)
+        prompt = retrieval.build_chat_prompt(question, book_data)
+        
+        assert "Design your kitchen" in prompt
+        assert "Budgeting" not in prompt
+        assert "BOOK TITLE: Retrieval Test Book" in prompt
+        assert len(prompt) < len(whole.build_chat_prompt(question, book_data)) / 3
+
+
 # ============================================================================
 # TTS SERVICE TESTS
 # ============================================================================
@@ -362,6 +699,1083 @@ class TestBookScore:
         assert "Similar genre" in score.reasons
 
 
+class TestRecommendationIndex:
+    """Test the precomputed recommendation index"""
+    
+    def test_build_index(self):
+        """Test building the index covers every book"""
+        from services.recommendation_index import build_recommendation_index
+        from database.queries import get_books_count
+        
+        stats = build_recommendation_index()
+        
+        assert stats["indexed"] == get_books_count()
+    
+    def test_rebuild_without_changes_is_noop(self):
+        """Test a second build refreshes nothing"""
+        from services.recommendation_index import build_recommendation_index
+        
+        build_recommendation_index()
+        stats = build_recommendation_index()
+        
+        assert stats["refreshed"] == 0
+        assert stats["merged"] == 0
+    
+    def test_changed_summary_is_reindexed(self):
+        """Test only books with a newer Summary.updated_at are re-extracted"""
+        from services.recommendation_index import build_recommendation_index
+        from database.connection import get_db_session
+        from database.models import Summary
+        
+        build_recommendation_index()
+        with get_db_session() as session:
+            summary = session.query(Summary).first()
+            summary.updated_at = datetime.utcnow()
+        
+        stats = build_recommendation_index()
+        
+        assert stats["refreshed"] >= 1
+        assert stats["refreshed"] + stats["merged"] <= stats["indexed"]
+    
+    def test_indexed_recommendations(self):
+        """Test indexed lookup returns scored books excluding the current one"""
+        from services.recommendation_index import build_recommendation_index, get_indexed_recommendations
+        from services.recommendations import BookScore
+        from database.queries import get_all_books
+        
+        build_recommendation_index()
+        book = get_all_books(limit=1)[0]
+        
+        recs = get_indexed_recommendations(book.id, limit=4)
+        
+        assert recs is not None
+        assert len(recs) <= 4
+        for rec in recs:
+            assert isinstance(rec, BookScore)
+            assert rec.book.id != book.id
+        scores = [r.score for r in recs]
+        assert scores == sorted(scores, reverse=True)
+    
+    def test_unindexed_book_returns_none(self):
+        """Test lookup for an unknown book returns None"""
+        from services.recommendation_index import get_indexed_recommendations
+        
+        assert get_indexed_recommendations(-1) is None
+    
+    def test_missing_table_falls_back_but_errors_raise(self, monkeypatch):
+        """Test only a missing index table means 'not indexed'; other errors surface"""
+        from sqlalchemy.exc import OperationalError
+        import services.recommendation_index as ri
+        
+        def failing_session(message):
+            def session():
+                raise OperationalError("SELECT", {}, Exception(message))
+            return session
+        
+        monkeypatch.setattr(ri, "get_read_session", failing_session("no such table: book_recommendations"))
+        assert ri.get_indexed_recommendations(1) is None
+        monkeypatch.setattr(ri, "get_read_session", failing_session("no such column: book_recommendations.rnk"))
+        with pytest.raises(OperationalError):
+            ri.get_indexed_recommendations(1)
+    
+    def test_failed_refresh_is_logged(self, monkeypatch, caplog):
+        """Test a background refresh error is logged instead of swallowed"""
+        import services.recommendation_index as ri
+        
+        def broken():
+            raise RuntimeError("boom")
+        
+        monkeypatch.setattr(ri, "index_is_stale", broken)
+        ri._refresh_if_stale()
+        
+        assert "Recommendation index refresh failed" in caplog.text
+        assert ri._refresh_thread is None
+    
+    def test_engine_serves_from_index(self):
+        """Test get_recommendations does not load summaries when indexed"""
+        from services.recommendation_index import build_recommendation_index
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books, get_summary_for_book
+        
+        build_recommendation_index()
+        books = get_all_books()
+        book = books[0]
+        
+        with patch('database.queries.get_summary_for_book') as mock_get_summary:
+            recs = RecommendationEngine().get_recommendations(
+                book, get_summary_for_book(book.id), books, limit=4
+            )
+            mock_get_summary.assert_not_called()
+        
+        assert len(recs) <= 4
+    
+    def test_recommendations_materialized_as_rows(self):
+        """Test each book gets ranked rows in book_recommendations"""
+        from services.recommendation_index import build_recommendation_index, DEFAULT_TOP_K
+        from database.connection import get_read_session
+        from database.models import BookRecommendation
+        
+        build_recommendation_index()
+        with get_read_session() as session:
+            rows = session.query(BookRecommendation).order_by(
+                BookRecommendation.book_id, BookRecommendation.rank
+            ).all()
+        
+        lists = {}
+        for row in rows:
+            assert row.rec_book_id != row.book_id
+            assert isinstance(row.reasons, list)
+            lists.setdefault(row.book_id, []).append(row)
+        assert lists
+        for recs in lists.values():
+            assert len(recs) <= DEFAULT_TOP_K
+            assert [r.rank for r in recs] == list(range(len(recs)))
+            assert [r.score for r in recs] == sorted((r.score for r in recs), reverse=True)
+    
+    def test_changed_book_is_reindexed(self):
+        """Test editing a book row (not its summary) refreshes it"""
+        from services.recommendation_index import build_recommendation_index
+        from database.connection import get_db_session
+        from database.models import Book
+        
+        build_recommendation_index()
+        with get_db_session() as session:
+            book = session.query(Book).first()
+            book.updated_at = datetime.utcnow()
+        
+        stats = build_recommendation_index()
+        
+        assert stats["refreshed"] >= 1
+    
+    def test_lookup_is_one_query(self):
+        """Test the detail-page lookup issues a single SQL statement"""
+        from sqlalchemy import event
+        from services.recommendation_index import build_recommendation_index, get_indexed_recommendations
+        from database.connection import read_engine
+        from database.queries import get_all_books
+        
+        build_recommendation_index()
+        book = get_all_books(limit=1)[0]
+        statements = []
+        
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(read_engine, "before_cursor_execute", count)
+        try:
+            recs = get_indexed_recommendations(book.id, limit=4)
+        finally:
+            event.remove(read_engine, "before_cursor_execute", count)
+        
+        assert recs
+        assert len(statements) == 1
+    
+    def test_background_refresh_catches_up(self):
+        """Test schedule_refresh rebuilds a stale index in a worker thread"""
+        from services.recommendation_index import build_recommendation_index, index_is_stale, schedule_refresh
+        from database.connection import get_db_session
+        from database.models import Summary
+        
+        build_recommendation_index()
+        assert not index_is_stale()
+        with get_db_session() as session:
+            session.query(Summary).first().updated_at = datetime.utcnow()
+        assert index_is_stale()
+        
+        worker = schedule_refresh(force=True)
+        assert worker is not None
+        worker.join(timeout=60)
+        
+        assert not index_is_stale()
+
+    def test_any_catalogue_write_makes_index_stale(self):
+        """Test a write that moves no count or newest timestamp still marks the index stale"""
+        from sqlalchemy import update
+        from services.recommendation_index import build_recommendation_index, index_is_stale
+        from database.connection import get_db_session
+        from database.models import Summary
+        
+        build_recommendation_index()
+        with get_db_session() as session:
+            summary = session.query(Summary).order_by(Summary.updated_at).first()
+            summary_id, original = summary.id, summary.who_should_read
+        
+        try:
+            with get_db_session() as session:
+                session.execute(
+                    update(Summary).where(Summary.id == summary_id)
+                    .values(who_should_read="Edited", updated_at=Summary.updated_at)
+                )
+            assert index_is_stale()
+        finally:
+            with get_db_session() as session:
+                session.execute(
+                    update(Summary).where(Summary.id == summary_id)
+                    .values(who_should_read=original, updated_at=Summary.updated_at)
+                )
+
+
+class TestParsedSummary:
+    """Test the shared parsed-summary layer"""
+    
+    @pytest.fixture
+    def summary(self):
+        """Summary view with JSON fields"""
+        from database.views import SummaryView
+        fields = dict.fromkeys(SummaryView.__dataclass_fields__)
+        fields.update(
+            id=-42,
+            book_id=-42,
+            overview_text="Overview",
+            main_content="Main content",
+            executive_summary="Executive summary",
+            who_should_read="Builders",
+            key_takeaways=json.dumps([{"title": "Systems", "text": "Fall to your systems."}]),
+            analogies=json.dumps([{"concept": "Stacking", "analogy": "A train", "explanation": "Cars link"}]),
+            quotes=json.dumps(["Every action is a vote."]),
+            action_steps="not json",
+            updated_at=datetime(2024, 1, 1),
+        )
+        return SummaryView(**fields)
+    
+    def test_parsed_once_per_version(self, summary):
+        """Test the same version is served from cache and a new version is re-parsed"""
+        import dataclasses
+        from services.parsed_summary import get_parsed_summary
+        
+        parsed = get_parsed_summary(summary)
+        
+        assert get_parsed_summary(summary) is parsed
+        newer = dataclasses.replace(summary, quotes=json.dumps(["Edited"]), updated_at=datetime(2024, 2, 1))
+        assert get_parsed_summary(newer).quotes == ("Edited",)
+    
+    def test_parsed_summary_is_immutable(self, summary):
+        """Test decoded fields are tuples and FrozenDicts"""
+        import dataclasses
+        from database.views import FrozenDict
+        from services.parsed_summary import get_parsed_summary
+        
+        parsed = get_parsed_summary(summary)
+        
+        assert isinstance(parsed.takeaways[0], FrozenDict)
+        assert parsed.takeaways[0].get("title") == "Systems"
+        assert parsed.action_steps == ("not json",)
+        with pytest.raises(TypeError):
+            parsed.takeaways[0]["title"] = "Changed"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            parsed.quotes = ()
+    
+    def test_context_shared_with_ai_service(self, summary):
+        """Test an attached parse gives the same context as raw JSON fields"""
+        from services.ai_service import AIService
+        from services.parsed_summary import get_parsed_summary
+        
+        raw = {
+            "title": "Parsed", "author": "A",
+            "executive_summary": summary.executive_summary,
+            "main_content": summary.main_content,
+            "takeaways": summary.key_takeaways,
+            "analogies": summary.analogies,
+            "quotes": summary.quotes,
+            "action_steps": summary.action_steps,
+            "who_should_read": summary.who_should_read,
+        }
+        service = AIService()
+        
+        context = service.create_book_context(dict(raw, parsed=get_parsed_summary(summary)))
+        
+        assert context == service.create_book_context(raw)
+        assert "1. Systems: Fall to your systems." in context
+        assert "- Stacking: A train - Cars link" in context
+    
+    def test_recommender_uses_keyword_text(self, summary):
+        """Test keywords include decoded JSON values"""
+        from services.recommendations import RecommendationEngine
+        
+        book = Mock(title="Parsed", author="Author")
+        keywords = RecommendationEngine().get_book_keywords(book, summary)
+        
+        assert "systems" in keywords
+        assert "stacking" in keywords
+
+
+class TestRecommendationFeatures:
+    """Test vectorized recommendation scoring"""
+    
+    def test_top_rows_keeps_catalogue_order_on_ties(self):
+        """Test argpartition top-K matches a stable sort"""
+        import numpy as np
+        from services.recommendation_features import top_rows
+        
+        scores = np.array([5.0, 0.0, 7.0, 5.0, 5.0, -1.0, 7.0])
+        
+        assert top_rows(scores, 3).tolist() == [2, 6, 0]
+        assert top_rows(scores, 10).tolist() == [2, 6, 0, 3, 4]
+        assert top_rows(scores, 2, np.array([0, 3, 4])).tolist() == [0, 3]
+    
+    def test_similar_matches_score_candidate(self):
+        """Test batched scores and reasons equal the per-candidate loop"""
+        from services.recommendations import RecommendationEngine
+        from services.recommendation_features import CatalogueFeatures
+        from database.queries import get_all_books, get_summaries_for_books
+        
+        engine = RecommendationEngine()
+        books = get_all_books()
+        summaries = get_summaries_for_books(b.id for b in books)
+        keywords = [engine.get_book_keywords(b, summaries.get(b.id)) for b in books]
+        features = CatalogueFeatures(books, keywords)
+        
+        for book, book_keywords in list(zip(books, keywords))[:10]:
+            expected = []
+            for other, other_keywords in zip(books, keywords):
+                if other.id != book.id:
+                    score, reasons = engine.score_candidate(book, book_keywords, other, other_keywords)
+                    if score > 0:
+                        expected.append((other.id, score, reasons))
+            expected.sort(key=lambda r: -r[1])
+            
+            ranked = features.similar(book, book_keywords, 6)
+            assert [(b.id, s, r) for b, s, r in ranked] == expected[:6]
+    
+    def test_history_excludes_read_books(self):
+        """Test reading-history recommendations skip read books and explain matches"""
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books
+        
+        books = get_all_books()
+        history = [books[0].slug, books[1].slug]
+        
+        recs = RecommendationEngine().get_personalized_recommendations(history, books, limit=5)
+        
+        assert 0 < len(recs) <= 5
+        assert not {r.book.slug for r in recs} & set(history)
+        assert all(r.reasons for r in recs)
+        scores = [r.score for r in recs]
+        assert scores == sorted(scores, reverse=True)
+    
+    def test_features_reused_until_data_changes(self):
+        """Test catalogue features are cached for an unchanged catalogue"""
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books
+        
+        engine = RecommendationEngine()
+        books = get_all_books()
+        
+        features = engine.get_catalogue_features(books)
+        
+        assert engine.get_catalogue_features(books) is features
+        assert engine.get_catalogue_features(books[:-1]) is not features
+        assert len(features) == len(books)
+    
+    def test_features_keyed_on_data_version_and_extractor(self):
+        """Test book edits and a different extractor rebuild the features"""
+        from services.recommendation_features import load_catalogue_features
+        from services.recommendations import RecommendationEngine
+        from database.connection import get_db_session
+        from database.models import Book
+        from database.queries import get_all_books
+    
+        features = RecommendationEngine().get_catalogue_features(get_all_books())
+        assert RecommendationEngine().get_catalogue_features(get_all_books()) is features
+        assert load_catalogue_features(get_all_books(), lambda book, summary: []) is not features
+    
+        book_id = get_all_books()[0].id
+        with get_db_session() as session:
+            book = session.get(Book, book_id)
+            original_year, book.publication_year = book.publication_year, 1066
+        try:
+            edited = RecommendationEngine().get_catalogue_features(get_all_books())
+            assert edited is not features
+            assert 1066 in edited.years.tolist()
+        finally:
+            with get_db_session() as session:
+                session.get(Book, book_id).publication_year = original_year
+    
+    def test_related_author_codes_match_substring_test(self):
+        """Test the joined-string author search equals testing each name"""
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books
+        
+        features = RecommendationEngine().get_catalogue_features(get_all_books())
+        
+        for author in features.authors[:10] + ["a", "zzzq"]:
+            expected = [any(name in other for name in author.split()) for other in features.authors]
+            assert features.related_author_codes(author).tolist() == expected
+
+
+class TestFacets:
+    """Test cached filter facets"""
+    
+    @pytest.mark.parametrize("selection", [
+        {},
+        {"difficulty": "Beginner"},
+        {"genre_slug": "business", "min_rating": 4.0},
+    ])
+    def test_counts_match_sql(self, selection):
+        """Test every facet count equals counting the same filter in SQL"""
+        from database.queries import BookFilter, count_filtered_books
+        from services.facets import get_facet_counts, get_facet_index
+        
+        book_filter = BookFilter(**selection)
+        counts = get_facet_counts(book_filter)
+        
+        for facet, values in counts.items():
+            for value, count in values.items():
+                assert count == count_filtered_books(book_filter.where(**{facet: value})), (facet, value)
+        assert get_facet_index().total(book_filter) == count_filtered_books(book_filter)
+    
+    def test_selection_does_not_zero_its_own_facet(self):
+        """Test a selected value leaves the other values of its facet counted"""
+        from database.queries import BookFilter
+        from services.facets import get_facet_counts
+        
+        everything = get_facet_counts()
+        year = next(iter(everything["year"]))
+        selected = get_facet_counts(BookFilter(year=year))
+        
+        assert selected["year"] == everything["year"]
+        assert sum(selected["reading_time"].values()) <= everything["year"][year]
+    
+    def test_reading_time_bucket(self):
+        """Test reading times map onto the filter buckets"""
+        from services.facets import reading_time_bucket
+        
+        assert reading_time_bucket(None) is None
+        assert reading_time_bucket(9) == "under_10"
+        assert reading_time_bucket(10) == "10_15"
+        assert reading_time_bucket(16) == "16_20"
+        assert reading_time_bucket(21) == "over_20"
+    
+    def test_index_cached_by_data_version(self):
+        """Test the index is reused until a catalogue write"""
+        from database.connection import get_db_session
+        from database.models import Genre
+        from database.queries import get_all_genres
+        from services.facets import get_facet_index
+        
+        index = get_facet_index()
+        assert get_facet_index() is index
+        
+        genre = get_all_genres()[0]
+        try:
+            with get_db_session() as session:
+                session.get(Genre, genre.id).description = genre.description + " (edited)"
+            assert get_facet_index() is not index
+        finally:
+            with get_db_session() as session:
+                session.get(Genre, genre.id).description = genre.description
+
+
+class TestAnnIndex:
+    """Test MinHash/LSH candidate generation for recommendations"""
+    
+    def _catalogue(self):
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books, get_summaries_for_books
+        from services.recommendation_features import CatalogueFeatures
+        
+        engine = RecommendationEngine()
+        books = get_all_books()
+        summaries = get_summaries_for_books(b.id for b in books)
+        keywords = [engine.get_book_keywords(b, summaries.get(b.id)) for b in books]
+        return CatalogueFeatures(books, keywords), keywords
+    
+    def test_identical_keyword_sets_collide(self):
+        """Test a book's own keywords always find it, and no keywords find nothing"""
+        from services.ann_index import MinHashLSH, LSHConfig
+        
+        features, keywords = self._catalogue()
+        index = MinHashLSH(features, LSHConfig(num_perm=32, bands=4, max_candidates=None))
+        
+        for row in range(5):
+            assert row in index.keyword_candidates(keywords[row]).tolist()
+        assert len(index.keyword_candidates([])) == 0
+    
+    def test_candidates_rescored_match_exact(self):
+        """Test re-scoring ANN candidates reproduces the exhaustive top-K"""
+        from services.ann_index import evaluate_recall, PRESETS
+        
+        features, keywords = self._catalogue()
+        
+        stats = evaluate_recall(features, keywords, PRESETS["accurate"], k=6)
+        
+        assert stats["recall"] == 1.0
+        assert stats["candidates"] < len(features)
+    
+    def test_invalid_config(self):
+        """Test num_perm must split evenly into bands"""
+        from services.ann_index import MinHashLSH, LSHConfig
+        
+        features, _ = self._catalogue()
+        
+        with pytest.raises(ValueError):
+            MinHashLSH(features, LSHConfig(num_perm=100, bands=64))
+    
+    def test_engine_switches_to_ann_by_size(self):
+        """Test the engine scores every row for small catalogues and LSH candidates above the threshold"""
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books, get_summary_for_book
+        
+        books = get_all_books()
+        book = books[0]
+        summary = get_summary_for_book(book.id)
+        exact_engine = RecommendationEngine()
+        ann_engine = RecommendationEngine(ann_min_books=1)
+        features = exact_engine.get_catalogue_features(books)
+        keywords = exact_engine.get_book_keywords(book, summary)
+        
+        assert exact_engine.candidate_rows(features, book, keywords, 6) is None
+        rows = ann_engine.candidate_rows(features, book, keywords, 6)
+        assert len(rows) > 0
+        assert len(features.ann_indexes) == 1
+        assert [b.id for b, _, _ in features.similar(book, keywords, 6, rows)] == \
+            [b.id for b, _, _ in features.similar(book, keywords, 6)]
+
+
+class TestUserProfile:
+    """Test the incremental session reading profile"""
+    
+    def _features(self):
+        from services.recommendations import RecommendationEngine
+        from database.queries import get_all_books
+        
+        return RecommendationEngine().get_catalogue_features(get_all_books())
+    
+    def test_profile_matches_history_scoring(self):
+        """Test profile recommendations equal scoring the same history from scratch"""
+        from services.user_profile import UserProfile, SOURCE_READ, SOURCE_BOOKMARK
+        
+        features = self._features()
+        books = features.books
+        profile = UserProfile()
+        profile.add(books[0].slug, SOURCE_READ)
+        profile.add(books[3].slug, SOURCE_BOOKMARK)
+        profile.recommend(features, 6)
+        profile.add(books[7].slug, SOURCE_BOOKMARK)
+        
+        ranked = profile.recommend(features, 6)
+        expected = features.for_history([0, 3, 7], 6)
+        
+        assert [(b.id, s, r) for b, s, r in ranked] == [(b.id, s, r) for b, s, r in expected]
+    
+    def test_incremental_overlap_equals_rebuild(self):
+        """Test adding and removing books keeps the overlap vector exact"""
+        import numpy as np
+        from services.user_profile import UserProfile, SOURCE_READ
+        
+        features = self._features()
+        books = features.books
+        profile = UserProfile()
+        for row in (1, 2, 5):
+            profile.add(books[row].slug, SOURCE_READ)
+            profile.sync(features)
+        profile.remove(books[2].slug, SOURCE_READ)
+        profile.sync(features)
+        
+        terms = np.unique(np.concatenate([
+            features.row_terms[features.row_indptr[r]:features.row_indptr[r + 1]] for r in (1, 5)
+        ]))
+        assert profile.overlap.tolist() == features.overlap(terms).tolist()
+        assert profile.genre_counts.sum() == 2
+    
+    def test_bookmark_removal_keeps_read_book(self):
+        """Test a book stays in the profile while any source remains"""
+        from services.user_profile import UserProfile, SOURCE_READ, SOURCE_BOOKMARK
+        
+        profile = UserProfile()
+        profile.add("deep-work", SOURCE_READ)
+        profile.add("deep-work", SOURCE_BOOKMARK)
+        profile.remove("deep-work", SOURCE_BOOKMARK)
+        
+        assert profile.slugs == ["deep-work"]
+    
+    def test_seeded_from_session_state(self):
+        """Test a new profile picks up existing progress and bookmarks"""
+        from services.user_profile import get_user_profile
+        
+        state = {
+            "reading_progress": {"a": {"sections_read": ["Quotes"]}, "b": {"sections_read": []}},
+            "bookmarks": [{"slug": "c", "title": "C", "author": "X"}],
+        }
+        
+        profile = get_user_profile(state)
+        
+        assert sorted(profile.slugs) == ["a", "c"]
+        assert get_user_profile(state) is profile
+    
+    def test_empty_profile_falls_back_to_top_rated(self):
+        """Test the engine returns top-rated books for an empty profile"""
+        from services.recommendations import RecommendationEngine
+        from services.user_profile import UserProfile
+        from database.queries import get_all_books
+        
+        recs = RecommendationEngine().get_profile_recommendations(UserProfile(), get_all_books(), limit=3)
+        
+        assert all(r.reasons == ["Top Rated"] for r in recs)
+
+
+class TestPassageIndex:
+    """Test the library-wide passage index for cross-book questions"""
+    
+    def test_build_index(self):
+        """Test building the index covers every summary"""
+        from services.passage_index import build_passage_index
+        from database.connection import get_read_session
+        from database.models import Summary
+        
+        stats = build_passage_index()
+        with get_read_session() as session:
+            summaries = session.query(Summary).count()
+        
+        assert stats["indexed"] == summaries
+        assert stats["removed"] == 0
+    
+    def test_changed_summary_is_reindexed(self):
+        """Test only books with a newer Summary.updated_at are re-split"""
+        from services.passage_index import build_passage_index
+        from database.connection import get_db_session
+        from database.models import Summary
+        
+        build_passage_index()
+        assert build_passage_index()["refreshed"] == 0
+        
+        with get_db_session() as session:
+            summary = session.query(Summary).first()
+            summary.updated_at = datetime.utcnow()
+        
+        stats = build_passage_index()
+        
+        assert stats["refreshed"] == 1
+        assert stats["passages"] > 0
+    
+    def test_removed_summary_is_dropped(self, tmp_path):
+        """Test books without a summary leave the index on the next build"""
+        from sqlalchemy import text
+        from database.connection import create_sqlite_engine, EngineConfig
+        from database.models import Base
+        from services.passage_index import build_passage_index, search_passages, build_library_query
+        
+        temp_engine = create_sqlite_engine(tmp_path / "passages.db", EngineConfig())
+        Base.metadata.create_all(bind=temp_engine)
+        with temp_engine.begin() as conn:
+            conn.execute(text("INSERT INTO genres (id, name, slug, description) VALUES (1, 'Test', 'test', '')"))
+            conn.execute(text("INSERT INTO books (id, title, author, slug, genre_id) VALUES (1, 'Gardens', 'A', 'gardens', 1)"))
+            conn.execute(text(
+                "INSERT INTO summaries (book_id, overview_text, main_content, key_takeaways, who_should_read, "
+                "executive_summary) VALUES (1, 'Composting tomatoes', '', '[]', '', 'Raised beds')"
+            ))
+        
+        assert build_passage_index(bind=temp_engine)["passages"] == 2
+        with temp_engine.begin() as conn:
+            conn.execute(text("DELETE FROM summaries"))
+        stats = build_passage_index(bind=temp_engine)
+        
+        assert stats["removed"] == 1
+        with temp_engine.connect() as conn:
+            assert search_passages(conn, build_library_query("composting tomatoes")) == []
+        temp_engine.dispose()
+    
+    def test_search_library_caps_passages_per_book(self):
+        """Test hits are ranked, attached to books and capped per book"""
+        from collections import Counter
+        from services.passage_index import build_passage_index, search_library, LibraryHit
+        
+        build_passage_index()
+        hits = search_library("How do I build better habits?", limit=6, per_book=2)
+        
+        assert 0 < len(hits) <= 6
+        assert all(isinstance(hit, LibraryHit) for hit in hits)
+        assert max(Counter(hit.book.id for hit in hits).values()) <= 2
+        scores = [hit.score for hit in hits]
+        assert scores == sorted(scores)
+    
+    def test_query_cannot_inject_fts_syntax(self):
+        """Test FTS operators in the question are quoted as plain terms"""
+        from services.passage_index import build_library_query, search_library
+        
+        assert build_library_query('habits" OR NEAR(*') == '"habit" OR "near"'
+        assert build_library_query("what is the?") == ""
+        assert search_library('") AND title:*') == []
+    
+    def test_library_answer_cites_books(self):
+        """Test the library prompt labels excerpts by book and streams an answer"""
+        from services.ai_service import AIService, FakeStreamingModel
+        from services.passage_index import build_passage_index, search_library
+        
+        build_passage_index()
+        hits = search_library("habits")
+        model = FakeStreamingModel(reply="Both books agree.")
+        service = AIService(model=model, use_cache=False)
+        
+        answer = "".join(service.stream_library_answer("habits", hits))
+        
+        assert answer == "Both books agree."
+        assert f"[1] {hits[0].book.title}" in model.prompts[0]
+        assert hits[0].passage.text in model.prompts[0]
+    
+    def _wait_for_refresh(self):
+        """Wait for a background refresh started by search_library to finish."""
+        import services.passage_index as passage_index
+        
+        thread = passage_index._refresh_thread
+        if thread is not None:
+            thread.join(timeout=30)
+    
+    def test_search_refreshes_after_catalogue_change(self):
+        """Test a new summary becomes searchable via the background refresh"""
+        from database.connection import get_db_session
+        from database.models import Book, Genre, Summary
+        from services.passage_index import search_library
+        
+        search_library("habits")
+        self._wait_for_refresh()
+        with get_db_session() as session:
+            book = Book(title="Beekeeping Basics", author="Test", slug="beekeeping-basics-test",
+                        genre_id=session.query(Genre.id).first()[0])
+            session.add(book)
+            session.flush()
+            session.add(Summary(book_id=book.id, overview_text="Apiary zythophile hives", main_content="",
+                                key_takeaways=[], who_should_read=""))
+        try:
+            search_library("zythophile apiary")
+            self._wait_for_refresh()
+            hits = search_library("zythophile apiary")
+            assert [hit.book.slug for hit in hits] == ["beekeeping-basics-test"]
+        finally:
+            with get_db_session() as session:
+                book = session.query(Book).filter_by(slug="beekeeping-basics-test").one()
+                session.query(Summary).filter_by(book_id=book.id).delete()
+                session.delete(book)
+        search_library("zythophile apiary")
+        self._wait_for_refresh()
+        assert search_library("zythophile apiary") == []
+    
+    def test_search_does_not_wait_for_refresh(self, monkeypatch):
+        """Test a question is answered from the last-built index while a refresh runs"""
+        import threading
+        import services.passage_index as passage_index
+        
+        passage_index.build_passage_index()
+        release = threading.Event()
+        monkeypatch.setattr(passage_index, "build_passage_index", lambda: release.wait(10))
+        monkeypatch.setattr(passage_index, "_indexed_version", None)
+        try:
+            hits = passage_index.search_library("habits")
+            assert hits
+            assert passage_index._refresh_thread is not None
+            assert passage_index.schedule_refresh() is None  # one worker at a time
+        finally:
+            release.set()
+            self._wait_for_refresh()
+    
+    def test_missing_index_raises(self, monkeypatch):
+        """Test a missing index is reported instead of returning no matches"""
+        import services.passage_index as passage_index
+        
+        monkeypatch.setattr(passage_index, "schedule_refresh", lambda: None)
+        monkeypatch.setattr(
+            passage_index, "PASSAGE_SEARCH_SQL",
+            passage_index.PASSAGE_SEARCH_SQL.replace("passages_fts", "passages_missing"),
+        )
+        
+        with pytest.raises(passage_index.PassageIndexUnavailable):
+            passage_index.search_library("habits")
+
+
+# ============================================================================
+# IMAGE CHECKER TESTS
+# ============================================================================
+
+class TestImageChecker:
+    """Test background image checker against a local HTTP server"""
+    
+    @pytest.fixture
+    def image_server(self):
+        """Serve /ok.jpg (with ETag), /no-head.jpg (GET only) and 404s"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        requests_seen = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, body):
+                requests_seen.append((self.command, self.path, self.headers.get("If-None-Match")))
+                if self.path == "/ok.jpg":
+                    if self.headers.get("If-None-Match") == '"v1"':
+                        self.send_response(304)
+                        self.end_headers()
+                        return
+                    self.send_response(200)
+                    self.send_header("ETag", '"v1"')
+                elif self.path == "/no-head.jpg" and self.command == "GET":
+                    self.send_response(200)
+                elif self.path == "/no-head.jpg":
+                    self.send_response(405)
+                else:
+                    self.send_response(404)
+                self.send_header("Content-Length", "3")
+                self.end_headers()
+                if body:
+                    self.wfile.write(b"img")
+            
+            def do_HEAD(self):
+                self._respond(body=False)
+            
+            def do_GET(self):
+                self._respond(body=True)
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        yield base, requests_seen
+        server.shutdown()
+        server.server_close()
+        
+        from database.connection import get_db_session
+        from database.models import ImageCheck
+        from services.image_checker import ensure_image_check_table
+        ensure_image_check_table()
+        with get_db_session() as session:
+            session.query(ImageCheck).filter(ImageCheck.url.like(f"{base}%")).delete(synchronize_session=False)
+    
+    def test_probe_statuses(self, image_server):
+        """Test probe_image handles 200, HEAD-blocked and 404 responses"""
+        from services.image_checker import probe_image
+        
+        base, _ = image_server
+        ok = probe_image(f"{base}/ok.jpg")
+        assert ok.ok and ok.status_code == 200 and ok.etag == '"v1"'
+        assert probe_image(f"{base}/no-head.jpg").ok
+        missing = probe_image(f"{base}/missing.jpg")
+        assert not missing.ok and missing.status_code == 404
+    
+    def test_probe_network_error(self):
+        """Test probe_image reports unreachable hosts without raising"""
+        from services.image_checker import probe_image
+        
+        result = probe_image("http://127.0.0.1:9/none.jpg", timeout=0.5)
+        assert not result.ok
+        assert result.status_code is None
+        assert result.error
+    
+    def test_check_images_stores_results(self, image_server):
+        """Test check_images persists status and ETag"""
+        from services.image_checker import check_images
+        from database.connection import get_db_session
+        from database.models import ImageCheck
+        
+        base, _ = image_server
+        urls = [f"{base}/ok.jpg", f"{base}/missing.jpg", f"{base}/ok.jpg"]
+        results = check_images(urls, workers=4)
+        assert len(results) == 2
+        
+        with get_db_session() as session:
+            rows = {r.url: r for r in session.query(ImageCheck).filter(ImageCheck.url.like(f"{base}%"))}
+            assert rows[f"{base}/ok.jpg"].ok and rows[f"{base}/ok.jpg"].etag == '"v1"'
+            assert not rows[f"{base}/missing.jpg"].ok
+            assert rows[f"{base}/missing.jpg"].checked_at is not None
+    
+    def test_recheck_is_conditional(self, image_server):
+        """Test a re-check sends the stored ETag and accepts 304"""
+        from services.image_checker import check_images
+        
+        base, seen = image_server
+        check_images([f"{base}/ok.jpg"])
+        results = check_images([f"{base}/ok.jpg"])
+        assert results[0].ok and results[0].status_code == 304
+        assert seen[-1] == ("HEAD", "/ok.jpg", '"v1"')
+    
+    def test_stale_urls(self, image_server):
+        """Test only unchecked or expired URLs are due"""
+        from datetime import timedelta
+        from services.image_checker import check_images, stale_urls, RECHECK_FAILED_AFTER
+        
+        base, _ = image_server
+        ok_url, bad_url, new_url = f"{base}/ok.jpg", f"{base}/missing.jpg", f"{base}/new.jpg"
+        check_images([ok_url, bad_url])
+        assert stale_urls([ok_url, bad_url, new_url]) == [new_url]
+        later = datetime.utcnow() + RECHECK_FAILED_AFTER + timedelta(minutes=1)
+        assert stale_urls([ok_url, bad_url, new_url], now=later) == sorted([bad_url, new_url])
+    
+    def test_render_path_never_probes(self, image_server):
+        """Test load_image_safe reads stored results and queues unknown URLs"""
+        import services.image_checker as checker
+        from components.image_handler import load_image_safe, PLACEHOLDER_IMAGES
+        
+        base, seen = image_server
+        checker.check_images([f"{base}/missing.jpg"])
+        checker._snapshot_loaded_at = 0.0
+        seen.clear()
+        
+        with patch.object(checker, "schedule_check") as schedule:
+            assert load_image_safe(f"{base}/missing.jpg") == PLACEHOLDER_IMAGES["book"]
+            assert load_image_safe(f"{base}/unknown.jpg") == f"{base}/unknown.jpg"
+            schedule.assert_called_once_with(f"{base}/unknown.jpg")
+        assert seen == []
+    
+    def test_background_worker_checks_queue(self, image_server):
+        """Test scheduled URLs are checked by the background worker"""
+        import time
+        import services.image_checker as checker
+        
+        base, _ = image_server
+        url = f"{base}/ok.jpg"
+        checker.schedule_check(url)
+        deadline = time.time() + 10
+        while checker.get_image_status(url) is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert checker.get_image_status(url) is True
+
+
+class TestImageCache:
+    """Test local cover cache against a local HTTP server"""
+    
+    @pytest.fixture
+    def cover_server(self, tmp_path, monkeypatch):
+        """Serve a 600x900 PNG at /a.png and /b.png (same bytes, ETag) and junk at /bad.png"""
+        import io
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from PIL import Image
+        import services.image_cache as image_cache
+        
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 900), (200, 60, 60)).save(buffer, format="PNG")
+        png = buffer.getvalue()
+        small = io.BytesIO()
+        Image.new("RGB", (200, 300), (60, 60, 200)).save(small, format="PNG")
+        bodies = {"/a.png": png, "/b.png": png, "/small.png": small.getvalue(), "/bad.png": b"not an image"}
+        requests_seen = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_seen.append((self.path, self.headers.get("If-None-Match")))
+                body = bodies.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.headers.get("If-None-Match") == '"v1"':
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        monkeypatch.setattr(image_cache, "CACHE_DIR", tmp_path)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        yield base, tmp_path, requests_seen
+        server.shutdown()
+        server.server_close()
+        
+        from database.connection import get_db_session
+        from database.models import CachedImage
+        image_cache.ensure_image_cache_table()
+        with get_db_session() as session:
+            session.query(CachedImage).filter(CachedImage.url.like(f"{base}%")).delete(synchronize_session=False)
+        image_cache._snapshot_loaded_at = 0.0
+    
+    def test_derivatives_written(self, cover_server):
+        """Test every width and format is written with the right size"""
+        from PIL import Image
+        from services.image_cache import cache_image, derivative_name, supported_formats, DERIVATIVE_WIDTHS
+        
+        base, cache_dir, _ = cover_server
+        entry = cache_image(f"{base}/a.png")
+        assert entry is not None
+        assert (entry.width, entry.height) == (600, 900)
+        for width in DERIVATIVE_WIDTHS:
+            for fmt in supported_formats():
+                path = cache_dir / derivative_name(entry.content_hash, width, fmt)
+                assert path.exists()
+                with Image.open(path) as image:
+                    assert image.size == (width, width * 3 // 2)
+    
+    def test_no_upscaling(self, cover_server):
+        """Test images narrower than the derivative widths are not enlarged"""
+        from services.image_cache import cache_image
+        
+        base, _, _ = cover_server
+        entry = cache_image(f"{base}/small.png")
+        assert entry.widths == [160, 200]
+    
+    def test_content_addressed_dedupe(self, cover_server):
+        """Test identical bytes from two URLs share one set of files"""
+        from services.image_cache import cache_images, get_cover_sources
+        
+        base, cache_dir, _ = cover_server
+        stats = cache_images([f"{base}/a.png", f"{base}/b.png", f"{base}/bad.png", f"{base}/missing.png"])
+        assert stats == {"requested": 4, "cached": 2, "failed": 2}
+        a, b = get_cover_sources(f"{base}/a.png"), get_cover_sources(f"{base}/b.png")
+        assert a == b
+        assert len(list(cache_dir.glob("*/*"))) == len(a.widths) * len(a.formats)
+    
+    def test_refetch_is_conditional(self, cover_server):
+        """Test a second fetch sends the stored ETag and keeps the entry"""
+        from services.image_cache import cache_image
+        
+        base, _, seen = cover_server
+        first = cache_image(f"{base}/a.png")
+        second = cache_image(f"{base}/a.png")
+        assert seen[-1] == ("/a.png", '"v1"')
+        assert second.content_hash == first.content_hash
+        assert second.fetched_at >= first.fetched_at
+    
+    def test_undecodable_image(self, cover_server):
+        """Test bytes that are not an image are not cached"""
+        from services.image_cache import cache_image, uncached_urls
+        
+        base, cache_dir, _ = cover_server
+        assert cache_image(f"{base}/bad.png") is None
+        assert uncached_urls([f"{base}/bad.png"]) == [f"{base}/bad.png"]
+        assert list(cache_dir.iterdir()) == []
+    
+    def test_render_helpers_use_local_derivatives(self, cover_server):
+        """Test load_image_safe and cover_picture_html serve static derivatives"""
+        import services.image_checker as checker
+        from services.image_cache import cache_image, STATIC_URL_PREFIX
+        from components.image_handler import load_image_safe, cover_picture_html
+        from utils.performance import generate_srcset
+        
+        base, _, _ = cover_server
+        url = f"{base}/a.png"
+        cache_image(url)
+        checker.check_images([url])
+        
+        assert load_image_safe(url).startswith(f"{STATIC_URL_PREFIX}/")
+        assert load_image_safe(url).endswith("-320.jpg")
+        html = cover_picture_html(url, alt='A "quoted" title')
+        assert html.startswith("<picture>") and 'type="image/webp"' in html
+        assert " 160w, " in html and url not in html
+        assert "&quot;quoted&quot;" in html
+        assert generate_srcset(url).endswith("-480.jpg 480w")
+    
+    def test_uncached_url_falls_back_to_img(self, cover_server):
+        """Test images without derivatives render as a plain <img>"""
+        from unittest.mock import patch
+        import services.image_checker as checker
+        from components.image_handler import cover_picture_html
+        
+        base, _, _ = cover_server
+        with patch.object(checker, "schedule_check"):
+            html = cover_picture_html(f"{base}/new.png")
+        assert html.startswith(f'<img src="{base}/new.png"')
+
+
 # ============================================================================
 # SERVICES PACKAGE TESTS
 # ============================================================================
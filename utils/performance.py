@@ -138,6 +138,14 @@ def get_optimized_image_url(url: str, width: int = 300, quality: int = 80) -> st
     if not url:
         return ""
     
+    # Locally cached covers use the nearest pre-resized derivative
+    from services.image_cache import get_cover_sources
+    
+    sources = get_cover_sources(url)
+    if sources is not None:
+        nearest = min(sources.widths, key=lambda w: (w < width, abs(w - width)))
+        return sources.url(nearest)
+    
     # Unsplash optimization
     if "unsplash.com" in url:
         # Remove existing params
@@ -166,6 +174,13 @@ def generate_srcset(url: str, sizes: list = None) -> str:
     if sizes is None:
         sizes = [320, 480, 640, 960, 1280]
     
+    # Locally cached covers advertise the widths that actually exist
+    from services.image_cache import get_cover_sources
+    
+    sources = get_cover_sources(url)
+    if sources is not None:
+        return sources.srcset()
+    
     srcset_parts = []
     for size in sizes:
         optimized_url = get_optimized_image_url(url, width=size)